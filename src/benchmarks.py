@@ -0,0 +1,243 @@
+"""Exécuter entraînement et évaluation sur tous les datasets de benchmark.
+
+But:
+    Remplacer la boucle séquentielle du Makefile par un pool de processus.
+"""
+
+# Active les annotations différées (compatibilité Python <3.11)
+from __future__ import annotations
+
+# Parse la CLI du runner
+import argparse
+
+# Capture la sortie du CLI train pour rapporter ses erreurs dans le tableau
+import contextlib
+
+# Tableau consolidé sérialisé en JSON
+import io
+import json
+
+# Nombre de cœurs par défaut pour le pool
+import os
+
+# Mesure du temps mural par dataset
+import time
+
+# Un processus par dataset : contourne le GIL sans relancer d’interpréteur
+from concurrent.futures import ProcessPoolExecutor
+
+# Chemins portables
+from pathlib import Path
+
+# Résultat nommé et sérialisable (pickle + JSON)
+from typing import NamedTuple
+
+# Même noyau de métriques que la commande metrics
+from metrics import evaluate_metrics
+
+# Même CLI d’entraînement que `train` : options, validateurs et erreurs
+from train.__main__ import _alpha_type, _iters_type
+from train.__main__ import main as train_main
+
+
+class BenchResult(NamedTuple):
+    """One row of the consolidated benchmark table."""
+
+    name: str
+    rows: int
+    iterations: int | None
+    rmse: float | None
+    r2: float | None
+    wall_time: float
+    rows_per_s: float | None
+    error: str | None
+
+
+def run_one(
+    csv_path: str, theta_dir: str, train_args: tuple[str, ...] = ()
+) -> BenchResult:
+    """Train then evaluate one dataset, writing ``theta_<name>.json``.
+
+    But:
+        Mesurer un dataset de bout en bout ; une erreur devient une ligne.
+    """
+
+    nom = Path(csv_path).stem
+    theta = str(Path(theta_dir) / f"theta_{nom}.json")
+    debut = time.perf_counter()
+
+    # On passe par le CLI train pour garder exactement ses options/erreurs ;
+    # sa sortie est capturée pour ne pas entrelacer les workers
+    sortie = io.StringIO()
+    with contextlib.redirect_stdout(sortie):
+        code = train_main(["--data", csv_path, "--theta", theta, *train_args])
+    if code != 0:
+        erreur = sortie.getvalue().strip().removeprefix("ERROR: ")
+        duree = time.perf_counter() - debut
+        return BenchResult(nom, 0, None, None, None, duree, None, erreur)
+
+    # Évaluation en flux sur le même CSV, en un seul passage
+    metriques = evaluate_metrics(csv_path, theta)
+    duree = time.perf_counter() - debut
+
+    # theta.json enregistre les itérations réellement effectuées (absent pour ols)
+    iterations = json.loads(Path(theta).read_text()).get("iterations")
+    return BenchResult(
+        nom,
+        metriques.n,
+        iterations,
+        metriques.rmse,
+        metriques.r2,
+        duree,
+        metriques.n / duree if duree > 0 else None,
+        None,
+    )
+
+
+def run_benchmarks(
+    csv_paths: list[str],
+    theta_dir: str,
+    train_args: tuple[str, ...] = (),
+    workers: int = 1,
+) -> list[BenchResult]:
+    """Run :func:`run_one` over ``csv_paths``, concurrently when ``workers > 1``.
+
+    But:
+        Occuper tous les cœurs ; résultats dans l’ordre des fichiers.
+    """
+
+    # Un seul worker : inutile de payer le démarrage d’un pool
+    if workers <= 1 or len(csv_paths) <= 1:
+        return [run_one(chemin, theta_dir, train_args) for chemin in csv_paths]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(csv_paths))) as pool:
+        return list(
+            pool.map(
+                run_one,
+                csv_paths,
+                [theta_dir] * len(csv_paths),
+                [train_args] * len(csv_paths),
+            )
+        )
+
+
+def _cellule(valeur: float | None, format_: str) -> str:
+    """Formate une cellule numérique ; ``-`` quand la valeur manque."""
+
+    return "-" if valeur is None else format(valeur, format_)
+
+
+def format_table(resultats: list[BenchResult]) -> str:
+    """Return ``resultats`` as an aligned text table.
+
+    But:
+        Lire d’un coup d’œil la qualité et la vitesse de chaque dataset.
+    """
+
+    entetes = ["dataset", "rows", "iters", "RMSE", "R2", "time_s", "rows/s"]
+    lignes = [entetes]
+    for r in resultats:
+        # Une erreur remplace les colonnes numériques par son message
+        if r.error is not None:
+            lignes.append([r.name, "-", "-", f"ERROR: {r.error}", "", "", ""])
+            continue
+        lignes.append(
+            [
+                r.name,
+                str(r.rows),
+                _cellule(r.iterations, "d"),
+                _cellule(r.rmse, ".4f"),
+                _cellule(r.r2, ".4f"),
+                _cellule(r.wall_time, ".3f"),
+                _cellule(r.rows_per_s, ".0f"),
+            ]
+        )
+
+    # Largeur de chaque colonne = plus long contenu
+    largeurs = [max(len(ligne[i]) for ligne in lignes) for i in range(len(entetes))]
+    return "\n".join(
+        "  ".join(
+            cellule.ljust(largeur) if i == 0 else cellule.rjust(largeur)
+            for i, (cellule, largeur) in enumerate(zip(ligne, largeurs))
+        ).rstrip()
+        for ligne in lignes
+    )
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Return the benchmark runner argument parser."""
+
+    parser = argparse.ArgumentParser(
+        description="Train and evaluate every benchmark dataset in parallel",
+    )
+    parser.add_argument(
+        "--data-dir",
+        default="data/benchmarks",
+        help="directory of benchmark CSV files",
+    )
+    parser.add_argument(
+        "--theta-dir",
+        default=".",
+        help="directory receiving theta_<name>.json files",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of datasets processed concurrently",
+    )
+    parser.add_argument(
+        "--json",
+        default="benchmarks.json",
+        help="path of the consolidated JSON table",
+    )
+    # Options transmises au CLI train, validées ici comme dans train : une
+    # valeur invalide est une erreur d’usage du parent, pas d’un worker
+    parser.add_argument("--alpha", type=_alpha_type, default=0.1, help="learning rate")
+    parser.add_argument(
+        "--iters", type=_iters_type, default=1000, help="number of iterations"
+    )
+    parser.add_argument(
+        "--engine", choices=["loop", "stats"], default="loop", help="train engine"
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run all benchmarks and print the consolidated table.
+
+    But:
+        Un seul interpréteur, un seul tableau (texte + JSON).
+    """
+
+    args = _build_parser().parse_args(argv)
+    fichiers = sorted(str(p) for p in Path(args.data_dir).glob("*.csv"))
+    if not fichiers:
+        print(f"ERROR: no CSV files found in {args.data_dir}")
+        return 2
+
+    train_args = (
+        "--alpha",
+        str(args.alpha),
+        "--iters",
+        str(args.iters),
+        "--engine",
+        args.engine,
+    )
+    resultats = run_benchmarks(fichiers, args.theta_dir, train_args, args.workers)
+
+    # Même tableau en JSON (machine) et en texte (humain)
+    Path(args.json).write_text(
+        json.dumps([r._asdict() for r in resultats], indent=2) + "\n"
+    )
+    print(format_table(resultats))
+
+    # Code ≠ 0 si un dataset a échoué, pour la CI
+    return 2 if any(r.error is not None for r in resultats) else 0
+
+
+__all__ = ["BenchResult", "format_table", "main", "run_benchmarks", "run_one"]
+
+# Exécution directe : python -m src.benchmarks ou python src/benchmarks.py
+if __name__ == "__main__":  # pragma: no cover - manual execution
+    raise SystemExit(main())
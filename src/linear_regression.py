@@ -7,6 +7,16 @@ But:
 # Active les annotations différées (compatibilité Python <3.11)
 from __future__ import annotations
 
+# sys.modules permet de détecter NumPy sans l’importer
+import sys
+
+# array('d') sert de tampon de sortie compact pour les prédictions en lot
+from array import array
+
+# Types utilitaires pour les signatures ; Sized repère un xs de taille connue
+from collections.abc import Iterable, Sized
+from typing import Any
+
 
 def estimate_price(x: float, theta0: float, theta1: float) -> float:
     """Return the predicted value ``theta0 + theta1 * x``.
@@ -18,3 +28,70 @@ def estimate_price(x: float, theta0: float, theta1: float) -> float:
 
     # Force chaque terme en float pour éviter erreurs de type
     return float(theta0) + float(theta1) * float(x)
+
+
+def estimate_prices(
+    xs: Iterable[float], theta0: float, theta1: float, out: Any = None
+) -> Any:
+    """Return ``theta0 + theta1 * x`` for every ``x`` of ``xs``.
+
+    ``xs`` may be a list, an ``array('d')``, a ``memoryview`` of doubles or,
+    when NumPy is installed, an ``ndarray``.  When ``out`` is given it must be
+    a writable buffer of the same length (``array('d')``, ``memoryview``,
+    ``list`` or ``ndarray``); it is filled in place and returned.  Otherwise a
+    new ``array('d')`` (or ``ndarray`` for NumPy input) is returned.
+
+    But:
+        Prédire un lot de valeurs sans trois conversions float() par point.
+    """
+
+    # On convertit les coefficients une seule fois pour tout le lot
+    intercept = float(theta0)
+    pente = float(theta1)
+
+    # NumPy n'est consulté que s'il est déjà importé : sans lui, xs ne peut
+    # pas être un ndarray, et on évite d'en payer le coût d'import
+    numpy = sys.modules.get("numpy")
+    if (
+        numpy is not None
+        and isinstance(xs, numpy.ndarray)
+        and not isinstance(out, list)
+    ):
+        # Le ufunc n'écrit que dans un ndarray : array('d') et memoryview sont
+        # vus sans copie via le protocole buffer, le reste est refusé
+        cible = None if out is None else numpy.asarray(out)
+        if cible is not None:
+            if cible.dtype != numpy.float64 or not cible.flags.writeable:
+                raise TypeError("out must be a writable buffer of doubles")
+            if cible.shape != xs.shape:
+                raise ValueError("out must have the same length as xs")
+
+        # Calcul vectoriel sans tableau temporaire supplémentaire
+        resultat = numpy.multiply(xs, pente, out=cible)
+        resultat += intercept
+        return resultat if out is None else out
+
+    # Chemin pur Python : un seul parcours vers un tampon float64 contigu
+    if out is None:
+        return array("d", [intercept + pente * x for x in xs])
+
+    # Un tampon préalloué de mauvaise taille tronquerait ou corromprait
+    # silencieusement le résultat : on refuse explicitement, avant toute
+    # écriture quand la taille de xs est connue
+    taille = len(out)
+    if isinstance(xs, Sized) and len(xs) != taille:
+        raise ValueError("out must have the same length as xs")
+
+    # Écriture directe case par case : aucun tampon intermédiaire
+    ecrits = 0
+    for x in xs:
+        if ecrits == taille:
+            raise ValueError("out must have the same length as xs")
+        out[ecrits] = intercept + pente * x
+        ecrits += 1
+    if ecrits != taille:
+        raise ValueError("out must have the same length as xs")
+    return out
+
+
+__all__ = ["estimate_price", "estimate_prices"]
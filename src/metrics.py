@@ -1,7 +1,7 @@
 """Métriques d'évaluation pour la régression linéaire.
 
 But:
-    Fournir des fonctions pour charger les paramètres et calculer RMSE, R².
+    Fournir des fonctions pour charger les paramètres et calculer RMSE, R², MAE et erreur max.
 """
 
 # On active les annotations différées pour rester compatible avec Python < 3.11
@@ -16,17 +16,33 @@ import json
 # d’implémenter nos propres racines carrées
 import math
 
+# Types utilitaires pour les signatures
+from collections.abc import Iterable, Iterator
+
+# On découpe le flux de lignes en paquets de taille fixe
+from itertools import islice
+
 # On passe par Path pour garantir des opérations fichiers robustes
 # et portables (multi-OS)
 from pathlib import Path
 
+# Résultat nommé des métriques
+from typing import NamedTuple
+
 # On réutilise la fonction de prédiction du modèle afin d’évaluer
 # la cohérence entre entraînement et prédiction → pas de duplicata de logique
-from linear_regression import estimate_price
+from linear_regression import estimate_prices
 
-# On charge la fonction de lecture des données pour assurer que
+# Conteneur colonnaire : un paquet de lignes devient deux tampons float64
+from train.dataset import Dataset
+
+# On charge la lecture en flux des données pour assurer que
 # l’évaluation se base sur exactement le même parsing que l’entraînement
-from train.train import read_data
+from train.train import Moments, iter_data
+
+# Nombre de lignes prédites d’un bloc : amortit l’appel vectorisé
+# tout en gardant une mémoire constante quelle que soit la taille du CSV
+_TAILLE_PAQUET = 8192  # pragma: no mutate
 
 
 def read_theta(path: str | Path) -> tuple[float, float]:
@@ -58,64 +74,163 @@ def read_theta(path: str | Path) -> tuple[float, float]:
     return theta0, theta1
 
 
-def evaluate(data_path: str | Path, theta_path: str | Path) -> tuple[float, float]:
-    """Return ``(rmse, r2)`` for the model specified by ``theta_path`` on data.
+class Metrics(NamedTuple):
+    """Regression metrics computed by :func:`fused_metrics`."""
+
+    n: int
+    rmse: float
+    r2: float
+    mae: float
+    max_error: float
+
+
+def fused_metrics(pairs: Iterable[tuple[float, float]]) -> Metrics:
+    """Return RMSE, R², MAE and max error of ``(y_true, y_pred)`` pairs.
 
     But:
-        Évaluer la qualité prédictive du modèle avec RMSE et R².
+        Calculer toutes les métriques en un seul parcours et mémoire O(1).
     """
 
-    # On recharge les données réelles pour garantir que l’évaluation
-    # se fait bien sur le même dataset que l’entraînement
-    data = read_data(data_path)
+    # On accumule en un seul parcours (en flux, mémoire constante) :
+    #  - m : nombre d’échantillons
+    #  - ss_res : somme des carrés des résidus (erreur non expliquée)
+    #  - abs_res / max_res : somme et maximum des erreurs absolues
+    #  - moyenne / ss_tot : moyenne et somme des carrés centrés des prix
+    #    mises à jour par Welford → pas besoin de garder y_true en mémoire
+    m = 0
+    ss_res = 0.0
+    abs_res = 0.0
+    max_res = 0.0
+    y_mean = 0.0
+    ss_tot = 0.0
+
+    for y, p in pairs:
+        m += 1
+
+        # Le résidu n’est calculé qu’une fois et sert aux trois erreurs
+        residu = y - p
+        ss_res += residu * residu
+        ecart_abs = abs(residu)
+        abs_res += ecart_abs
+        max_res = max(max_res, ecart_abs)
+
+        # Mise à jour de Welford de la moyenne et de la variance totale
+        ecart = y - y_mean
+        y_mean += ecart / m
+        ss_tot += ecart * (y - y_mean)
+
+    # Sans observation, aucune métrique n’est définie
+    if m == 0:
+        raise ValueError("no data rows found")
 
-    # On recharge les coefficients sauvegardés pour utiliser
-    # le modèle tel qu’il a été entraîné
-    theta0, theta1 = read_theta(theta_path)
+    # RMSE = erreur quadratique moyenne → mesure robuste des écarts
+    rmse = math.sqrt(ss_res / m)
 
-    # On extrait les prix réels pour constituer la vérité terrain (y_true)
-    y_true = [price for _, price in data]
+    # Calcule R² avec garde pour ss_tot = 0
+    r2 = 1.0 if ss_tot == 0.0 else 1 - ss_res / ss_tot
+    return Metrics(m, rmse, r2, abs_res / m, max_res)
 
-    # On calcule les prix prédits avec le modèle → nécessaire
-    # pour comparer directement vérité terrain et prédictions
-    y_pred = [estimate_price(km, theta0, theta1) for km, _ in data]
 
-    # Nombre d’échantillons pour normaliser les erreurs et éviter
-    # qu’elles dépendent de la taille du dataset
-    m = len(y_true)
+def moment_metrics(
+    moments: Moments, theta0: float, theta1: float
+) -> tuple[float, float]:
+    """Return ``(rmse, r2)`` of ``θ0 + θ1·km`` from the dataset :class:`Moments`.
 
-    # RMSE = erreur quadratique moyenne → mesure robuste des écarts
-    rmse = math.sqrt(sum((p - y) ** 2 for p, y in zip(y_pred, y_true)) / m)
+    With ``r = y - θ0 - θ1·x``, ``Σr² = Syy - 2·θ1·Sxy + θ1²·Sxx + n·r̄²``,
+    so any number of models is scored without reading the data again.
 
-    # Moyenne des prix réels pour centrer les calculs de variance
-    y_mean = sum(y_true) / m
+    But:
+        Évaluer chaque configuration d’un balayage sans relire le CSV.
+    """
 
-    # Somme des carrés des résidus : quantité d’erreur non expliquée par le modèle
-    ss_res = sum((y - p) ** 2 for p, y in zip(y_pred, y_true))
+    # Même contrat que fused_metrics : sans observation, rien n’est défini
+    if moments.n == 0:
+        raise ValueError("no data rows found")
+
+    # Résidus centrés déduits des moments ; l’arrondi peut rendre la somme
+    # très légèrement négative → bornée à 0
+    residu_moyen = moments.mean_price - theta0 - theta1 * moments.mean_km
+    ss_res = (
+        max(
+            0.0,
+            moments.m2_price
+            - 2 * theta1 * moments.c_km_price
+            + theta1 * theta1 * moments.m2_km,
+        )
+        + moments.n * residu_moyen * residu_moyen
+    )
+
+    # Mêmes définitions (et même garde ss_tot = 0) que fused_metrics
+    rmse = math.sqrt(ss_res / moments.n)
+    r2 = 1.0 if moments.m2_price == 0.0 else 1 - ss_res / moments.m2_price
+    return rmse, r2
 
-    # Somme totale des carrés : variance totale des données
-    ss_tot = sum((y - y_mean) ** 2 for y in y_true)
 
-    # Calcule R² avec garde pour ss_tot = 0
-    r2 = 1.0 if ss_tot == 0.0 else 1 - ss_res / ss_tot
-    return rmse, r2
+def _paires_predites(
+    data_path: str | Path, theta0: float, theta1: float
+) -> Iterator[tuple[float, float]]:
+    """Cède ``(prix réel, prix prédit)`` en flux, prédit par paquets."""
+
+    # On relit les données réelles via le même parsing que l’entraînement
+    # pour garantir que l’évaluation porte sur le même dataset,
+    # par paquets pour prédire chaque bloc de km en un seul appel
+    lignes = iter(iter_data(data_path))
+    while paquet := Dataset.from_rows(islice(lignes, _TAILLE_PAQUET)):
+        yield from zip(paquet.price, estimate_prices(paquet.km, theta0, theta1))
+
+
+def evaluate_metrics(data_path: str | Path, theta_path: str | Path) -> Metrics:
+    """Return all :class:`Metrics` for ``theta_path`` on ``data_path``.
+
+    But:
+        Évaluer un jeu de test arbitrairement grand en une seule lecture.
+    """
+
+    # On recharge les coefficients sauvegardés pour utiliser
+    # le modèle tel qu’il a été entraîné
+    theta0, theta1 = read_theta(theta_path)
+    return fused_metrics(_paires_predites(data_path, theta0, theta1))
+
+
+def evaluate(data_path: str | Path, theta_path: str | Path) -> tuple[float, float]:
+    """Return ``(rmse, r2)`` for the model specified by ``theta_path`` on data.
+
+    But:
+        Évaluer la qualité prédictive du modèle avec RMSE et R².
+    """
+
+    # Même noyau fusionné : seules les deux métriques historiques sont exposées
+    metriques = evaluate_metrics(data_path, theta_path)
+    return metriques.rmse, metriques.r2
 
 
 def main() -> None:
     # On évalue rapidement sur les fichiers par défaut pour fournir
     # une démonstration immédiate du bon fonctionnement du module
-    rmse, r2 = evaluate("data.csv", "theta.json")
+    metriques = evaluate_metrics("data.csv", "theta.json")
 
     # On affiche RMSE car il indique la précision absolue des prédictions
-    print(f"RMSE: {rmse}")
+    print(f"RMSE: {metriques.rmse}")
 
     # On affiche R² car il reflète la proportion de variance expliquée par le modèle
-    print(f"R2: {r2}")
+    print(f"R2: {metriques.r2}")
+
+    # MAE et erreur max complètent RMSE : erreur typique et pire cas
+    print(f"MAE: {metriques.mae}")
+    print(f"Max error: {metriques.max_error}")
 
 
 # On expose explicitement uniquement les fonctions utiles publiquement
 # afin de limiter la surface d’API accessible via import *
-__all__ = ["read_theta", "evaluate", "main"]
+__all__ = [
+    "Metrics",
+    "evaluate",
+    "evaluate_metrics",
+    "fused_metrics",
+    "main",
+    "moment_metrics",
+    "read_theta",
+]
 
 # On permet une exécution directe comme script, pratique pour tester rapidement
 if __name__ == "__main__":  # pragma: no cover - manual execution
@@ -0,0 +1,429 @@
+"""Suite de benchmarks de performance reproductible (commande ``bench``).
+
+Synthétise des datasets de 1e3 à 1e8 lignes (graine fixe), chronomètre les
+chemins critiques (lecture, descente de gradient, évaluation, prédiction,
+statistiques et rendu des résidus de viz) et enregistre débit et pic de
+mémoire en JSON.
+
+But:
+    Mesurer la vitesse et détecter les régressions d’une version à l’autre.
+"""
+
+# Active les annotations différées (compatibilité Python <3.11)
+from __future__ import annotations
+
+# Parse la CLI du banc
+import argparse
+
+# Sérialise les résultats pour comparer les exécutions
+import json
+
+# Contexte "spawn" : chaque cas démarre dans un processus vierge
+import multiprocessing
+
+# Décrit la machine dans le rapport
+import platform
+
+# Génération déterministe des datasets
+import random
+
+# Chronométrage haute résolution
+import time
+
+# Signatures des cas mesurés
+from collections.abc import Callable
+
+# Un processus par cas : le pic RSS mesuré est celui du cas seul
+from concurrent.futures import ProcessPoolExecutor
+
+# Chemins portables
+from pathlib import Path
+
+# Types utilitaires pour les signatures
+from typing import Any
+
+# Cas à mesurer : (chemin, lignes, itérations) → (travail, unités de travail)
+_Preparation = Callable[[str, int, int], tuple[Callable[[], object], int]]
+
+# Coefficients réalistes (prix ≈ 8500 - 0.02·km) pour les datasets synthétiques
+_THETA0 = 8500.0  # pragma: no mutate
+_THETA1 = -0.02  # pragma: no mutate
+
+# Nombre maximal d’appels unitaires à predict_price par cas
+_MAX_APPELS = 1_000_000  # pragma: no mutate
+
+
+def generate_dataset(path: str | Path, rows: int, seed: int = 0) -> None:
+    """Write a reproducible ``km,price`` CSV of ``rows`` rows to ``path``.
+
+    But:
+        Obtenir exactement les mêmes données à chaque exécution du banc.
+    """
+
+    generateur = random.Random(seed)
+    with Path(path).open("w", encoding="utf-8", newline="") as f:
+        f.write("km,price\n")
+        # Écriture par paquets : mémoire constante même pour 1e8 lignes
+        restant = rows
+        while restant:
+            paquet = min(restant, 100_000)
+            lignes = []
+            for _ in range(paquet):
+                km = generateur.randint(0, 300_000)
+                prix = max(0.0, _THETA0 + _THETA1 * km + generateur.gauss(0.0, 500.0))
+                lignes.append(f"{km},{prix:.2f}\n")
+            f.writelines(lignes)
+            restant -= paquet
+
+
+def _theta(path: str) -> str:
+    """Écrit (une fois) le theta de référence à côté du dataset."""
+
+    theta = Path(path).with_name("bench_theta.json")
+    if not theta.exists():
+        theta.write_text(json.dumps({"theta0": _THETA0, "theta1": _THETA1}))
+    return str(theta)
+
+
+def _cas_read_data(
+    path: str, rows: int, iters: int
+) -> tuple[Callable[[], object], int]:
+    from train.train import read_data
+
+    return (lambda: read_data(path)), rows
+
+
+def _cas_load_dataset(
+    path: str, rows: int, iters: int
+) -> tuple[Callable[[], object], int]:
+    from train.train import load_dataset
+
+    return (lambda: load_dataset(path)), rows
+
+
+def _cas_gradient_descent(
+    path: str, rows: int, iters: int
+) -> tuple[Callable[[], object], int]:
+    from train.train import gradient_descent, load_dataset
+
+    # Préparation hors chronomètre : seule la descente est mesurée
+    donnees = load_dataset(path)
+    return (lambda: gradient_descent(donnees, 0.1, iters)), rows * iters
+
+
+def _cas_gradient_descent_stats(
+    path: str, rows: int, iters: int
+) -> tuple[Callable[[], object], int]:
+    from train.train import gradient_descent_stats, load_dataset, sufficient_stats
+
+    donnees = load_dataset(path)
+
+    # Sommes + itérations : le coût total de l’entraînement par moteur "stats"
+    def travail() -> object:
+        return gradient_descent_stats(sufficient_stats(donnees), 0.1, iters)
+
+    return travail, rows
+
+
+def _cas_evaluate(path: str, rows: int, iters: int) -> tuple[Callable[[], object], int]:
+    from metrics import evaluate
+
+    theta = _theta(path)
+    return (lambda: evaluate(path, theta)), rows
+
+
+def _cas_predict_price(
+    path: str, rows: int, iters: int
+) -> tuple[Callable[[], object], int]:
+    from predict.predict import predict_price
+    from train.train import load_dataset
+
+    theta = _theta(path)
+    appels = min(rows, _MAX_APPELS)
+    kms = list(load_dataset(path).km[:appels])
+
+    # Appels unitaires : mesure la latence par requête (cache theta compris)
+    def travail() -> object:
+        return [predict_price(km, theta) for km in kms]
+
+    return travail, appels
+
+
+def _cas_viz_stats(
+    path: str, rows: int, iters: int
+) -> tuple[Callable[[], object], int]:
+    import viz
+    from train.train import load_dataset
+
+    donnees = load_dataset(path)
+
+    # Les deux calculs statistiques du tracé : σ des résidus et outliers
+    def travail() -> object:
+        viz._ecart_type_residus(donnees, _THETA0, _THETA1, len(donnees))
+        return viz.split_outliers(donnees, _THETA0, _THETA1, 2.0)
+
+    return travail, rows
+
+
+def _cas_viz_residuals(
+    path: str, rows: int, iters: int
+) -> tuple[Callable[[], object], int]:
+    import viz
+    from train.train import load_dataset
+
+    # Rendu Agg réel : construction des artistes puis dessin de la figure
+    module_matplotlib = viz._pyplot(headless=True)
+    donnees = load_dataset(path)
+
+    def travail() -> object:
+        figure = module_matplotlib.figure()
+        try:
+            viz.plot_residuals(module_matplotlib, donnees, _THETA0, _THETA1)
+            figure.canvas.draw()
+        finally:
+            module_matplotlib.close(figure)
+        return figure
+
+    return travail, rows
+
+
+# Catalogue des cas, dans l’ordre d’affichage
+CASES: dict[str, _Preparation] = {
+    "read_data": _cas_read_data,
+    "load_dataset": _cas_load_dataset,
+    "gradient_descent": _cas_gradient_descent,
+    "gradient_descent_stats": _cas_gradient_descent_stats,
+    "evaluate": _cas_evaluate,
+    "predict_price": _cas_predict_price,
+    "viz_stats": _cas_viz_stats,
+    "viz_residuals": _cas_viz_residuals,
+}
+
+
+def _pic_rss() -> int | None:
+    """Pic de mémoire résidente du processus courant, en octets."""
+
+    # resource n’existe que sur Unix : sans lui, la mesure est omise
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows only
+        return None
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux rapporte des Kio, macOS des octets
+    return int(pic if platform.system() == "Darwin" else pic * 1024)
+
+
+def run_case(
+    name: str, path: str, rows: int, iters: int, repeat: int
+) -> dict[str, Any]:
+    """Time case ``name`` on ``path`` and return one result record.
+
+    But:
+        Mesurer un cas : meilleur temps sur ``repeat`` essais, débit, pic RSS.
+    """
+
+    try:
+        travail, unites = CASES[name](path, rows, iters)
+        meilleur = float("inf")
+        for _ in range(max(1, repeat)):
+            debut = time.perf_counter()
+            travail()
+            meilleur = min(meilleur, time.perf_counter() - debut)
+    except (ImportError, ValueError) as exc:
+        # Dépendance optionnelle absente (ex: matplotlib) ou donnée invalide
+        return {"case": name, "rows": rows, "error": str(exc)}
+    return {
+        "case": name,
+        "rows": rows,
+        "seconds": meilleur,
+        "units": unites,
+        "throughput": unites / meilleur if meilleur > 0 else None,
+        "peak_rss_bytes": _pic_rss(),
+    }
+
+
+def run_suite(
+    sizes: list[int],
+    cases: list[str],
+    work_dir: str | Path,
+    iters: int = 10,
+    repeat: int = 1,
+    isolate: bool = True,
+) -> list[dict[str, Any]]:
+    """Run every case on every size, generating datasets as needed.
+
+    With ``isolate`` each measurement runs in a fresh spawned process so
+    that ``peak_rss_bytes`` belongs to that case alone.
+
+    But:
+        Produire les courbes de passage à l’échelle de chaque chemin critique.
+    """
+
+    dossier = Path(work_dir)
+    dossier.mkdir(parents=True, exist_ok=True)
+    resultats = []
+    for rows in sizes:
+        # Dataset mis en cache par taille : la graine fixe le rend identique
+        chemin = dossier / f"bench_{rows}.csv"
+        if not chemin.exists():
+            generate_dataset(chemin, rows)
+        for name in cases:
+            arguments = (name, str(chemin), rows, iters, repeat)
+            if not isolate:
+                resultats.append(run_case(*arguments))
+                continue
+            contexte = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=contexte) as pool:
+                resultats.append(pool.submit(run_case, *arguments).result())
+    return resultats
+
+
+def compare(
+    results: list[dict[str, Any]],
+    baseline: list[dict[str, Any]],
+    tolerance: float,
+) -> list[str]:
+    """Return a message per case whose throughput dropped beyond ``tolerance``.
+
+    But:
+        Signaler en CI toute régression de débit par rapport à une référence.
+    """
+
+    reference = {
+        (r["case"], r["rows"]): r.get("throughput")
+        for r in baseline
+        if r.get("throughput")
+    }
+    regressions = []
+    for r in results:
+        avant = reference.get((r["case"], r["rows"]))
+        apres = r.get("throughput")
+        if avant and apres is not None and apres < avant * (1 - tolerance):
+            regressions.append(
+                f"{r['case']} @ {r['rows']} rows: {apres:.0f}/s vs {avant:.0f}/s"
+                f" ({apres / avant - 1:+.0%})"
+            )
+    return regressions
+
+
+def format_results(results: list[dict[str, Any]]) -> str:
+    """Return ``results`` as a text table (one line per case and size)."""
+
+    lignes = [f"{'case':<24}{'rows':>12}{'seconds':>12}{'units/s':>14}{'peak MiB':>10}"]
+    for r in results:
+        if "error" in r:
+            lignes.append(f"{r['case']:<24}{r['rows']:>12}  ERROR: {r['error']}")
+            continue
+        rss = r["peak_rss_bytes"]
+        lignes.append(
+            f"{r['case']:<24}{r['rows']:>12}{r['seconds']:>12.4f}"
+            f"{r['throughput'] or 0:>14.0f}"
+            f"{'-' if rss is None else format(rss / 2**20, '.1f'):>10}"
+        )
+    return "\n".join(lignes)
+
+
+def _tailles(value: str) -> list[int]:
+    """Convertit ``"1e3,1e4"`` en ``[1000, 10000]``."""
+
+    try:
+        tailles = [int(float(morceau)) for morceau in value.split(",") if morceau]
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("sizes must be numbers like 1e3,1e4") from exc
+    if not tailles or min(tailles) <= 0:
+        raise argparse.ArgumentTypeError("sizes must be positive")
+    return tailles
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Return the ``bench`` argument parser."""
+
+    parser = argparse.ArgumentParser(description="Run the performance benchmark suite")
+    parser.add_argument(
+        "--sizes",
+        type=_tailles,
+        default=[1_000, 10_000, 100_000, 1_000_000],
+        help="comma-separated dataset sizes, e.g. 1e3,1e4,1e5,1e6,1e7,1e8",
+    )
+    parser.add_argument(
+        "--cases",
+        default=",".join(CASES),
+        help=f"comma-separated cases among: {', '.join(CASES)}",
+    )
+    parser.add_argument(
+        "--iters", type=int, default=10, help="gradient descent iterations per case"
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="keep the best of N runs")
+    parser.add_argument(
+        "--work-dir", default=".bench", help="where synthetic datasets are cached"
+    )
+    parser.add_argument(
+        "--output", default="bench_results.json", help="JSON report path"
+    )
+    parser.add_argument("--baseline", help="previous JSON report to compare against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="tolerated throughput drop versus --baseline (0.2 = 20%%)",
+    )
+    parser.add_argument(
+        "--no-isolate",
+        dest="isolate",
+        action="store_false",
+        help="run cases in this process (peak RSS is then cumulative)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the suite, print a table and write the JSON report.
+
+    But:
+        Une commande unique pour mesurer et comparer les performances.
+    """
+
+    args = _build_parser().parse_args(argv)
+    cas = [nom for nom in args.cases.split(",") if nom]
+    inconnus = [nom for nom in cas if nom not in CASES]
+    if inconnus:
+        print(f"ERROR: unknown benchmark case: {', '.join(inconnus)}")
+        return 2
+
+    resultats = run_suite(
+        args.sizes, cas, args.work_dir, args.iters, args.repeat, args.isolate
+    )
+
+    # Le contexte machine accompagne les mesures pour des comparaisons honnêtes
+    rapport = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iters": args.iters,
+        "results": resultats,
+    }
+    Path(args.output).write_text(json.dumps(rapport, indent=2) + "\n")
+    print(format_results(resultats))
+
+    if args.baseline:
+        reference = json.loads(Path(args.baseline).read_text())["results"]
+        regressions = compare(resultats, reference, args.max_regression)
+        for message in regressions:
+            print(f"REGRESSION: {message}")
+        if regressions:
+            return 1
+    return 0
+
+
+__all__ = [
+    "CASES",
+    "compare",
+    "format_results",
+    "generate_dataset",
+    "main",
+    "run_case",
+    "run_suite",
+]
+
+# Exécution directe : python -m perf
+if __name__ == "__main__":  # pragma: no cover - manual execution
+    raise SystemExit(main())
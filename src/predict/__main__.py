@@ -6,8 +6,76 @@
 # pragma: no mutate
 from __future__ import annotations
 
+# Fermeture des seuls fichiers ouverts par le mode lot.
+import contextlib
+
+# Remplacement atomique du fichier de sortie du mode lot.
+import os
+
+# Flux standard pour le mode lot (stdin → stdout).
+import sys
+
+# Fichier temporaire voisin de la sortie (même système de fichiers).
+import tempfile
+
+# Générateur du gestionnaire de contexte de sortie.
+from collections.abc import Iterator
+
+# Signature du flux de sortie.
+from typing import TextIO
+
 # Import local. Contrats: parse_args peut quitter, predict_price est pure.
-from .predict import parse_args, predict_price
+from .predict import build_parser, parse_args, predict_batch, predict_price
+
+
+# Sortie du mode lot. Publiée en entier ou pas du tout.
+@contextlib.contextmanager
+def _sortie_atomique(output: str) -> Iterator[TextIO]:
+    """Yield the batch sink; a file only replaces ``output`` on success."""
+    if output == "-":
+        yield sys.stdout
+        return
+    # Une ligne invalide arrive après des milliers de lignes déjà écrites :
+    # on écrit à côté, puis os.replace publie le fichier complet.
+    dossier = os.path.dirname(os.path.abspath(output))
+    fd, temporaire = tempfile.mkstemp(prefix=".predict-", suffix=".tmp", dir=dossier)
+    try:
+        with open(fd, "w", newline="") as sortie:
+            yield sortie
+        os.replace(temporaire, output)
+    except BaseException:
+        # Échec : l'ancienne sortie reste intacte, le brouillon disparaît.
+        os.unlink(temporaire)
+        raise
+
+
+# Mode lot. Ouvre les flux demandés ("-" = stdin/stdout) et score en continu.
+def _main_batch(source: str, output: str, theta: str) -> int:
+    """Run ``predict --batch`` and map user errors to exit code 2."""
+    # ExitStack : seuls les fichiers réellement ouverts sont refermés,
+    # jamais stdin/stdout.
+    with contextlib.ExitStack() as pile:
+        try:
+            # newline="" : laisse le module csv gérer les fins de ligne.
+            entree = (
+                sys.stdin
+                if source == "-"
+                else pile.enter_context(open(source, newline=""))
+            )
+        except OSError:
+            print(f"ERROR: batch file not found: {source}", file=sys.stderr)
+            return 2
+        try:
+            with _sortie_atomique(output) as sortie:
+                predict_batch(entree, sortie, theta)
+        except ValueError as exc:
+            # Même contrat que train : message court, code 2, sans traceback.
+            print(f"ERROR: {exc}", file=sys.stderr)
+            return 2
+        except OSError:
+            print(f"ERROR: cannot write output file: {output}", file=sys.stderr)
+            return 2
+    return 0
 
 
 # Point d'entrée CLI. Retourne un code process (0 succès).
@@ -15,6 +83,23 @@ def main(argv: list[str] | None = None) -> int:  # pragma: no mutate
     """Parse arguments, run the prediction and print the result."""
     # Barrière d'erreurs. Laisse remonter SystemExit avec son code.
     try:
+        # Le mode lot est détecté d'abord : il ne passe pas par la saisie
+        # interactive ni par le contrôle "un seul km" de parse_args.
+        parser = build_parser()
+        args, extra = parser.parse_known_args(argv)
+        if args.batch is not None:
+            # Une option inconnue reste une erreur d'usage argparse.
+            inconnus = [arg for arg in extra if arg.startswith("-")]
+            if inconnus:
+                parser.error(f"unrecognized arguments: {' '.join(inconnus)}")
+            if extra or args.km is not None:
+                print(
+                    "ERROR: --batch does not take a mileage argument",
+                    file=sys.stderr,
+                )
+                return 2
+            return _main_batch(args.batch, args.output, args.theta)
+
         # Pré: argv list[str]|None. Peut lire sys.argv si None.
         # Effet: parse_args peut faire sys.exit en cas d'usage invalide.
         # Post: km>=0 float. theta est un chemin str vers le fichier.
@@ -26,9 +111,10 @@ def main(argv: list[str] | None = None) -> int:  # pragma: no mutate
         if not isinstance(theta, str):  # pragma: no cover  # type: ignore[unreachable]
             raise SystemExit(2)  # pragma: no cover
         price = predict_price(km, theta)
-    except (SystemExit,) as exc:  # pragma: no cover
+    except SystemExit as exc:
         # Propagate exit codes while avoiding re-raising.  # NOSONAR
-        return exc.code if isinstance(exc.code, int) else 1  # pragma: no cover
+        # (usage argparse, --help, theta invalide via load_theta)
+        return exc.code if isinstance(exc.code, int) else 1
     output = "0" if price == 0 else f"Predicted price: {price:.2f} €"
     print(output)
     return 0
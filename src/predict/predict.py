@@ -6,20 +6,35 @@ from __future__ import annotations
 # Permet de définir une CLI robuste et auto-documentée.
 import argparse
 
+# Lecture des fichiers de kilométrages en mode lot (guillemets, séparateurs).
+import csv
+
 # Permet de sérialiser/désérialiser les paramètres appris (theta).
 import json
 
 # Outils numériques pour comparer des flottants de manière robuste.
 import math
 
+# Flux d’erreur standard : les résumés du mode lot n’y polluent pas stdout.
+import sys
+
+# Horloge monotone pour la durée de validité optionnelle du cache theta.
+import time
+
+# Tampon float64 préalloué pour les prix prédits du mode lot.
+from array import array
+
+# Flux de kilométrages à scorer en lot.
+from collections.abc import Iterable
+
 # Uniformise la gestion de chemins pour lire le fichier theta.
 from pathlib import Path
 
 # Permet d'annoter des types génériques et clarifier les contrats.
-from typing import Any
+from typing import Any, NamedTuple, TextIO
 
 # Réutilise la fonction de prédiction entraînée pour éviter la duplication.
-from linear_regression import estimate_price
+from linear_regression import estimate_price, estimate_prices
 
 
 # Expose un parseur dédié pour centraliser la définition de la CLI.
@@ -40,6 +55,21 @@ def build_parser() -> argparse.ArgumentParser:
     # ce qui permet de réutiliser différents modèles sans recompiler
     parser.add_argument("--theta", default="theta.json", help="path to theta JSON")
 
+    # Mode lot : un fichier (ou "-" pour stdin) de kilométrages à scorer
+    # en un seul processus, theta n'étant chargé qu'une fois
+    parser.add_argument(
+        "--batch",
+        metavar="INPUT",
+        help="CSV of mileages to score ('-' for stdin)",
+    )
+
+    # Destination des prédictions du mode lot ("-" pour stdout)
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="CSV written by --batch ('-' for stdout)",
+    )
+
     # On renvoie le parseur afin de garantir une seule définition centralisée,
     # évitant les duplications et incohérences dans la CLI
     return parser
@@ -242,6 +272,67 @@ def load_theta(
     return theta0, theta1, min_km, max_km, min_price, max_price
 
 
+# Résultat de load_theta : coefficients puis bornes optionnelles.
+_Theta = tuple[float, float, float | None, float | None, float | None, float | None]
+
+# Cache en processus : chemin résolu → (mtime_ns, taille, instant de
+# validation, résultat). Évite relecture + json.loads à chaque prédiction.
+_THETA_CACHE: dict[Path, tuple[int, int, float, _Theta]] = {}
+
+
+def load_theta_cached(path: str, ttl: float | None = None) -> _Theta:
+    """Return :func:`load_theta` results, cached per resolved path.
+
+    A cached entry is revalidated with a single ``stat()`` (mtime and size);
+    when ``ttl`` seconds are given, the entry is trusted without any system
+    call until it is older than ``ttl``.  A missing file is never cached.
+
+    But:
+        Ramener une prédiction en régime établi à une recherche de dictionnaire.
+    """
+
+    # Clé stable : deux chemins vers le même fichier partagent l’entrée
+    cle = Path(path).resolve()
+    entree = _THETA_CACHE.get(cle)
+    maintenant = time.monotonic()
+
+    # Avec un TTL, une entrée récente est servie sans même un stat()
+    if entree is not None and ttl is not None and maintenant - entree[2] < ttl:
+        return entree[3]
+
+    try:
+        etat = cle.stat()
+    except OSError:
+        # Fichier supprimé : on oublie l’entrée et on garde le contrat
+        # de load_theta (coefficients neutres avant entraînement)
+        _THETA_CACHE.pop(cle, None)
+        return load_theta(path)
+
+    # Fichier inchangé : on prolonge la validité de l’entrée existante
+    if entree is not None and (etat.st_mtime_ns, etat.st_size) == entree[:2]:
+        _THETA_CACHE[cle] = (entree[0], entree[1], maintenant, entree[3])
+        return entree[3]
+
+    # Fichier nouveau ou modifié : lecture complète puis mise en cache.
+    # Un theta invalide lève SystemExit avant d’atteindre le cache.
+    resultat = load_theta(path)
+    _THETA_CACHE[cle] = (etat.st_mtime_ns, etat.st_size, maintenant, resultat)
+    return resultat
+
+
+def invalidate_theta_cache(path: str | None = None) -> None:
+    """Drop the cached theta for ``path``, or the whole cache when ``None``.
+
+    But:
+        Forcer une relecture après une mise à jour que mtime/taille ne voient pas.
+    """
+
+    if path is None:
+        _THETA_CACHE.clear()
+    else:
+        _THETA_CACHE.pop(Path(path).resolve(), None)
+
+
 def _warn_outside(
     value: float, bounds: tuple[float | None, float | None], label: str
 ) -> None:
@@ -265,12 +356,153 @@ def _warn_outside(
         print(f"WARNING: {label} {value} outside data range [{min_val}, {max_val}]")
 
 
+def _count_outside(
+    values: Iterable[float], bounds: tuple[float | None, float | None]
+) -> int:
+    """Compte les valeurs hors domaine d’entraînement sans rien afficher."""
+
+    # Sans bornes connues, aucune valeur n'est considérée hors plage
+    min_val, max_val = bounds
+    if min_val is None or max_val is None:
+        return 0
+    return sum(1 for value in values if not min_val <= value <= max_val)
+
+
+def _warn_outside_count(
+    count: int, total: int, bounds: tuple[float | None, float | None], label: str
+) -> None:
+    """Résume en une ligne les extrapolations d’un lot, sur stderr."""
+
+    # Un seul avertissement agrégé remplace les millions de lignes
+    # qu'émettrait _warn_outside appelé ligne par ligne
+    if count:
+        min_val, max_val = bounds
+        print(
+            f"WARNING: {count}/{total} {label} values outside data range"
+            f" [{min_val}, {max_val}]",
+            file=sys.stderr,
+        )
+
+
+class BatchSummary(NamedTuple):
+    """Aggregate counts reported by :func:`predict_batch`."""
+
+    rows: int
+    km_outside: int
+    price_outside: int
+
+
+# Nombre de lignes traitées par paquet : amortit les appels d'écriture
+# tout en gardant une mémoire constante quelle que soit la taille du lot
+_TAILLE_LOT = 8192  # pragma: no mutate
+
+
+def _km_colonne(entete: list[str]) -> int | None:
+    """Repère la colonne ``km`` d’un en-tête, ou ``None`` sans en-tête."""
+
+    # Une première ligne numérique signifie qu'il n'y a pas d'en-tête :
+    # on lit alors le premier champ (un km par ligne, façon stdin)
+    try:
+        float(entete[0])
+    except ValueError:
+        pass
+    else:
+        return None
+    noms = [nom.strip() for nom in entete]
+    if "km" not in noms:
+        raise ValueError("invalid CSV format (expected a km column)")
+    return noms.index("km")
+
+
+def _iter_km(source: Iterable[str]) -> Iterable[tuple[int, str, float]]:
+    """Cède ``(ligne, texte, km)`` pour chaque kilométrage valide de ``source``."""
+
+    lecteur = csv.reader(source)
+    colonne = 0
+    premiere = True
+    for champs in lecteur:
+        # Les lignes vides sont ignorées, comme dans read_data
+        if not champs:
+            continue
+        if premiere:
+            premiere = False
+            indice = _km_colonne(champs)
+            if indice is not None:
+                colonne = indice
+                continue
+        numero_ligne = lecteur.line_num
+        if colonne >= len(champs):
+            raise ValueError(f"invalid row {numero_ligne}: missing value")
+        texte = champs[colonne].strip()
+        try:
+            km = float(texte)
+        except ValueError:
+            raise ValueError(f"invalid row {numero_ligne}: non-numeric value") from None
+        # Mêmes règles métier que la prédiction unitaire : ni NaN ni négatif
+        if math.isnan(km):
+            raise ValueError(f"invalid row {numero_ligne}: NaN value")
+        if km < 0:
+            raise ValueError(f"invalid row {numero_ligne}: negative km")
+        yield numero_ligne, texte, km
+
+
+def predict_batch(
+    source: Iterable[str], sink: TextIO, theta_path: str = "theta.json"
+) -> BatchSummary:
+    """Stream mileages from ``source`` and write ``km,price`` rows to ``sink``.
+
+    ``source`` is a CSV with a ``km`` column, or one mileage per line without
+    header.  ``theta_path`` is read once; out-of-range mileages and prices are
+    reported as a single aggregate warning on stderr.
+
+    But:
+        Scorer des millions de lignes en un processus, en mémoire constante.
+    """
+
+    # Un seul chargement des coefficients pour tout le lot
+    theta0, theta1, min_km, max_km, min_price, max_price = load_theta(theta_path)
+
+    # Même convention que predict_price : modèle non entraîné → prix 0,
+    # sans avertissement d'extrapolation
+    entraine = not (math.isclose(theta0, 0.0) and math.isclose(theta1, 0.0))
+
+    sink.write("km,price\n")
+    lignes = km_outside = price_outside = 0
+    paquet: list[tuple[int, str, float]] = []
+    vue_prix = memoryview(array("d", bytes(8 * _TAILLE_LOT)))
+
+    def vider() -> None:
+        nonlocal lignes, km_outside, price_outside
+        kms = [km for _, _, km in paquet]
+        # Le tampon de sortie est alloué une fois et réutilisé à chaque paquet
+        # (modèle non entraîné : θ0 = θ1 = 0 exactement, donc prix nuls)
+        prix = estimate_prices(kms, theta0, theta1, out=vue_prix[: len(kms)])
+        sink.writelines(
+            f"{texte},{valeur:.2f}\n" for (_, texte, _), valeur in zip(paquet, prix)
+        )
+        lignes += len(paquet)
+        if entraine:
+            km_outside += _count_outside(kms, (min_km, max_km))
+            price_outside += _count_outside(prix, (min_price, max_price))
+        paquet.clear()
+
+    for entree in _iter_km(source):
+        paquet.append(entree)
+        if len(paquet) >= _TAILLE_LOT:
+            vider()
+    vider()
+
+    # Résumé agrégé, une ligne par grandeur au plus
+    _warn_outside_count(km_outside, lignes, (min_km, max_km), "mileage")
+    _warn_outside_count(price_outside, lignes, (min_price, max_price), "price")
+    return BatchSummary(lignes, km_outside, price_outside)
+
+
 def predict_price(km: float, theta_path: str = "theta.json") -> float:
     """Point d’accès unique pour produire un prix à partir d’un km fourni."""
 
-    # On recharge systématiquement les coefficients et bornes sauvegardés
-    # pour garantir que la prédiction reflète bien
-    # le dernier entraînement effectué
+    # On relit les coefficients et bornes via le cache : un stat() suffit
+    # à garantir que la prédiction reflète le dernier entraînement effectué
     (
         theta0,
         theta1,
@@ -278,7 +510,7 @@ def predict_price(km: float, theta_path: str = "theta.json") -> float:
         max_km,
         min_price,
         max_price,
-    ) = load_theta(theta_path)
+    ) = load_theta_cached(theta_path)
 
     # Test explicite : on sait que load_theta() renvoie exactement 0.0
     # par défaut si le modèle n'a pas été entraîné → pas de risque d'imprécision
@@ -303,4 +535,13 @@ def predict_price(km: float, theta_path: str = "theta.json") -> float:
 
 
 # Limite l’API publique du module pour stabilité et clarté d’import.
-__all__ = ["build_parser", "parse_args", "load_theta", "predict_price"]
+__all__ = [
+    "BatchSummary",
+    "build_parser",
+    "invalidate_theta_cache",
+    "load_theta",
+    "load_theta_cached",
+    "parse_args",
+    "predict_batch",
+    "predict_price",
+]
@@ -11,9 +11,63 @@ from __future__ import annotations
 # → évite d’avoir à parser manuellement sys.argv et garantit une aide auto-générée
 import argparse
 
+# Détection des configurations divergentes du balayage
+import math
+
+# Arguments de la ligne de commande : détection de la sous-commande sweep
+import sys
+
+# Flux de lignes normalisées régénéré à chaque époque
+from collections.abc import Callable, Iterator
+
+# Listes de la grille du balayage
+from typing import NamedTuple, TypeVar
+
+# RMSE/R² de chaque configuration déduits des moments, sans relire le CSV
+from metrics import moment_metrics
+
+# Jeux binaires, colonnes compactes, lecture parallèle et profilage
+from .binary import is_binary_dataset
+from .dataset import Dataset
+from .parallel import accumulate_moments_parallel
+from .profiling import Profiler
+
 # On importe uniquement les briques cœur de l’entraînement
 # → séparation claire : la CLI reste une fine couche au-dessus du moteur
-from .train import gradient_descent, read_data, save_theta
+from .train import (
+    DescentResult,
+    Moments,
+    accumulate_moments,
+    fit_ols,
+    gradient_descent_minibatch,
+    gradient_descent_report,
+    gradient_descent_stats_report,
+    gradient_descent_sweep,
+    iter_data,
+    load_coefficients,
+    load_dataset,
+    load_state,
+    merge_moments,
+    normalized_stats,
+    save_theta,
+)
+
+# Critère d’arrêt implicite d’un démarrage à chaud sans --tol-* explicite :
+# un réentraînement quasi identique s’arrête en quelques itérations
+_TOL_GRAD_REPRISE = 1e-6
+
+_T = TypeVar("_T")
+
+
+class _Configuration(NamedTuple):
+    """Une ligne du balayage : hyperparamètres, modèle réel et métriques."""
+
+    alpha: float
+    resultat: DescentResult
+    theta0: float
+    theta1: float
+    rmse: float
+    r2: float
 
 
 def _alpha_type(value: str) -> float:
@@ -73,6 +127,98 @@ def _iters_type(value: str) -> int:
     return iters
 
 
+def _workers_type(value: str) -> int:
+    """Convertit une chaîne en nombre de processus strictement positif.
+
+    But:
+        Valider --workers avec un message CLI clair.
+    """
+
+    try:
+        workers = int(value)
+    except ValueError as exc:  # pragma: no cover - argparse shows the message
+        raise argparse.ArgumentTypeError("workers must be a positive integer") from exc
+    if workers <= 0:
+        raise argparse.ArgumentTypeError("workers must be a positive integer")
+    return workers
+
+
+def _batch_size_type(value: str) -> int:
+    """Convertit --batch-size en nombre de lignes strictement positif."""
+
+    try:
+        taille = int(value)
+    except ValueError as exc:  # pragma: no cover - argparse shows the message
+        raise argparse.ArgumentTypeError(
+            "batch size must be a positive integer"
+        ) from exc
+    if taille <= 0:
+        raise argparse.ArgumentTypeError("batch size must be a positive integer")
+    return taille
+
+
+def _epochs_type(value: str) -> int:
+    """Convertit --epochs en nombre de passes strictement positif."""
+
+    try:
+        epoques = int(value)
+    except ValueError as exc:  # pragma: no cover - argparse shows the message
+        raise argparse.ArgumentTypeError("epochs must be a positive integer") from exc
+    if epoques <= 0:
+        raise argparse.ArgumentTypeError("epochs must be a positive integer")
+    return epoques
+
+
+def _shuffle_buffer_type(value: str) -> int:
+    """Convertit --shuffle-buffer en nombre de lignes ≥ 0 (0 = pas de mélange)."""
+
+    try:
+        taille = int(value)
+    except ValueError as exc:  # pragma: no cover - argparse shows the message
+        raise argparse.ArgumentTypeError(
+            "shuffle buffer must be an integer >= 0"
+        ) from exc
+    if taille < 0:
+        raise argparse.ArgumentTypeError("shuffle buffer must be an integer >= 0")
+    return taille
+
+
+def _tolerance_type(value: str) -> float:
+    """Convertit une chaîne en tolérance d’arrêt finie et positive ou nulle.
+
+    But:
+        Valider --tol-* ; 0 désactive le critère correspondant.
+    """
+
+    # Même encadrement que --alpha : message argparse plutôt qu’un traceback
+    try:
+        tolerance = float(value)
+    except ValueError as exc:  # pragma: no cover - argparse shows the message
+        raise argparse.ArgumentTypeError(
+            "tolerance must be a floating point number"
+        ) from exc
+
+    # NaN ou négatif n’ont pas de sens comme seuil ; inf arrêterait tout
+    if not 0 <= tolerance < float("inf"):
+        raise argparse.ArgumentTypeError("tolerance must be a finite number >= 0")
+    return tolerance
+
+
+def _liste_type(convertir: Callable[[str], _T]) -> Callable[[str], list[_T]]:
+    """Fabrique un type argparse pour une liste séparée par des virgules.
+
+    But:
+        Valider chaque valeur de la grille avec le validateur de l’option simple.
+    """
+
+    def type_liste(value: str) -> list[_T]:
+        valeurs = [convertir(valeur.strip()) for valeur in value.split(",")]
+        # Une valeur répétée entraînerait deux fois le même modèle
+        return list(dict.fromkeys(valeurs))
+
+    return type_liste
+
+
 def build_parser() -> argparse.ArgumentParser:  # pragma: no mutate
     """Construit le parseur d’arguments de l’entraînement.
 
@@ -87,15 +233,24 @@ def build_parser() -> argparse.ArgumentParser:  # pragma: no mutate
         description="Train the linear regression model",
     )  # pragma: no mutate
 
-    # On impose à l’utilisateur de fournir un dataset
-    # afin de garantir que l’entraînement ne démarre jamais à vide
-    parser.add_argument(
+    # On impose à l’utilisateur de fournir un dataset (complet, ou seulement
+    # les nouvelles lignes avec --update) afin de garantir que
+    # l’entraînement ne démarre jamais à vide
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--data",
-        required=True,
         # Aide pour que l’utilisateur comprenne l’attendu
         help="path to training data CSV",
     )  # pragma: no mutate
 
+    # Réentraînement incrémental : l’état sauvegardé dans --theta est
+    # fusionné avec les moments des seules nouvelles lignes
+    source.add_argument(
+        "--update",
+        metavar="NEW_ROWS",
+        help="merge NEW_ROWS into the training state stored in --theta and refit",
+    )  # pragma: no mutate
+
     # On propose un alias français (--taux-apprentissage) pour l’accessibilité
     # tout en fixant dest="alpha" pour préserver un contrat stable
     # avec les tests/scripts
@@ -121,6 +276,114 @@ def build_parser() -> argparse.ArgumentParser:  # pragma: no mutate
         help="number of iterations",
     )  # pragma: no mutate
 
+    # On laisse choisir le moteur d’entraînement : la boucle par ligne reste
+    # l’implémentation de référence, "stats" résume d’abord le dataset
+    # en sommes suffisantes puis itère en O(iters)
+    parser.add_argument(
+        "--engine",
+        choices=["loop", "stats"],
+        default="loop",
+        help="gradient descent engine (loop: per-row reference, stats: sums)",
+    )  # pragma: no mutate
+
+    # On permet de viser directement l’optimum des moindres carrés :
+    # "ols" calcule θ en un passage, "gd" garde la descente de gradient
+    parser.add_argument(
+        "--solver",
+        choices=["gd", "ols"],
+        default="gd",
+        help="gd: gradient descent, ols: closed-form least squares in one pass",
+    )  # pragma: no mutate
+
+    # Lecture parallèle : le CSV est découpé en tranches d’octets analysées
+    # par N processus ; au-delà de 1, l’entraînement passe par les sommes
+    parser.add_argument(
+        "--workers",
+        type=_workers_type,
+        default=1,
+        help="parse the CSV in N processes (N > 1 implies the sums-based engine)",
+    )  # pragma: no mutate
+
+    # Critères d’arrêt anticipé de la descente de gradient (0 = désactivé) :
+    # --iters devient un plafond, la descente s’arrête dès la convergence
+    parser.add_argument(
+        "--tol-grad",
+        type=_tolerance_type,
+        default=0.0,
+        help="stop when the gradient norm is <= this value (0 disables)",
+    )  # pragma: no mutate
+    parser.add_argument(
+        "--tol-cost",
+        type=_tolerance_type,
+        default=0.0,
+        help="stop when the relative cost change is <= this value (0 disables)",
+    )  # pragma: no mutate
+    parser.add_argument(
+        "--tol-step",
+        type=_tolerance_type,
+        default=0.0,
+        help="stop when the parameter update norm is <= this value (0 disables)",
+    )  # pragma: no mutate
+
+    # Descente par mini-lots hors mémoire : le fichier est relu en flux à
+    # chaque époque, seul un lot (et le tampon de mélange) tient en RAM
+    parser.add_argument(
+        "--batch-size",
+        type=_batch_size_type,
+        default=None,
+        help="stream the data and run mini-batch gradient descent with N rows "
+        "per update (replaces --iters by --epochs)",
+    )  # pragma: no mutate
+    parser.add_argument(
+        "--epochs",
+        type=_epochs_type,
+        default=1,
+        help="passes over the data in --batch-size mode",
+    )  # pragma: no mutate
+    parser.add_argument(
+        "--shuffle-buffer",
+        type=_shuffle_buffer_type,
+        default=0,
+        help="shuffle rows through a bounded buffer of N rows "
+        "in --batch-size mode (0 disables)",
+    )  # pragma: no mutate
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="random seed of the shuffle buffer",
+    )  # pragma: no mutate
+
+    # Démarrage à chaud : la descente part des coefficients d’un theta.json
+    # existant, ramenés dans l’espace normalisé des nouvelles bornes
+    parser.add_argument(
+        "--init-from",
+        metavar="THETA",
+        help="start gradient descent from the coefficients stored in THETA "
+        f"(full-batch engines imply --tol-grad {_TOL_GRAD_REPRISE:g} unless a "
+        "--tol-* is given; --batch-size runs every --epochs)",
+    )  # pragma: no mutate
+
+    # Sauvegarde de l’état fusionnable nécessaire à --update
+    parser.add_argument(
+        "--save-state",
+        action="store_true",
+        help="store mergeable training statistics in the theta file for --update",
+    )  # pragma: no mutate
+
+    # Instrumentation opt-in : temps mur/CPU et débits par phase, pic mémoire
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print per-phase wall/CPU time, rows/s and iterations/s, "
+        "then the peak memory of the process",
+    )  # pragma: no mutate
+    parser.add_argument(
+        "--profile-json",
+        metavar="PATH",
+        help="also write the profile as JSON to PATH (implies --profile)",
+    )  # pragma: no mutate
+
     # On expose le chemin du fichier de sauvegarde des coefficients
     # pour donner le choix à l’utilisateur et éviter un fichier imposé
     parser.add_argument(
@@ -135,22 +398,315 @@ def build_parser() -> argparse.ArgumentParser:  # pragma: no mutate
     return parser  # pragma: no mutate
 
 
-def main(argv: list[str] | None = None) -> int:  # pragma: no mutate
-    """Entraîne le modèle via la ligne de commande.
+def build_sweep_parser() -> argparse.ArgumentParser:  # pragma: no mutate
+    """Construit le parseur de ``train sweep``.
 
     But:
-        Parser, normaliser, optimiser, dénormaliser, puis sauvegarder.
+        Décrire une grille alpha × iters entraînée en un seul passage.
     """
 
-    # On passe par argparse pour garantir une CLI standardisée et claire,
-    # et ainsi éviter les entrées mal formées ou ambiguës
-    args = build_parser().parse_args(argv)
+    parser = argparse.ArgumentParser(
+        prog="train sweep",
+        description="Train every alpha x iters configuration in one data pass "
+        "and save the model with the lowest RMSE",
+    )  # pragma: no mutate
+    parser.add_argument(
+        "--data",
+        required=True,
+        help="path to training data CSV",
+    )  # pragma: no mutate
+
+    # Mêmes validateurs que l’entraînement simple, appliqués à chaque valeur
+    parser.add_argument(
+        "--alpha",
+        type=_liste_type(_alpha_type),
+        default=[0.1],
+        help="comma-separated learning rates, e.g. 0.01,0.1,0.5",
+    )  # pragma: no mutate
+    parser.add_argument(
+        "--iters",
+        type=_liste_type(_iters_type),
+        default=[1000],
+        help="comma-separated iteration counts, e.g. 100,1000",
+    )  # pragma: no mutate
+    parser.add_argument(
+        "--workers",
+        type=_workers_type,
+        default=1,
+        help="parse the CSV in N processes",
+    )  # pragma: no mutate
+    parser.add_argument(
+        "--theta",
+        default="theta.json",
+        help="path of the best model's theta JSON",
+    )  # pragma: no mutate
+    return parser  # pragma: no mutate
+
+
+def _denormalize(
+    theta0_n: float,
+    theta1_n: float,
+    bornes: tuple[float, float, float, float],
+) -> tuple[float, float]:
+    """Ramène des coefficients appris sur données normalisées à l’échelle réelle.
+
+    But:
+        Partager la dénormalisation entre tous les moteurs d’entraînement.
+    """
+
+    min_km, max_km, min_price, max_price = bornes
+
+    # On impose une borne non nulle pour éviter une division par zéro
+    # dans les cas dégénérés (ex: tous les km ou prix identiques)
+    km_range = max_km - min_km or 1.0  # pragma: no mutate
+    price_range = max_price - min_price or 1.0  # pragma: no mutate
+
+    # On ramène les paramètres du modèle à l’échelle réelle
+    # pour que les prédictions soient exprimées en km/prix d’origine
+    theta1 = theta1_n * price_range / km_range
+    theta0 = theta0_n * price_range + min_price - theta1 * min_km  # pragma: no mutate
+    return theta0, theta1
+
+
+def _normalize_theta(
+    theta0: float,
+    theta1: float,
+    bornes: tuple[float, float, float, float],
+) -> tuple[float, float]:
+    """Inverse de :func:`_denormalize` : coefficients réels → espace normalisé.
+
+    But:
+        Démarrer la descente depuis un modèle existant, sous de nouvelles bornes.
+    """
+
+    min_km, max_km, min_price, max_price = bornes
+    km_range = max_km - min_km or 1.0  # pragma: no mutate
+    price_range = max_price - min_price or 1.0  # pragma: no mutate
+
+    # prix = θ0 + θ1·km avec km = min_km + km_range·x et
+    # prix = min_price + price_range·y → y = θ0_n + θ1_n·x
+    theta1_n = theta1 * km_range / price_range
+    theta0_n = (theta0 + theta1 * min_km - min_price) / price_range
+    return theta0_n, theta1_n
+
+
+def _depart(
+    args: argparse.Namespace, bornes: tuple[float, float, float, float]
+) -> tuple[float, float]:
+    """Point de départ normalisé de la descente : origine ou --init-from."""
+
+    if args.init_from is None:
+        return 0.0, 0.0
+    return _normalize_theta(*load_coefficients(args.init_from), bornes)
+
+
+def _tolerances(args: argparse.Namespace) -> dict[str, float]:
+    """Regroupe les critères d’arrêt de la CLI pour les moteurs de descente."""
+
+    tolerances = {
+        "tol_grad": args.tol_grad,
+        "tol_cost": args.tol_cost,
+        "tol_step": args.tol_step,
+    }
+    # Démarrage à chaud sans critère explicite : --iters ne doit pas être
+    # consommé en entier quand le modèle de départ est déjà au minimum
+    if args.init_from is not None and not any(tolerances.values()):
+        tolerances["tol_grad"] = _TOL_GRAD_REPRISE
+    return tolerances
+
+
+def _cout_reel(
+    cout_normalise: float, bornes: tuple[float, float, float, float]
+) -> float:
+    """Ramène un coût calculé sur prix normalisés à l’échelle des prix réels.
+
+    But:
+        Enregistrer dans theta.json un coût indépendant de la normalisation.
+    """
+
+    # La dénormalisation est affine et exacte : chaque résidu est multiplié
+    # par la plage des prix, donc le coût par son carré
+    _, _, min_price, max_price = bornes
+    price_range = max_price - min_price or 1.0  # pragma: no mutate
+    return cout_normalise * price_range**2
+
+
+def _train_streaming(args: argparse.Namespace, profil: Profiler) -> int:
+    """Entraîne à partir des moments, sans matérialiser le dataset.
+
+    But:
+        Servir les modes "ols" et "stats" en mémoire constante.
+    """
+
+    try:
+        # Un seul parcours du CSV en flux : moments centrés + bornes,
+        # éventuellement réparti sur plusieurs processus puis réduit ici
+        # → avec --update, seules les nouvelles lignes sont lues
+        with profil.phase("parse") as phase:
+            chemin = args.update if args.update is not None else args.data
+            if args.workers > 1:
+                moments = accumulate_moments_parallel(chemin, args.workers)
+            else:
+                moments = accumulate_moments(iter_data(chemin))
+            phase.rows = moments.n
+
+        # L’historique n’est jamais relu : ses moments sauvegardés sont
+        # fusionnés avec ceux des nouvelles lignes (formule de Chan)
+        if args.update is not None:
+            with profil.phase("merge"):
+                moments = merge_moments(load_state(args.theta), moments)
+
+        bornes = (moments.min_km, moments.max_km, moments.min_price, moments.max_price)
+        depart = _depart(args, bornes)
+    except ValueError as exc:
+        # Même contrat d’erreur que le chemin par liste
+        print(f"ERROR: {exc}")
+        return 2
+
+    iterations: int | None
+    if args.solver == "ols":
+        # Formule fermée : les θ sont directement à l’échelle réelle,
+        # et le coût se déduit des moments : Σ résidus² = Syy - θ1·Sxy
+        with profil.phase("solve"):
+            theta0, theta1 = fit_ols(moments)
+            iterations = None
+            cout = max(0.0, moments.m2_price - theta1 * moments.c_km_price) / (
+                2 * moments.n
+            )
+    else:
+        # Sommes des données normalisées dérivées des moments,
+        # puis itérations en O(1) chacune, avec arrêt anticipé éventuel
+        with profil.phase("normalize"):
+            statistiques = normalized_stats(moments)
+        with profil.phase("descent") as phase:
+            resultat = gradient_descent_stats_report(
+                statistiques,
+                args.alpha,
+                args.iters,
+                theta_init=depart,
+                **_tolerances(args),
+            )
+            phase.iterations = resultat.iterations
+        theta0, theta1 = _denormalize(resultat.theta0, resultat.theta1, bornes)
+        iterations = resultat.iterations
+        cout = _cout_reel(resultat.cost, bornes)
+
+    # Même schéma theta.json que l’entraînement de référence
+    with profil.phase("save"):
+        # Après --update, l’état fusionné remplace l’ancien pour la prochaine
+        save_theta(
+            theta0,
+            theta1,
+            args.theta,
+            *bornes,
+            iterations=iterations,
+            cost=cout,
+            state=moments if args.save_state or args.update is not None else None,
+        )
+    return 0
+
+
+def _est_binaire(path: str) -> bool:
+    """Indique un dataset binaire ; un fichier illisible est traité plus loin."""
+
+    try:
+        return is_binary_dataset(path)
+    except OSError:
+        return False
+
+
+def _train_minibatch(args: argparse.Namespace, profil: Profiler) -> int:
+    """Entraîne par mini-lots en relisant le fichier à chaque époque.
+
+    But:
+        Entraîner sur un dataset plus gros que la RAM, mémoire bornée au lot.
+    """
+
+    try:
+        # Bornes de normalisation : lues dans l’en-tête d’un dataset binaire,
+        # sinon un premier passage en flux (parallèle avec --workers) qui
+        # valide aussi tout le fichier avant la descente
+        moments: Moments | None = None
+        with profil.phase("bounds") as phase:
+            if _est_binaire(args.data):
+                # Projection refermée dès l’en-tête lu : chaque époque
+                # relira le fichier en flux
+                with load_dataset(args.data) as entete:
+                    bornes, phase.rows = entete.bounds(), len(entete)
+                    # L’état fusionnable exige les moments : un passage mmap
+                    if args.save_state:
+                        moments = accumulate_moments(entete)
+            else:
+                moments = accumulate_moments_parallel(args.data, args.workers)
+                bornes = (
+                    moments.min_km,
+                    moments.max_km,
+                    moments.min_price,
+                    moments.max_price,
+                )
+                phase.rows = moments.n
+        lignes = phase.rows or 0
+
+        min_km, max_km, min_price, max_price = bornes
+        km_range = max_km - min_km or 1.0  # pragma: no mutate
+        price_range = max_price - min_price or 1.0  # pragma: no mutate
+
+        # Flux normalisé dans [0,1], régénéré à chaque appel (une époque)
+        def flux_normalise() -> Iterator[tuple[float, float]]:
+            return (
+                ((km - min_km) / km_range, (prix - min_price) / price_range)
+                for km, prix in iter_data(args.data)
+            )
+
+        with profil.phase("descent") as phase:
+            resultat = gradient_descent_minibatch(
+                flux_normalise,
+                args.alpha,
+                args.batch_size,
+                args.epochs,
+                shuffle_buffer=args.shuffle_buffer,
+                seed=args.seed,
+                theta_init=_depart(args, bornes),
+            )
+            # Époques + passage final de calcul du coût
+            phase.rows = lignes * (args.epochs + 1)
+            phase.iterations = resultat.iterations
+    except ValueError as exc:
+        # Même contrat d’erreur que les autres modes
+        print(f"ERROR: {exc}")
+        return 2
+
+    theta0, theta1 = _denormalize(resultat.theta0, resultat.theta1, bornes)
+
+    # Même schéma theta.json (bornes comprises) que l’entraînement de référence
+    with profil.phase("save"):
+        save_theta(
+            theta0,
+            theta1,
+            args.theta,
+            *bornes,
+            iterations=resultat.iterations,
+            cost=_cout_reel(resultat.cost, bornes),
+            state=moments if args.save_state else None,
+        )
+    return 0
+
+
+def _train_loop(args: argparse.Namespace, profil: Profiler) -> int:
+    """Entraîne avec la boucle par ligne de référence.
+
+    But:
+        Charger, normaliser, optimiser, dénormaliser, puis sauvegarder.
+    """
 
     # Encadre la lecture des données pour gérer les erreurs utilisateur.
     try:
         # On centralise la lecture/validation des données ici afin
         # de protéger l’utilisateur contre les CSV corrompus ou incomplets
-        data = read_data(args.data)
+        # → chargement colonnaire compact (deux tampons float64)
+        with profil.phase("parse") as phase:
+            data = load_dataset(args.data)
+            phase.rows = len(data)
     # Capture une erreur de format/valeur et passe en sortie contrôlée.
     except ValueError as exc:
         # On affiche une erreur simple et lisible à l’utilisateur
@@ -159,53 +715,217 @@ def main(argv: list[str] | None = None) -> int:  # pragma: no mutate
         # Retour ≠ 0 pour signaler un échec de parsing ou de dataset
         return 2
 
-    # On décompose explicitement km/prix pour traiter chaque dimension
-    # séparément (notamment pour la normalisation qui suit)
-    kms, prices = zip(*data)
+    # Projection mmap d’un dataset binaire refermée dès que les colonnes
+    # normalisées et l’état fusionnable sont calculés
+    with data:
+        try:
+            # Point de départ ramené aux bornes du nouveau dataset
+            bornes = data.bounds()
+            depart = _depart(args, bornes)
+        except ValueError as exc:
+            # Theta de départ absent ou invalide : même sortie contrôlée
+            print(f"ERROR: {exc}")
+            return 2
+
+        with profil.phase("normalize") as phase:
+            # On calcule les bornes min/max sur les colonnes contiguës (ou on les
+            # lit dans l’en-tête d’un dataset binaire) pour ramener les valeurs
+            # dans une plage stable, et éviter que le gradient soit dominé par
+            # des échelles trop grandes
+            min_km, max_km, min_price, max_price = bornes
+
+            # On impose une borne non nulle pour éviter une division par zéro
+            # dans les cas dégénérés (ex: tous les km ou prix identiques)
+            km_range = max_km - min_km or 1.0  # pragma: no mutate
+            price_range = max_price - min_price or 1.0  # pragma: no mutate
+
+            # On normalise les données dans [0,1] pour :
+            #  - améliorer la stabilité numérique
+            #  - accélérer la convergence du gradient
+            # Les colonnes normalisées restent dans un Dataset compact
+            normalized = Dataset(
+                ((km - min_km) / km_range for km in data.km),
+                ((price - min_price) / price_range for price in data.price),
+            )
+            phase.rows = len(normalized)
+
+        # On entraîne le modèle sur données normalisées pour éviter
+        # les biais liés aux unités ou aux ordres de grandeur ;
+        # la descente s’arrête plus tôt si un critère --tol-* est atteint
+        with profil.phase("descent") as phase:
+            resultat = gradient_descent_report(
+                normalized,
+                args.alpha,
+                args.iters,
+                theta_init=depart,
+                **_tolerances(args),
+            )
+            phase.rows = len(normalized)
+            phase.iterations = resultat.iterations
+
+        # L’état fusionnable se calcule sur les colonnes déjà en mémoire
+        etat = None
+        if args.save_state:
+            with profil.phase("state"):
+                etat = accumulate_moments(data)
 
-    # On calcule les bornes min/max pour ramener les valeurs
-    # dans une plage stable, et éviter que le gradient soit dominé
-    # par des échelles trop grandes
-    min_km, max_km = min(kms), max(kms)
-    min_price, max_price = min(prices), max(prices)
+    # On ramène les paramètres du modèle à l’échelle réelle
+    theta0, theta1 = _denormalize(resultat.theta0, resultat.theta1, bornes)
 
-    # On impose une borne non nulle pour éviter une division par zéro
-    # dans les cas dégénérés (ex: tous les km ou prix identiques)
-    km_range = max_km - min_km or 1.0  # pragma: no mutate
-    price_range = max_price - min_price or 1.0  # pragma: no mutate
+    # On sauvegarde les paramètres et bornes pour que `predict.py`
+    # puisse reproduire exactement le même contexte de calcul
+    # ainsi que l’effort réellement dépensé (itérations, coût final)
+    with profil.phase("save"):
+        save_theta(
+            theta0,
+            theta1,
+            args.theta,
+            min_km,
+            max_km,
+            min_price,
+            max_price,
+            iterations=resultat.iterations,
+            cost=_cout_reel(resultat.cost, bornes),
+            state=etat,
+        )
+    # Succès nominal.
+    return 0
 
-    # On normalise les données dans [0,1] pour :
-    #  - améliorer la stabilité numérique
-    #  - accélérer la convergence du gradient
-    normalized = [
-        ((km - min_km) / km_range, (price - min_price) / price_range)
-        for km, price in data
-    ]
 
-    # On entraîne le modèle sur données normalisées pour éviter
-    # les biais liés aux unités ou aux ordres de grandeur
-    theta0_n, theta1_n = gradient_descent(normalized, args.alpha, args.iters)
+def sweep_main(argv: list[str] | None = None) -> int:  # pragma: no mutate
+    """Entraîne toute une grille d’hyperparamètres et garde le meilleur modèle.
 
-    # On ramène les paramètres du modèle à l’échelle réelle
-    # pour que les prédictions soient exprimées en km/prix d’origine
-    theta1 = theta1_n * price_range / km_range
-    theta0 = theta0_n * price_range + min_price - theta1 * min_km  # pragma: no mutate
+    But:
+        Remplacer des dizaines d’entraînements par un seul passage des données.
+    """
 
-    # On sauvegarde les paramètres et bornes pour que `predict.py`
-    # puisse reproduire exactement le même contexte de calcul
+    args = build_sweep_parser().parse_args(argv)
+
+    # Unique lecture des données : les moments suffisent à la descente
+    # (moteur "stats") comme à l’évaluation de chaque configuration
+    try:
+        if args.workers > 1:
+            moments = accumulate_moments_parallel(args.data, args.workers)
+        else:
+            moments = accumulate_moments(iter_data(args.data))
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        return 2
+
+    bornes = (moments.min_km, moments.max_km, moments.min_price, moments.max_price)
+    resultats = gradient_descent_sweep(
+        normalized_stats(moments), args.alpha, args.iters
+    )
+
+    # Une ligne par configuration, dans l’ordre alpha puis iters
+    configurations = []
+    for indice, resultat in enumerate(resultats):
+        theta0, theta1 = _denormalize(resultat.theta0, resultat.theta1, bornes)
+        rmse, r2 = moment_metrics(moments, theta0, theta1)
+        alpha = args.alpha[indice // len(args.iters)]
+        configurations.append(_Configuration(alpha, resultat, theta0, theta1, rmse, r2))
+
+    # Meilleur modèle = RMSE minimal ; une descente divergente est écartée
+    candidats = [c for c in configurations if math.isfinite(c.rmse)]
+    if not candidats:
+        print("ERROR: every configuration diverged")
+        return 2
+    meilleur = min(candidats, key=lambda c: c.rmse)
+
+    print(f"{'alpha':>10}{'iters':>10}{'RMSE':>14}{'R2':>10}")
+    for c in configurations:
+        repere = " *" if c is meilleur else ""
+        print(
+            f"{c.alpha:>10g}{c.resultat.iterations:>10d}"
+            f"{c.rmse:>14.4f}{c.r2:>10.4f}{repere}"
+        )
+
+    # Même schéma theta.json que l’entraînement simple
     save_theta(
-        theta0,
-        theta1,
+        meilleur.theta0,
+        meilleur.theta1,
         args.theta,
-        min_km,
-        max_km,
-        min_price,
-        max_price,
+        *bornes,
+        iterations=meilleur.resultat.iterations,
+        cost=_cout_reel(meilleur.resultat.cost, bornes),
+    )
+    print(
+        f"best: alpha={meilleur.alpha:g} iters={meilleur.resultat.iterations}"
+        f" -> {args.theta}"
     )
-    # Succès nominal.
     return 0
 
 
+def main(argv: list[str] | None = None) -> int:  # pragma: no mutate
+    """Entraîne le modèle via la ligne de commande.
+
+    But:
+        Parser, normaliser, optimiser, dénormaliser, puis sauvegarder.
+    """
+
+    # Sous-commande "train sweep" : grille d’hyperparamètres
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["sweep"]:
+        return sweep_main(argv[1:])
+
+    # On passe par argparse pour garantir une CLI standardisée et claire,
+    # et ainsi éviter les entrées mal formées ou ambiguës
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    # Les options de mini-lots n’ont de sens qu’avec --batch-size, qui
+    # remplace à la fois le solveur fermé et le moteur par sommes
+    if args.batch_size is None and (args.epochs != 1 or args.shuffle_buffer):
+        parser.error("--epochs and --shuffle-buffer require --batch-size")
+    if args.batch_size is not None and (
+        args.solver == "ols" or args.engine == "stats" or args.update is not None
+    ):
+        parser.error(
+            "--batch-size cannot be combined with --solver ols, --engine stats "
+            "or --update"
+        )
+    # Les mini-lots n’évaluent ni gradient complet ni coût par itération :
+    # un critère --tol-* serait silencieusement ignoré
+    if args.batch_size is not None and (
+        args.tol_grad or args.tol_cost or args.tol_step
+    ):
+        parser.error(
+            "--tol-grad, --tol-cost and --tol-step cannot be combined with "
+            "--batch-size"
+        )
+
+    # Le solveur fermé n’a pas de point de départ
+    if args.init_from is not None and args.solver == "ols":
+        parser.error("--init-from requires gradient descent (--solver gd)")
+
+    # Le profil est toujours collecté (coût négligeable) mais n’est
+    # affiché ou écrit que sur demande
+    profil = Profiler()
+
+    # Les modes "ols", "stats", multi-processus et --update n’ont besoin que
+    # de moments : on lit en flux pour que la mémoire ne dépende plus de la
+    # taille du CSV (--update réajuste donc avec le moteur "stats" ou "ols")
+    if args.batch_size is not None:
+        code = _train_minibatch(args, profil)
+    elif (
+        args.solver == "ols"
+        or args.engine == "stats"
+        or args.workers > 1
+        or args.update is not None
+    ):
+        code = _train_streaming(args, profil)
+    else:
+        code = _train_loop(args, profil)
+
+    # Rapport de profil uniquement pour un entraînement réussi
+    if code == 0 and (args.profile or args.profile_json):
+        profil.print_summary()
+        if args.profile_json:
+            profil.dump(args.profile_json)
+    return code
+
+
 if __name__ == "__main__":  # pragma: no cover - module glue
     # Propage code retour de main() au système (exit code ≠0 si échec métier).
     raise SystemExit(main())  # pragma: no mutate
@@ -0,0 +1,159 @@
+"""Format binaire colonnaire des datasets ``(km, price)``.
+
+Disposition (petit-boutiste) :
+
+* en-tête de 64 octets : magic ``FTLRBIN\\0``, version (uint32), réservé
+  (uint32), nombre de lignes (uint64), ``min_km``, ``max_km``,
+  ``min_price``, ``max_price`` (float64), puis bourrage à zéro ;
+* colonne ``km`` : ``n`` float64 contigus ;
+* colonne ``price`` : ``n`` float64 contigus.
+
+But:
+    Éviter de re-parser le CSV à chaque exécution grâce à un accès mmap.
+"""
+
+# Active les annotations différées pour éviter les problèmes d’ordre d’import
+from __future__ import annotations
+
+# mmap projette le fichier en mémoire : les colonnes sont lues sans copie
+import mmap
+
+# struct décrit l’en-tête binaire de façon explicite et portable
+import struct
+
+# sys.byteorder permet de vérifier que les float64 natifs sont petit-boutistes
+import sys
+
+# Path pour des chemins portables
+from pathlib import Path
+
+# Conteneurs colonnaires partagés avec le chargement CSV
+from .dataset import ColumnarData, Dataset
+
+# Signature du format : permet de reconnaître un fichier binaire à coup sûr
+MAGIC = b"FTLRBIN\0"
+
+# Version du format, à incrémenter à chaque changement de disposition
+VERSION = 1
+
+# magic, version, réservé, nombre de lignes, 4 bornes float64
+_ENTETE = struct.Struct("<8sIIQ4d")
+
+# Taille totale réservée à l’en-tête : multiple de 8 pour aligner les colonnes
+TAILLE_ENTETE = 64
+
+
+def is_binary_dataset(path: str | Path) -> bool:
+    """Return ``True`` when ``path`` starts with the binary dataset magic.
+
+    But:
+        Choisir entre lecture CSV et projection mmap sans se fier à l’extension.
+    """
+
+    # On ne lit que les premiers octets : coût négligeable
+    with Path(path).open("rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_binary_dataset(data: ColumnarData, path: str | Path) -> None:
+    """Write ``data`` to ``path`` in the binary columnar format.
+
+    But:
+        Sérialiser un dataset déjà validé avec ses bornes précalculées.
+    """
+
+    # Un fichier binaire sans ligne serait inutilisable par l’entraînement
+    if len(data) == 0:
+        raise ValueError("no data rows found")
+
+    # On garantit des colonnes float64 contiguës avant l’écriture
+    colonnes = data if isinstance(data, Dataset) else Dataset(data.km, data.price)
+    entete = _ENTETE.pack(MAGIC, VERSION, 0, len(colonnes), *colonnes.bounds())
+
+    # Le format est petit-boutiste : on convertit une copie si besoin
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts only
+        colonnes = Dataset(colonnes.km, colonnes.price)
+        colonnes.km.byteswap()
+        colonnes.price.byteswap()
+
+    with Path(path).open("wb") as f:
+        f.write(entete.ljust(TAILLE_ENTETE, b"\0"))
+        colonnes.km.tofile(f)
+        colonnes.price.tofile(f)
+
+
+class MappedDataset(ColumnarData):
+    """Zero-copy dataset whose columns are views over a memory-mapped file.
+
+    :meth:`close` (or a ``with`` block) unmaps the file; the columns must
+    not be used afterwards.
+
+    But:
+        Démarrer en quelques millisecondes quelle que soit la taille du fichier.
+    """
+
+    __slots__ = ("_bornes", "_carte")
+
+    km: memoryview[float]
+    price: memoryview[float]
+
+    def __init__(self, path: str | Path) -> None:
+        with Path(path).open("rb") as f:
+            # On vérifie l’en-tête avant de projeter quoi que ce soit
+            brut = f.read(TAILLE_ENTETE)
+            if len(brut) < TAILLE_ENTETE or brut[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"invalid binary dataset: {path}")
+            _, version, _, n, *bornes = _ENTETE.unpack_from(brut)
+            if version != VERSION:
+                raise ValueError(f"unsupported binary dataset version: {version}")
+
+            # Projection en lecture seule : le noyau charge les pages à la demande
+            self._carte = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Un fichier tronqué ne contiendrait pas les deux colonnes complètes
+        taille_colonne = 8 * n
+        if len(self._carte) < TAILLE_ENTETE + 2 * taille_colonne:
+            self._carte.close()
+            raise ValueError(f"truncated binary dataset: {path}")
+
+        # Les colonnes sont des vues typées 'd' directement sur la projection ;
+        # la vue d’ensemble est libérée aussitôt, seules les colonnes restent
+        with memoryview(self._carte) as vue:
+            debut_prix = TAILLE_ENTETE + taille_colonne
+            self.km = vue[TAILLE_ENTETE:debut_prix].cast("d")
+            self.price = vue[debut_prix : debut_prix + taille_colonne].cast("d")
+        self._bornes = (bornes[0], bornes[1], bornes[2], bornes[3])
+
+        # Sur une machine gros-boutiste, les vues directes seraient fausses :
+        # on se rabat sur une copie retournée (le zéro-copie est alors perdu)
+        if sys.byteorder != "little":  # pragma: no cover - big-endian hosts only
+            copie = Dataset(self.km, self.price)
+            copie.km.byteswap()
+            copie.price.byteswap()
+            self.km.release()
+            self.price.release()
+            self.km = memoryview(copie.km).cast("d")
+            self.price = memoryview(copie.price).cast("d")
+
+    def bounds(self) -> tuple[float, float, float, float]:
+        """Return the bounds stored in the header, without scanning the data."""
+
+        return self._bornes
+
+    def close(self) -> None:
+        """Release the column views, then unmap the file (idempotent)."""
+
+        # mmap refuse de se fermer tant qu’une vue l’exporte encore
+        self.km.release()
+        self.price.release()
+        self._carte.close()
+
+
+__all__ = [
+    "MAGIC",
+    "TAILLE_ENTETE",
+    "VERSION",
+    "MappedDataset",
+    "is_binary_dataset",
+    "write_binary_dataset",
+]
@@ -0,0 +1,64 @@
+"""Point d'entrée CLI de conversion CSV → dataset binaire.
+
+But:
+    Valider un CSV une seule fois et produire un fichier projetable en mémoire.
+"""
+
+# pragma: no mutate
+from __future__ import annotations
+
+# argparse offre une CLI cohérente avec train/predict
+import argparse
+
+# Écriture du format binaire colonnaire
+from .binary import write_binary_dataset
+
+# Même lecture validée que l’entraînement
+from .train import load_dataset
+
+
+def build_parser() -> argparse.ArgumentParser:  # pragma: no mutate
+    """Construit le parseur d’arguments de la conversion.
+
+    But:
+        Définir la source CSV et la destination binaire.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Convert a km,price CSV to the binary dataset format",
+    )  # pragma: no mutate
+
+    # Source : CSV validé exactement comme pour l’entraînement
+    parser.add_argument("csv", help="path to km,price CSV")  # pragma: no mutate
+
+    # Destination : fichier binaire lu ensuite par train/metrics/viz
+    parser.add_argument("output", help="path to binary dataset")  # pragma: no mutate
+    return parser  # pragma: no mutate
+
+
+def main(argv: list[str] | None = None) -> int:  # pragma: no mutate
+    """Convertit un CSV en dataset binaire.
+
+    But:
+        Payer le coût du parsing une fois pour toutes les exécutions suivantes.
+    """
+
+    args = build_parser().parse_args(argv)
+    try:
+        # On passe par la même validation que read_data : lignes, NaN, négatifs
+        # (source binaire : projection refermée une fois la copie écrite)
+        with load_dataset(args.csv) as data:
+            write_binary_dataset(data, args.output)
+    except ValueError as exc:
+        # Même contrat d’erreur que la CLI d’entraînement
+        print(f"ERROR: {exc}")
+        return 2
+    except OSError as exc:
+        # Destination absente ou non inscriptible : message court, code 2
+        print(f"ERROR: cannot write binary dataset: {args.output} ({exc.strerror})")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - module glue
+    raise SystemExit(main())  # pragma: no mutate
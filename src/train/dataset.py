@@ -0,0 +1,143 @@
+"""Conteneur colonnaire compact pour les données ``(km, price)``.
+
+But:
+    Stocker les observations dans deux tampons ``array('d')`` contigus.
+"""
+
+# Active les annotations différées pour éviter les problèmes d’ordre d’import
+from __future__ import annotations
+
+# array('d') stocke des float64 bruts : 8 octets par valeur au lieu
+# d’un objet float + un tuple Python par ligne
+from array import array
+
+# Sequence fournit gratuitement index/count/__contains__/__reversed__
+# → le conteneur est accepté partout où une séquence de tuples l’est
+from collections.abc import Iterable, Iterator, Sequence
+
+# Types utilitaires pour les signatures
+from typing import TypeVar, overload
+
+# typing.Self n’existe qu’à partir de 3.11 et typing_extensions n’est pas
+# une dépendance : un TypeVar lié type __enter__ pour chaque sous-classe
+_Colonnes = TypeVar("_Colonnes", bound="ColumnarData")
+
+
+class ColumnarData(Sequence[tuple[float, float]]):
+    """Read-only ``(km, price)`` view over two float64 columns.
+
+    Iterating or indexing yields ``(km, price)`` tuples, so any subclass
+    can replace the ``list[tuple[float, float]]`` returned by ``read_data``.
+
+    But:
+        Partager l’interface des conteneurs colonnaires (mémoire ou mmap).
+    """
+
+    # Pas de __dict__ par instance : seules les deux colonnes sont stockées
+    __slots__ = ("km", "price")
+
+    km: Sequence[float]
+    price: Sequence[float]
+
+    def columns(self) -> tuple[memoryview, memoryview]:
+        """Return zero-copy ``memoryview`` objects over the km and price columns.
+
+        The views must be released before :meth:`Dataset.append` can grow
+        the buffers.
+        """
+
+        # Les vues partagent le tampon : aucune copie, format 'd' exposé
+        # aux consommateurs du protocole buffer (struct, mmap, NumPy…)
+        return memoryview(self.km), memoryview(self.price)  # type: ignore[arg-type]
+
+    def bounds(self) -> tuple[float, float, float, float]:
+        """Return ``(min_km, max_km, min_price, max_price)``."""
+
+        # Parcours des colonnes contiguës, sans reconstruire de tuples
+        return min(self.km), max(self.km), min(self.price), max(self.price)
+
+    def close(self) -> None:
+        """Release the resources backing the columns (no-op in memory)."""
+
+    def __enter__(self: _Colonnes) -> _Colonnes:  # noqa: PYI019
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        # Même usage pour tous les conteneurs : with load_dataset(...) as d
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.km)
+
+    def __iter__(self) -> Iterator[tuple[float, float]]:
+        # On reconstruit les paires à la volée, sans les stocker
+        return zip(self.km, self.price)
+
+    @overload
+    def __getitem__(self, index: int) -> tuple[float, float]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Dataset: ...
+
+    def __getitem__(self, index: int | slice) -> tuple[float, float] | Dataset:
+        # Une tranche reste un Dataset pour conserver la compacité
+        if isinstance(index, slice):
+            return Dataset(self.km[index], self.price[index])
+        return self.km[index], self.price[index]
+
+    def __eq__(self, other: object) -> bool:
+        # On compare ligne à ligne avec toute séquence de paires,
+        # pour rester interchangeable avec la liste de tuples historique
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            ligne == autre for ligne, autre in zip(self, other)
+        )
+
+    # Un conteneur comparable par contenu ne doit pas être hachable
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self)} rows>)"
+
+
+class Dataset(ColumnarData):
+    """Column-oriented ``(km, price)`` dataset backed by ``array('d')``.
+
+    But:
+        Réduire la mémoire (~16 octets par ligne) et offrir des colonnes contiguës.
+    """
+
+    __slots__ = ()
+
+    km: array[float]
+    price: array[float]
+
+    def __init__(self, km: Iterable[float] = (), price: Iterable[float] = ()) -> None:
+        # On copie dans des tampons typés pour garantir des float64 contigus
+        self.km = array("d", km)
+        self.price = array("d", price)
+
+        # Deux colonnes de tailles différentes ne forment pas un dataset :
+        # on refuse plutôt que de tronquer silencieusement comme zip()
+        if len(self.km) != len(self.price):
+            raise ValueError("km and price columns must have the same length")
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[float, float]]) -> Dataset:
+        """Build a dataset from ``(km, price)`` pairs in a single pass."""
+
+        # On remplit les colonnes au fil de l’eau : aucun tuple n’est conservé
+        dataset = cls()
+        for km, price in rows:
+            dataset.append(km, price)
+        return dataset
+
+    def append(self, km: float, price: float) -> None:
+        """Append one observation to both columns."""
+
+        self.km.append(km)
+        self.price.append(price)
+
+
+__all__ = ["ColumnarData", "Dataset"]
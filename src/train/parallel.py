@@ -0,0 +1,165 @@
+"""Accumulation parallèle des moments sur des tranches d’un CSV.
+
+Le fichier est découpé en plages d’octets alignées sur des débuts de ligne ;
+chaque plage est analysée et validée dans un processus worker qui renvoie
+ses :class:`~train.train.Moments` partiels, réduits ensuite dans le parent.
+
+But:
+    Occuper tous les cœurs pendant la lecture d’un gros CSV.
+"""
+
+# Active les annotations différées pour éviter les problèmes d’ordre d’import
+from __future__ import annotations
+
+# io fournit les couches binaire → texte au-dessus d’une plage d’octets
+import io
+
+# ProcessPoolExecutor contourne le GIL : un processus par tranche
+from concurrent.futures import ProcessPoolExecutor
+
+# Tranches [a, b) entre deux coupures successives
+from itertools import pairwise
+
+# Path pour des chemins portables
+from pathlib import Path
+
+# Format binaire : déjà validé, lu en mmap sans parsing
+from .binary import is_binary_dataset
+
+# Briques de lecture/validation et de réduction partagées avec train.py
+from .train import (
+    InvalidRowError,
+    Moments,
+    _lignes_csv,
+    accumulate_moments,
+    iter_data,
+    merge_moments,
+)
+
+# Moments neutres pour la réduction (bornes ±inf fixées par la 1re partie)
+_VIDE = Moments(
+    0, 0.0, 0.0, 0.0, 0.0, 0.0, float("inf"), float("-inf"), float("inf"), float("-inf")
+)
+
+
+class _Tranche(io.RawIOBase):
+    """Fichier brut limité à la plage d’octets ``[debut, fin)``."""
+
+    def __init__(self, path: str, debut: int, fin: int) -> None:
+        super().__init__()
+        self._fichier = open(path, "rb", buffering=0)  # noqa: SIM115
+        self._fichier.seek(debut)
+        self._restant = fin - debut
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, tampon: bytearray | memoryview) -> int:  # type: ignore[override]
+        # On ne lit jamais au-delà de la fin de la tranche
+        taille = min(len(tampon), self._restant)
+        if taille <= 0:
+            return 0
+        lus = self._fichier.readinto(memoryview(tampon)[:taille]) or 0
+        self._restant -= lus
+        return lus
+
+    def close(self) -> None:
+        self._fichier.close()
+        super().close()
+
+
+def _moments_tranche(path: str, debut: int, fin: int) -> Moments:
+    """Analyse et résume une tranche ; exécuté dans un processus worker.
+
+    But:
+        Renvoyer des moments partiels ; les erreurs portent un numéro local.
+    """
+
+    # Même décodage que iter_data (UTF-8, fins de ligne préservées),
+    # même analyseur : seules la plage et la numérotation changent
+    with io.TextIOWrapper(
+        io.BufferedReader(_Tranche(path, debut, fin)), encoding="utf-8", newline=""
+    ) as f:
+        return accumulate_moments(_lignes_csv(f, entete=False))
+
+
+def _decouper(path: Path, nb_tranches: int) -> list[tuple[int, int]] | None:
+    """Calcule des plages d’octets alignées sur les lignes, après l’en-tête.
+
+    Retourne ``None`` quand l’en-tête n’est pas exactement ``km,price`` :
+    le fichier doit alors être lu en série pour garder les règles de DictReader.
+    """
+
+    with path.open("rb") as f:
+        if f.readline().rstrip(b"\r\n") != b"km,price":
+            return None
+        debut = f.tell()
+        taille = path.stat().st_size
+
+        # On vise des tranches de taille égale puis on avance chaque coupure
+        # jusqu’au début de la ligne suivante pour ne jamais couper une ligne
+        coupures = [debut]
+        for indice in range(1, nb_tranches):
+            f.seek(debut + (taille - debut) * indice // nb_tranches)
+            f.readline()
+            coupures.append(max(f.tell(), coupures[-1]))
+        coupures.append(taille)
+    return [(a, b) for a, b in pairwise(coupures) if b > a]
+
+
+def accumulate_moments_parallel(path: str | Path, workers: int) -> Moments:
+    """Return the :class:`Moments` of ``path`` using ``workers`` processes.
+
+    Row errors carry the same global line numbers as :func:`iter_data`.
+    Binary datasets and CSV files without an exact ``km,price`` header are
+    read serially.
+
+    But:
+        Paralléliser lecture, validation et accumulation d’un gros CSV.
+    """
+
+    chemin = Path(path)
+    try:
+        tranches = (
+            None
+            if workers <= 1 or is_binary_dataset(chemin)
+            else _decouper(chemin, workers)
+        )
+    except OSError as exc:
+        # Même message que iter_data pour un fichier absent ou illisible
+        raise ValueError(f"data file not found: {chemin}") from exc
+
+    # Chemin série : mêmes résultats, sans coût de processus
+    if tranches is None:
+        return accumulate_moments(iter_data(chemin))
+
+    total = _VIDE
+    executeur = ProcessPoolExecutor(max_workers=min(workers, len(tranches) or 1))
+    try:
+        futures = [
+            executeur.submit(_moments_tranche, str(chemin), debut, fin)
+            for debut, fin in tranches
+        ]
+
+        # Réduction dans l’ordre du fichier : à la première erreur, toutes
+        # les tranches précédentes sont complètes et leur nombre de lignes
+        # donne le décalage global (en-tête = ligne 1)
+        for future in futures:
+            try:
+                partiel = future.result()
+            except InvalidRowError as exc:
+                raise InvalidRowError(
+                    exc.line_number + 1 + total.n, exc.reason
+                ) from None
+            total = merge_moments(total, partiel)
+    finally:
+        # En cas d’erreur, inutile d’attendre les tranches suivantes
+        executeur.shutdown(cancel_futures=True)
+
+    # Même contrat que iter_data : un CSV sans ligne de données est refusé
+    if total.n == 0:
+        raise ValueError("no data rows found")
+    return total
+
+
+__all__ = ["accumulate_moments_parallel"]
@@ -0,0 +1,156 @@
+"""Instrumentation par phase de l’entraînement (option ``--profile``).
+
+But:
+    Savoir où part le temps : parsing, normalisation, descente, écriture.
+"""
+
+# Active les annotations différées pour éviter les problèmes d’ordre d’import
+from __future__ import annotations
+
+# Sérialisation du rapport pour la supervision
+import json
+
+# Plateforme : unité de ru_maxrss et disponibilité du module resource
+import sys
+
+# Horloges murale et CPU
+import time
+
+# Repli de mesure mémoire quand le module resource est indisponible
+import tracemalloc
+
+# Générateur du gestionnaire de contexte de phase
+from collections.abc import Iterator
+
+# Gestionnaire de contexte pour délimiter une phase
+from contextlib import contextmanager
+
+# Chemins portables
+from pathlib import Path
+
+# Types utilitaires pour les signatures
+from typing import Any, TextIO
+
+
+def _pic_memoire() -> int:
+    """Pic de mémoire du processus (RSS) ou, à défaut, des allocations Python."""
+
+    # resource n’existe que sur Unix : sans lui, tracemalloc mesure le pic
+    if sys.platform == "win32":  # pragma: no cover - Windows only
+        return tracemalloc.get_traced_memory()[1]
+    import resource
+
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux rapporte des Kio, macOS des octets
+    return int(pic if sys.platform == "darwin" else pic * 1024)
+
+
+class Phase:
+    """Measurements of one named training phase.
+
+    ``rows`` and ``iterations`` are filled in by the instrumented code.
+    """
+
+    __slots__ = ("cpu", "iterations", "name", "rows", "wall")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.rows: int | None = None
+        self.iterations: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the phase with derived rates (rows/s, iterations/s)."""
+
+        # Un débit n’a de sens que si la phase a une durée mesurable
+        def debit(quantite: int | None) -> float | None:
+            return None if quantite is None or self.wall <= 0 else quantite / self.wall
+
+        return {
+            "phase": self.name,
+            "wall_s": self.wall,
+            "cpu_s": self.cpu,
+            "rows": self.rows,
+            "rows_per_s": debit(self.rows),
+            "iterations": self.iterations,
+            "iterations_per_s": debit(self.iterations),
+        }
+
+
+class Profiler:
+    """Collects :class:`Phase` measurements for one training run.
+
+    But:
+        Mesurer chaque phase sans coût notable quand le profil est désactivé.
+    """
+
+    def __init__(self) -> None:
+        self.phases: list[Phase] = []
+        # Pic du processus entier : ru_maxrss ne redescend jamais, une valeur
+        # par phase ne ferait que répéter celle de la phase la plus gourmande
+        self.peak_memory = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Phase]:
+        """Time the enclosed block as phase ``name``."""
+
+        # Sans resource, tracemalloc prend le relais pour le pic mémoire
+        if sys.platform == "win32":  # pragma: no cover - Windows only
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        mesure = Phase(name)
+        debut_mur = time.perf_counter()
+        debut_cpu = time.process_time()
+        try:
+            yield mesure
+        finally:
+            mesure.wall = time.perf_counter() - debut_mur
+            mesure.cpu = time.process_time() - debut_cpu
+            self.phases.append(mesure)
+            # Pic atteint au plus tard à la fin de la dernière phase mesurée
+            self.peak_memory = _pic_memoire()
+
+    def report(self) -> dict[str, Any]:
+        """Return all phases plus totals as a JSON-serializable dict."""
+
+        return {
+            "phases": [phase.as_dict() for phase in self.phases],
+            "total_wall_s": sum(phase.wall for phase in self.phases),
+            "total_cpu_s": sum(phase.cpu for phase in self.phases),
+            "peak_memory_bytes": self.peak_memory,
+        }
+
+    def print_summary(self, out: TextIO | None = None) -> None:
+        """Print one aligned line per phase, then the totals and peak memory."""
+
+        rapport = self.report()
+        print(
+            f"{'phase':<12}{'wall_s':>10}{'cpu_s':>10}{'rows/s':>14}"
+            f"{'iters/s':>14}",
+            file=out,
+        )
+        for phase in rapport["phases"]:
+            cellules = [
+                "-" if phase[cle] is None else f"{phase[cle]:.0f}"
+                for cle in ("rows_per_s", "iterations_per_s")
+            ]
+            print(
+                f"{phase['phase']:<12}{phase['wall_s']:>10.4f}{phase['cpu_s']:>10.4f}"
+                f"{cellules[0]:>14}{cellules[1]:>14}",
+                file=out,
+            )
+        print(
+            f"{'total':<12}{rapport['total_wall_s']:>10.4f}"
+            f"{rapport['total_cpu_s']:>10.4f}",
+            file=out,
+        )
+        print(f"peak memory: {rapport['peak_memory_bytes'] / 2**20:.1f} MiB", file=out)
+
+    def dump(self, path: str | Path) -> None:
+        """Write :meth:`report` as JSON to ``path``."""
+
+        Path(path).write_text(json.dumps(self.report(), indent=2) + "\n")
+
+
+__all__ = ["Phase", "Profiler"]
@@ -12,6 +12,12 @@ from __future__ import annotations
 # → évite les parsings manuels fragiles et garantit portabilité inter-OS
 import csv
 
+# io.StringIO permet de rejouer un bloc déjà lu lors d’un repli sur DictReader
+import io
+
+# itertools.chain recolle ce bloc au reste du fichier sans le relire
+import itertools
+
 # On importe json pour sérialiser/désérialiser les coefficients entraînés
 # → permet de sauvegarder/charger un modèle dans un format universel et lisible
 import json
@@ -20,10 +26,46 @@ import json
 # → évite d’introduire des valeurs invalides dans les calculs du modèle
 import math
 
+# random.Random : mélange reproductible du tampon de la descente par mini-lots
+import random
+
+# Iterable/Iterator permettent d’accepter ou produire des flux de lignes
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
+
+# partial fige les sommes suffisantes du moteur "stats" pour _descente
+from functools import partial
+
 # On importe Path pour manipuler les fichiers de manière uniforme et robuste
 # → évite les différences Windows/Linux et fournit une API riche (.open, .exists, etc.)
 from pathlib import Path
 
+# NamedTuple donne des champs nommés sans perdre la légèreté d’un tuple
+from typing import Any, NamedTuple, TextIO
+
+# Format binaire projeté en mémoire, reconnu automatiquement à la lecture
+from .binary import MappedDataset, is_binary_dataset
+
+# Conteneurs colonnaires compacts, alternative à la liste de tuples
+from .dataset import ColumnarData, Dataset
+
+
+class InvalidRowError(ValueError):
+    """Validation error for one CSV row, carrying its line number.
+
+    But:
+        Permettre de renuméroter l’erreur (ex: shard traité par un worker).
+    """
+
+    def __init__(self, line_number: int, reason: str) -> None:
+        # Les arguments sont conservés tels quels : l’exception reste
+        # sérialisable (pickle) d’un processus worker vers le parent
+        super().__init__(line_number, reason)
+        self.line_number = line_number
+        self.reason = reason
+
+    def __str__(self) -> str:
+        return f"invalid row {self.line_number}: {self.reason}"
+
 
 def _float_field(value: str, line_number: int) -> float:
     """Convertit une valeur texte en float. Gère erreurs de parsing."""
@@ -33,13 +75,13 @@ def _float_field(value: str, line_number: int) -> float:
     except ValueError:
         # On refuse immédiatement les chaînes non numériques
         # pour éviter que du texte corrompu n'entre dans les calculs
-        raise ValueError(f"invalid row {line_number}: non-numeric value") from None
+        raise InvalidRowError(line_number, "non-numeric value") from None
 
     # On interdit explicitement NaN car cela se propage silencieusement
     # et rendrait toutes les moyennes/régressions instables
     if math.isnan(result):
         # Rejette explicitement les valeurs NaN pour éviter des calculs instables
-        raise ValueError(f"invalid row {line_number}: NaN value")
+        raise InvalidRowError(line_number, "NaN value")
     return result
 
 
@@ -48,13 +90,18 @@ def _valider_ligne(row: dict[str, str | None], line_number: int) -> tuple[float,
 
     # On récupère les champs nommés pour détecter explicitement
     # une absence de colonne plutôt qu'une simple erreur d'index
-    km_str = row.get("km")
-    price_str = row.get("price")
+    return _valider_champs(row.get("km"), row.get("price"), line_number)
+
+
+def _valider_champs(
+    km_str: str | None, price_str: str | None, line_number: int
+) -> tuple[float, float]:
+    """Validate raw ``km``/``price`` fields shared by every CSV parser."""
 
     # On refuse toute ligne incomplète afin d'éviter
     # que des valeurs None ne contaminent la suite du calcul
     if km_str is None or price_str is None:
-        raise ValueError(f"invalid row {line_number}: missing value")
+        raise InvalidRowError(line_number, "missing value")
 
     # On force la conversion en float ici pour détecter immédiatement
     # les données non numériques (ex: "abc") au lieu de propager du texte brut
@@ -64,20 +111,146 @@ def _valider_ligne(row: dict[str, str | None], line_number: int) -> tuple[float,
     # Les km négatifs n'ont pas de sens dans un contexte automobile,
     # donc on bloque cette incohérence à la source
     if km < 0:
-        raise ValueError(f"invalid row {line_number}: negative km")
+        raise InvalidRowError(line_number, "negative km")
 
     # Un prix négatif n'est pas réaliste économiquement,
     # donc on lève une erreur plutôt que de laisser passer une valeur absurde
     if price < 0:
-        raise ValueError(f"invalid row {line_number}: negative price")
+        raise InvalidRowError(line_number, "negative price")
     return km, price
 
 
-def read_data(path: str | Path) -> list[tuple[float, float]]:
-    """Load ``(km, price)`` pairs from ``path``.
+# Taille des blocs lus par l’analyseur rapide : assez gros pour amortir
+# les appels système, assez petit pour rester en mémoire constante
+_TAILLE_BLOC = 1 << 20  # pragma: no mutate
+
+
+def _lignes_dictreader(
+    lignes: Iterable[str], numero_ligne: int, entete: bool = True
+) -> Generator[tuple[float, float], None, int]:
+    """Analyse de référence via ``csv.DictReader``.
 
     But:
-        Charger un CSV validé et convertir en liste de tuples floats.
+        Gérer guillemets et formats inhabituels; renvoyer le dernier numéro de ligne.
+    """
+
+    # Sans en-tête à lire (reprise en cours de fichier), on impose les colonnes
+    lecteur_csv = csv.DictReader(lignes, fieldnames=None if entete else ["km", "price"])
+    # Vérification stricte : on refuse tout CSV dont l'en-tête diffère
+    # pour prévenir des erreurs silencieuses ou colonnes manquantes
+    if lecteur_csv.fieldnames != ["km", "price"]:
+        raise ValueError("invalid CSV format (expected columns: km,price)")
+    # Parse chaque ligne et valide ; on cède chaque paire aussitôt validée
+    # au lieu de construire une liste. Sans ligne de données, le dernier
+    # numéro reste celui reçu
+    dernier_numero = numero_ligne
+    for numero, contenu_ligne in enumerate(lecteur_csv, start=numero_ligne + 1):
+        yield _valider_ligne(contenu_ligne, numero)
+        dernier_numero = numero
+    return dernier_numero
+
+
+def _lignes_rapides(
+    lignes: Iterable[str], numero_ligne: int
+) -> Generator[tuple[float, float], None, int]:
+    """Analyse des lignes ``km,price`` simples, sans guillemets.
+
+    But:
+        Convertir en lot sans passer par un dict par ligne.
+    """
+
+    for ligne in lignes:
+        # csv.DictReader ignore les lignes vides sans les numéroter :
+        # on reproduit ce comportement pour garder les mêmes numéros
+        if not ligne:
+            continue
+        numero_ligne += 1
+
+        # Découpage direct sur la virgule ; les colonnes en trop sont
+        # ignorées comme le fait DictReader
+        km_str, separateur, reste = ligne.partition(",")
+        price_str = reste.partition(",")[0]
+        try:
+            km = float(km_str)
+            price = float(price_str)
+        except ValueError:
+            # Chemin rare : on délègue au validateur commun pour lever
+            # exactement la même erreur que l’analyse de référence
+            km = price = math.nan
+
+        # Cas nominal : deux champs numériques positifs ; NaN échoue
+        # à toute comparaison et part donc vers le validateur commun
+        if separateur and km >= 0 and price >= 0:
+            yield km, price
+        else:
+            yield _valider_champs(
+                km_str, price_str if separateur else None, numero_ligne
+            )
+    return numero_ligne
+
+
+def _lignes_csv(
+    f: TextIO, entete: bool = True
+) -> Generator[tuple[float, float], None, int]:
+    """Choisit l’analyseur rapide quand le fichier le permet.
+
+    With ``entete=False`` the stream is a headerless slice of a validated
+    file (a shard) and rows are numbered from 1.
+
+    But:
+        Lire par gros blocs un CSV ``km,price`` simple; sinon basculer sur DictReader.
+    """
+
+    # L’en-tête exact "km,price" autorise l’analyseur rapide ;
+    # toute autre forme (guillemets, BOM, espaces…) passe par DictReader
+    if entete and f.readline().rstrip("\r\n") != "km,price":
+        f.seek(0)
+        return (yield from _lignes_dictreader(f, 1))
+
+    # Une tranche sans en-tête numérote ses lignes à partir de 1 :
+    # l’appelant y ajoute le décalage global
+    numero_ligne = 1 if entete else 0
+    reste = ""
+    while True:
+        # Lecture en gros blocs : peu d’appels, découpage en masse
+        bloc = f.read(_TAILLE_BLOC)
+        if not bloc:
+            break
+        bloc = reste + bloc
+
+        # On ne traite que les lignes complètes ; la fin partielle
+        # est reportée sur le bloc suivant
+        coupure = bloc.rfind("\n") + 1
+        corps, reste = bloc[:coupure], bloc[coupure:]
+        corps_lf = corps.replace("\r\n", "\n") if "\r" in corps else corps
+
+        # Guillemets ou \r isolé : format inhabituel, on reprend avec DictReader
+        # à partir de ce bloc, en conservant la numérotation des lignes ;
+        # la ligne partielle est complétée pour ne pas être coupée en deux
+        if '"' in corps_lf or "\r" in corps_lf:
+            bloc += f.readline()
+            suite = itertools.chain(io.StringIO(bloc, newline=""), f)
+            return (yield from _lignes_dictreader(suite, numero_ligne, entete=False))
+
+        numero_ligne = yield from _lignes_rapides(corps_lf.split("\n"), numero_ligne)
+
+    # Dernière ligne sans saut de ligne final : mêmes règles de repli
+    derniere = reste.rstrip("\r")
+    if '"' in derniere or "\r" in derniere:
+        fin = io.StringIO(reste, newline="")
+        return (yield from _lignes_dictreader(fin, numero_ligne, entete=False))
+    return (yield from _lignes_rapides([derniere], numero_ligne))
+
+
+def iter_data(path: str | Path) -> Iterator[tuple[float, float]]:
+    """Yield validated ``(km, price)`` pairs from ``path`` one row at a time.
+
+    Plain ``km,price`` files go through a chunked fast parser; quoted or
+    unusual files fall back to ``csv.DictReader`` with identical errors.
+    Binary datasets written by ``convert`` are read from a memory map.
+
+    But:
+        Parcourir un CSV en mémoire constante avec la validation de read_data.
     """
 
     # On convertit en Path pour garantir un accès cohérent et portable aux fichiers
@@ -88,71 +261,147 @@ def read_data(path: str | Path) -> list[tuple[float, float]]:
     try:
         # On impose UTF-8 + newline="" pour garantir une lecture portable,
         # éviter les soucis d'accents et gérer correctement les fins de lignes
-        with csv_path.open(encoding="utf-8", newline="") as f:  # pragma: no mutate
-            # DictReader est utilisé pour accéder aux colonnes par leur nom
-            # au lieu d'index numériques → code plus robuste et lisible
-            lecteur_csv = csv.DictReader(f)
-            # Vérification stricte : on refuse tout CSV dont l'en-tête diffère
-            # pour prévenir des erreurs silencieuses ou colonnes manquantes
-            if lecteur_csv.fieldnames != ["km", "price"]:
-                raise ValueError("invalid CSV format (expected columns: km,price)")
-            # Parse chaque ligne et valide à partir de la ligne 2
-            donnees_km_prix = [
-                _valider_ligne(contenu_ligne, numero_ligne)
-                for numero_ligne, contenu_ligne in enumerate(lecteur_csv, start=2)
-            ]
+        if is_binary_dataset(csv_path):
+            # Dataset binaire déjà validé : on parcourt les colonnes projetées
+            # en mémoire, sans aucun parsing
+            # → projection libérée dès la fin du parcours
+            with MappedDataset(csv_path) as donnees:
+                yield from donnees
+                numero_ligne = len(donnees) + 1
+        else:
+            with csv_path.open(encoding="utf-8", newline="") as f:  # pragma: no mutate
+                # On récupère le dernier numéro de ligne produit pour détecter
+                # un fichier sans aucune donnée une fois le parcours terminé
+                numero_ligne = yield from _lignes_csv(f)
     except OSError as exc:  # pragma: no cover - simple error propagation
         # On lève une ValueError claire (et non OSError brut)
         # pour que l'appelant comprenne immédiatement que c'est lié au fichier
         raise ValueError(f"data file not found: {csv_path}") from exc
     # On interdit les CSV vides afin d'éviter que le modèle
     # ne s'exécute sur une absence totale de données
-    if not donnees_km_prix:
+    if numero_ligne == 1:
         raise ValueError("no data rows found")
-    return donnees_km_prix
 
 
-def gradient_descent(
-    donnees_km_prix: list[tuple[float, float]],
+def read_data(path: str | Path) -> list[tuple[float, float]]:
+    """Load ``(km, price)`` pairs from ``path``.
+
+    But:
+        Charger un CSV validé et convertir en liste de tuples floats.
+    """
+
+    # On matérialise le flux validé : mêmes erreurs que iter_data,
+    # pour les appelants qui ont besoin de plusieurs parcours
+    return list(iter_data(path))
+
+
+def load_dataset(path: str | Path) -> ColumnarData:
+    """Load ``path`` into a compact column-oriented dataset.
+
+    CSV files are parsed into a :class:`Dataset`; binary datasets are opened
+    zero-copy as a :class:`MappedDataset`.
+
+    But:
+        Charger un CSV validé en ~16 octets par ligne au lieu de tuples Python.
+    """
+
+    try:
+        # Fichier binaire : projection mmap, démarrage quasi instantané
+        if is_binary_dataset(path):
+            donnees = MappedDataset(path)
+            # Même contrat que le CSV : un dataset vide est refusé
+            # (projection libérée avant l’erreur) ; sinon l’appelant
+            # ferme le dataset via close() ou un bloc with
+            if len(donnees) == 0:
+                donnees.close()
+                raise ValueError("no data rows found")
+            return donnees
+    except OSError as exc:
+        # Même message que iter_data pour un fichier absent ou illisible
+        raise ValueError(f"data file not found: {Path(path)}") from exc
+
+    # On remplit directement les colonnes depuis le flux validé :
+    # aucune liste de tuples intermédiaire n’est construite
+    return Dataset.from_rows(iter_data(path))
+
+
+class DescentResult(NamedTuple):
+    """Outcome of a gradient descent run.
+
+    But:
+        Exposer, en plus des coefficients, l’effort réellement dépensé.
+    """
+
+    # Coefficients appris (dans l’espace des données fournies)
+    theta0: float
+    theta1: float
+    # Nombre de mises à jour effectivement appliquées
+    iterations: int
+    # Coût final J(θ) = (1/2m)·Σ(h_θ(x_i) - y_i)² aux coefficients retournés
+    cost: float
+
+
+def _descente(
+    sommes_erreurs: Callable[[float, float, bool], tuple[float, float, float]],
+    m: float,
     taux_apprentissage: float,
     nb_iterations: int,
-) -> tuple[float, float]:
-    """Ajuste une droite de régression par descente de gradient.
+    tol_grad: float,
+    tol_cost: float,
+    tol_step: float,
+    theta_init: tuple[float, float] = (0.0, 0.0),
+    cout_final: bool = True,
+) -> DescentResult:
+    """Boucle de descente commune aux moteurs, avec arrêt anticipé.
 
-    L'équation a la forme ``prix = theta0 + theta1 * km``.
+    Sans ``cout_final``, le coût renvoyé vaut NaN : aucun parcours
+    supplémentaire n’est fait pour un appelant qui l’ignore.
 
     But:
-        Estimer theta0 (intercept) et theta1 (pente)
-        en minimisant l’erreur entre prédictions et données réelles.
+        Partager formules officielles et critères d’arrêt entre moteurs.
     """
 
     # On note theta0 = prix de base (ordonnée à l’origine)
-    # et theta1 = pente (variation du prix par km)
-    theta0 = 0.0
-    theta1 = 0.0
+    # et theta1 = pente (variation du prix par km) ; départ à l’origine,
+    # ou depuis un modèle existant (démarrage à chaud)
+    theta0, theta1 = theta_init
 
-    # m = nombre d’exemples (taille du dataset)
-    # → il sert au calcul du facteur 1/m dans la formule du sujet
-    m = float(len(donnees_km_prix))
+    # Le coût n’est suivi à chaque tour que si le critère l’exige
+    suivre_cout = tol_cost > 0
+    cout_precedent: float | None = None
+    # Coût aux coefficients courants quand il est déjà connu
+    cout_courant: float | None = None
+    iterations = 0
 
-    # On répète la mise à jour plusieurs fois
+    # On répète la mise à jour au plus nb_iterations fois
     # → une seule correction ne suffit pas à atteindre le minimum
     for _ in range(nb_iterations):
-        # Erreur de prédiction pour chaque point :
-        # (h_theta(x_i) - y_i) avec h_theta(x) = theta0 + theta1 * x
-        erreurs = [(theta0 + theta1 * km) - prix for km, prix in donnees_km_prix]
+        # Σ (h_theta(x_i) - y_i), Σ (h_theta(x_i) - y_i)·x_i et, au besoin,
+        # Σ (h_theta(x_i) - y_i)² aux coefficients courants
+        somme_erreurs, somme_erreurs_km, somme_carres = sommes_erreurs(
+            theta0, theta1, suivre_cout
+        )
 
-        # Formule officielle :
-        # Δθ0 = α * (1/m) * Σ (h_theta(x_i) - y_i)
-        delta_theta0 = taux_apprentissage * (1 / m) * sum(erreurs)
+        # Gradient quasi nul : on est au minimum, inutile de continuer
+        if tol_grad > 0 and math.hypot(somme_erreurs, somme_erreurs_km) / m <= tol_grad:
+            break
+
+        # Coût stabilisé : la variation relative est sous le seuil
+        if suivre_cout:
+            cout = somme_carres / (2 * m)
+            cout_courant = cout
+            if (
+                cout_precedent is not None
+                and abs(cout_precedent - cout) <= tol_cost * cout_precedent
+            ):
+                break
+            cout_precedent = cout
 
-        # Formule officielle :
+        # Formules officielles :
+        # Δθ0 = α * (1/m) * Σ (h_theta(x_i) - y_i)
         # Δθ1 = α * (1/m) * Σ ( (h_theta(x_i) - y_i) * x_i )
-        delta_theta1 = (
-            taux_apprentissage
-            * (1 / m)
-            * sum(erreur * km for (erreur, (km, _)) in zip(erreurs, donnees_km_prix))
-        )
+        delta_theta0 = taux_apprentissage * (1 / m) * somme_erreurs
+        delta_theta1 = taux_apprentissage * (1 / m) * somme_erreurs_km
 
         # Mise à jour simultanée :
         # θ0 := θ0 - Δθ0
@@ -160,12 +409,540 @@ def gradient_descent(
         # → garantit que les deux corrections sont cohérentes
         theta0 -= delta_theta0
         theta1 -= delta_theta1
+        iterations += 1
+        cout_courant = None
+
+        # Pas devenu négligeable : les paramètres ne bougent plus
+        if tol_step > 0 and math.hypot(delta_theta0, delta_theta1) <= tol_step:
+            break
+
+    # Coût final aux coefficients retournés : repris du dernier tour quand
+    # l’arrêt sur le coût l’a déjà calculé, sinon un parcours de plus
+    if not cout_final:
+        return DescentResult(theta0, theta1, iterations, math.nan)
+    if cout_courant is None:
+        cout_courant = sommes_erreurs(theta0, theta1, True)[2] / (2 * m)
+    return DescentResult(theta0, theta1, iterations, cout_courant)
+
+
+def _sommes_boucle(
+    donnees_km_prix: Sequence[tuple[float, float]],
+    theta0: float,
+    theta1: float,
+    avec_cout: bool,
+) -> tuple[float, float, float]:
+    """Sommes d’erreurs de la descente, calculées ligne par ligne."""
+
+    # Erreur de prédiction pour chaque point :
+    # (h_theta(x_i) - y_i) avec h_theta(x) = theta0 + theta1 * x
+    erreurs = [(theta0 + theta1 * km) - prix for km, prix in donnees_km_prix]
+    return (
+        sum(erreurs),
+        sum(erreur * km for (erreur, (km, _)) in zip(erreurs, donnees_km_prix)),
+        sum(erreur * erreur for erreur in erreurs) if avec_cout else 0.0,
+    )
+
+
+def gradient_descent_report(
+    donnees_km_prix: Sequence[tuple[float, float]],
+    taux_apprentissage: float,
+    nb_iterations: int,
+    *,
+    tol_grad: float = 0.0,
+    tol_cost: float = 0.0,
+    tol_step: float = 0.0,
+    theta_init: tuple[float, float] = (0.0, 0.0),
+) -> DescentResult:
+    """Run :func:`gradient_descent` with optional early stopping.
+
+    Stops before ``nb_iterations`` as soon as one enabled criterion holds:
+    gradient norm ``≤ tol_grad``, relative cost change ``≤ tol_cost``, or
+    parameter step norm ``≤ tol_step``.  A tolerance of ``0`` disables it.
+    Descent starts from ``theta_init`` (warm start) instead of the origin.
+
+    But:
+        Terminer dès la convergence et rapporter itérations et coût final.
+    """
+
+    # m = nombre d’exemples (taille du dataset)
+    # → il sert au calcul du facteur 1/m dans la formule du sujet
+    m = float(len(donnees_km_prix))
+
+    return _descente(
+        partial(_sommes_boucle, donnees_km_prix),
+        m,
+        taux_apprentissage,
+        nb_iterations,
+        tol_grad,
+        tol_cost,
+        tol_step,
+        theta_init,
+    )
+
+
+def gradient_descent(
+    donnees_km_prix: Sequence[tuple[float, float]],
+    taux_apprentissage: float,
+    nb_iterations: int,
+) -> tuple[float, float]:
+    """Ajuste une droite de régression par descente de gradient.
+
+    L'équation a la forme ``prix = theta0 + theta1 * km``.
+
+    But:
+        Estimer theta0 (intercept) et theta1 (pente)
+        en minimisant l’erreur entre prédictions et données réelles.
+    """
+
+    # Sans tolérance, la descente effectue exactement nb_iterations tours ;
+    # le coût final n’est pas demandé → pas de parcours supplémentaire
+    resultat = _descente(
+        partial(_sommes_boucle, donnees_km_prix),
+        float(len(donnees_km_prix)),
+        taux_apprentissage,
+        nb_iterations,
+        0.0,
+        0.0,
+        0.0,
+        cout_final=False,
+    )
 
     # On retourne les coefficients entraînés
     # → ce sont les paramètres optimaux de la droite ajustée
+    return resultat.theta0, resultat.theta1
+
+
+def sufficient_stats(
+    donnees_km_prix: Iterable[tuple[float, float]],
+) -> tuple[float, float, float, float, float, float]:
+    """Return ``(n, Σx, Σy, Σx², Σxy, Σy²)`` gathered in a single pass.
+
+    But:
+        Résumer le dataset par les sommes dont dépend le gradient batch.
+    """
+
+    # On initialise toutes les sommes à zéro : un seul parcours des données
+    # suffit ensuite pour résumer tout le dataset
+    n = somme_km = somme_prix = 0.0
+    somme_km_carre = somme_km_prix = somme_prix_carre = 0.0
+
+    # On accumule chaque terme ligne par ligne
+    # → coût O(n) payé une seule fois au lieu d’une fois par itération
+    for km, prix in donnees_km_prix:
+        n += 1.0
+        somme_km += km
+        somme_prix += prix
+        somme_km_carre += km * km
+        somme_km_prix += km * prix
+        # Σy² n’intervient pas dans le gradient mais permet d’évaluer le coût
+        somme_prix_carre += prix * prix
+
+    return n, somme_km, somme_prix, somme_km_carre, somme_km_prix, somme_prix_carre
+
+
+def _sommes_stats(
+    statistiques: tuple[float, float, float, float, float, float],
+    theta0: float,
+    theta1: float,
+    avec_cout: bool,
+) -> tuple[float, float, float]:
+    """Sommes d’erreurs de la descente déduites des sommes suffisantes, en O(1).
+
+    But:
+        Partager les formules du moteur "stats" entre descente simple et balayage.
+    """
+
+    # On déstructure les sommes produites par sufficient_stats
+    # → Σy² ne sert qu’au calcul du coût
+    n, somme_km, somme_prix, somme_km_carre, somme_km_prix, somme_prix_carre = (
+        statistiques
+    )
+
+    # Σ (h_theta(x_i) - y_i) = n·θ0 + θ1·Σx - Σy
+    somme_erreurs = n * theta0 + theta1 * somme_km - somme_prix
+
+    # Σ (h_theta(x_i) - y_i)·x_i = θ0·Σx + θ1·Σx² - Σxy
+    somme_erreurs_km = theta0 * somme_km + theta1 * somme_km_carre - somme_km_prix
+
+    # Σ (h_theta(x_i) - y_i)² développé sur les sommes suffisantes ;
+    # on borne à 0 les résidus d’arrondi légèrement négatifs
+    somme_carres = 0.0
+    if avec_cout:
+        somme_carres = max(
+            0.0,
+            n * theta0 * theta0
+            + theta1 * theta1 * somme_km_carre
+            + somme_prix_carre
+            + 2 * theta0 * theta1 * somme_km
+            - 2 * theta0 * somme_prix
+            - 2 * theta1 * somme_km_prix,
+        )
+    return somme_erreurs, somme_erreurs_km, somme_carres
+
+
+def gradient_descent_stats_report(
+    statistiques: tuple[float, float, float, float, float, float],
+    taux_apprentissage: float,
+    nb_iterations: int,
+    *,
+    tol_grad: float = 0.0,
+    tol_cost: float = 0.0,
+    tol_step: float = 0.0,
+    theta_init: tuple[float, float] = (0.0, 0.0),
+) -> DescentResult:
+    """Run :func:`gradient_descent_stats` with optional early stopping.
+
+    Same criteria and warm start as :func:`gradient_descent_report`; the
+    cost is derived from the sums, so each iteration stays O(1).
+
+    But:
+        Terminer dès la convergence sans jamais reparcourir les données.
+    """
+
+    # Même boucle et mêmes formules officielles que la boucle de référence
+    return _descente(
+        partial(_sommes_stats, statistiques),
+        statistiques[0],
+        taux_apprentissage,
+        nb_iterations,
+        tol_grad,
+        tol_cost,
+        tol_step,
+        theta_init,
+    )
+
+
+def gradient_descent_stats(
+    statistiques: tuple[float, float, float, float, float, float],
+    taux_apprentissage: float,
+    nb_iterations: int,
+) -> tuple[float, float]:
+    """Ajuste la droite par descente de gradient à partir des sommes suffisantes.
+
+    Produit les mêmes coefficients que :func:`gradient_descent` (à la
+    précision flottante près) en O(nb_iterations) au lieu de
+    O(nb_iterations × n).
+
+    But:
+        Accélérer l’entraînement sans changer la trajectoire de la descente.
+    """
+
+    # Coût final inutile ici : seuls les coefficients sont renvoyés
+    resultat = _descente(
+        partial(_sommes_stats, statistiques),
+        statistiques[0],
+        taux_apprentissage,
+        nb_iterations,
+        0.0,
+        0.0,
+        0.0,
+        cout_final=False,
+    )
+    return resultat.theta0, resultat.theta1
+
+
+def _melanger(
+    lignes: Iterable[tuple[float, float]],
+    taille_tampon: int,
+    generateur: random.Random,
+) -> Iterator[tuple[float, float]]:
+    """Mélange un flux à travers un tampon borné de ``taille_tampon`` lignes.
+
+    But:
+        Décorréler les lots d’un fichier trié sans le charger en mémoire.
+    """
+
+    tampon: list[tuple[float, float]] = []
+    for ligne in lignes:
+        # Tant que le tampon n’est pas plein, on se contente de le remplir
+        if len(tampon) < taille_tampon:
+            tampon.append(ligne)
+            continue
+        # Ensuite chaque nouvelle ligne prend la place d’une ligne tirée au sort
+        indice = generateur.randrange(taille_tampon)
+        yield tampon[indice]
+        tampon[indice] = ligne
+
+    # Fin du flux : on vide le reste du tampon dans un ordre aléatoire
+    generateur.shuffle(tampon)
+    yield from tampon
+
+
+def gradient_descent_sweep(
+    statistiques: tuple[float, float, float, float, float, float],
+    taux_apprentissage: Sequence[float],
+    nb_iterations: Sequence[int],
+) -> list[DescentResult]:
+    """Run one :func:`gradient_descent_stats_report` per ``(alpha, iters)`` pair.
+
+    All learning rates advance together in a single loop of ``max(iters)``
+    steps, and each iteration count is a snapshot of that shared trajectory,
+    so the whole grid costs ``len(alphas) × max(iters)`` O(1) updates.
+    Results are ordered alpha-major and equal the individual runs.
+
+    But:
+        Comparer toute une grille d’hyperparamètres pour le prix d’un seul run.
+    """
+
+    n = statistiques[0]
+    # Un θ par taux d’apprentissage, tenus côte à côte
+    theta0 = [0.0] * len(taux_apprentissage)
+    theta1 = [0.0] * len(taux_apprentissage)
+
+    # On avance tous les candidats palier par palier ; chaque palier
+    # (nombre d’itérations demandé) fige une copie des coefficients
+    instantanes: dict[int, tuple[list[float], list[float]]] = {}
+    faites = 0
+    for palier in sorted(set(nb_iterations)):
+        for _ in range(palier - faites):
+            for j, alpha in enumerate(taux_apprentissage):
+                somme_erreurs, somme_erreurs_km, _ = _sommes_stats(
+                    statistiques, theta0[j], theta1[j], False
+                )
+                # Mêmes formules et même mise à jour simultanée que _descente
+                theta0[j] -= alpha * (1 / n) * somme_erreurs
+                theta1[j] -= alpha * (1 / n) * somme_erreurs_km
+        faites = palier
+        instantanes[palier] = (theta0.copy(), theta1.copy())
+
+    # Coût final de chaque configuration, aux coefficients retenus
+    resultats = []
+    for j in range(len(taux_apprentissage)):
+        for iterations in nb_iterations:
+            t0, t1 = instantanes[iterations][0][j], instantanes[iterations][1][j]
+            cout = _sommes_stats(statistiques, t0, t1, True)[2] / (2 * n)
+            resultats.append(DescentResult(t0, t1, iterations, cout))
+    return resultats
+
+
+def gradient_descent_minibatch(
+    source: Callable[[], Iterable[tuple[float, float]]],
+    taux_apprentissage: float,
+    taille_lot: int,
+    nb_epoques: int,
+    *,
+    shuffle_buffer: int = 0,
+    seed: int = 0,
+    theta_init: tuple[float, float] = (0.0, 0.0),
+) -> DescentResult:
+    """Mini-batch gradient descent over a stream that is re-read every epoch.
+
+    ``source()`` must return a fresh iterable of (normalized) rows; it is
+    called once per epoch and once more to evaluate the final cost, so only
+    one batch and the optional shuffle buffer are ever held in memory.
+    ``iterations`` counts parameter updates (one per batch).  Descent starts
+    from ``theta_init`` (warm start) instead of the origin.
+
+    But:
+        Entraîner sur des données plus grosses que la RAM, lues en flux.
+    """
+
+    generateur = random.Random(seed)
+    theta0, theta1 = theta_init
+    iterations = 0
+
+    for _ in range(nb_epoques):
+        lignes = source()
+        if shuffle_buffer > 1:
+            lignes = _melanger(lignes, shuffle_buffer, generateur)
+
+        # Sommes du lot courant, aux coefficients figés pendant tout le lot
+        taille = 0
+        somme_erreurs = 0.0
+        somme_erreurs_km = 0.0
+        for km, prix in lignes:
+            erreur = theta0 + theta1 * km - prix
+            somme_erreurs += erreur
+            somme_erreurs_km += erreur * km
+            taille += 1
+            if taille < taille_lot:
+                continue
+
+            # Mêmes formules officielles que la descente complète, avec
+            # m = taille du lot ; mise à jour simultanée de θ0 et θ1
+            theta0 -= taux_apprentissage * somme_erreurs / taille
+            theta1 -= taux_apprentissage * somme_erreurs_km / taille
+            iterations += 1
+            taille = 0
+            somme_erreurs = somme_erreurs_km = 0.0
+
+        # Dernier lot incomplet de l’époque : il compte aussi
+        if taille:
+            theta0 -= taux_apprentissage * somme_erreurs / taille
+            theta1 -= taux_apprentissage * somme_erreurs_km / taille
+            iterations += 1
+
+    # Coût final sur tout le flux, aux coefficients retournés
+    m = 0
+    somme_carres = 0.0
+    for km, prix in source():
+        erreur = theta0 + theta1 * km - prix
+        somme_carres += erreur * erreur
+        m += 1
+    if m == 0:
+        raise ValueError("no data rows found")
+    return DescentResult(theta0, theta1, iterations, somme_carres / (2 * m))
+
+
+class Moments(NamedTuple):
+    """Centered moments and bounds of a ``(km, price)`` dataset.
+
+    But:
+        Résumer les données de façon numériquement stable (Welford).
+    """
+
+    # Nombre de lignes accumulées
+    n: int
+    # Moyennes courantes de km et de prix
+    mean_km: float
+    mean_price: float
+    # Sommes des carrés centrés Σ(x - x̄)² et Σ(y - ȳ)²
+    m2_km: float
+    m2_price: float
+    # Co-moment centré Σ(x - x̄)(y - ȳ)
+    c_km_price: float
+    # Bornes observées, indispensables pour theta.json
+    min_km: float
+    max_km: float
+    min_price: float
+    max_price: float
+
+
+def accumulate_moments(donnees_km_prix: Iterable[tuple[float, float]]) -> Moments:
+    """Return the :class:`Moments` of ``donnees_km_prix`` in a single pass.
+
+    But:
+        Calculer moyennes, variances, covariance et bornes sans stocker les lignes.
+    """
+
+    # On part d’un état vide ; les bornes commencent à ±inf pour que
+    # la première ligne les fixe sans cas particulier
+    n = 0
+    mean_km = mean_price = 0.0
+    m2_km = m2_price = c_km_price = 0.0
+    min_km = min_price = math.inf
+    max_km = max_price = -math.inf
+
+    for km, prix in donnees_km_prix:
+        n += 1
+
+        # Mise à jour de Welford : on travaille sur les écarts à la moyenne
+        # courante → évite la soustraction de grands nombres (Σx² - n·x̄²)
+        # qui détruit la précision sur des km de l’ordre de 1e5
+        ecart_km = km - mean_km
+        mean_km += ecart_km / n
+        ecart_prix = prix - mean_price
+        mean_price += ecart_prix / n
+
+        # Les produits mélangent ancien et nouvel écart : c’est ce qui rend
+        # l’accumulation exacte (à l’arrondi près) en un seul passage
+        m2_km += ecart_km * (km - mean_km)
+        m2_price += ecart_prix * (prix - mean_price)
+        c_km_price += ecart_km * (prix - mean_price)
+
+        # Les bornes sont suivies au fil de l’eau pour la sauvegarde
+        min_km = min(min_km, km)
+        max_km = max(max_km, km)
+        min_price = min(min_price, prix)
+        max_price = max(max_price, prix)
+
+    return Moments(
+        n,
+        mean_km,
+        mean_price,
+        m2_km,
+        m2_price,
+        c_km_price,
+        min_km,
+        max_km,
+        min_price,
+        max_price,
+    )
+
+
+def merge_moments(gauche: Moments, droite: Moments) -> Moments:
+    """Combine the moments of two disjoint parts of a dataset.
+
+    But:
+        Réduire des résultats partiels (shards, lots) sans relire les données.
+    """
+
+    # Une partie vide n’apporte rien (ses bornes sont ±inf)
+    if gauche.n == 0:
+        return droite
+    if droite.n == 0:
+        return gauche
+
+    # Formule parallèle de Chan : on corrige les sommes centrées par
+    # l’écart entre les deux moyennes, pondéré par la taille des parties
+    n = gauche.n + droite.n
+    ecart_km = droite.mean_km - gauche.mean_km
+    ecart_prix = droite.mean_price - gauche.mean_price
+    poids = gauche.n * droite.n / n
+
+    return Moments(
+        n,
+        gauche.mean_km + ecart_km * droite.n / n,
+        gauche.mean_price + ecart_prix * droite.n / n,
+        gauche.m2_km + droite.m2_km + ecart_km * ecart_km * poids,
+        gauche.m2_price + droite.m2_price + ecart_prix * ecart_prix * poids,
+        gauche.c_km_price + droite.c_km_price + ecart_km * ecart_prix * poids,
+        min(gauche.min_km, droite.min_km),
+        max(gauche.max_km, droite.max_km),
+        min(gauche.min_price, droite.min_price),
+        max(gauche.max_price, droite.max_price),
+    )
+
+
+def fit_ols(moments: Moments) -> tuple[float, float]:
+    """Return the least-squares ``(theta0, theta1)`` for ``moments``.
+
+    But:
+        Obtenir directement l’optimum visé par la descente de gradient.
+    """
+
+    # Pente OLS : θ1 = Σ(x - x̄)(y - ȳ) / Σ(x - x̄)²
+    # Si tous les km sont identiques, la pente est indéterminée :
+    # on retient 0, comme la descente de gradient sur des km normalisés nuls
+    theta1 = moments.c_km_price / moments.m2_km if moments.m2_km > 0 else 0.0
+
+    # La droite OLS passe toujours par le point moyen (x̄, ȳ)
+    theta0 = moments.mean_price - theta1 * moments.mean_km
     return theta0, theta1
 
 
+def normalized_stats(
+    moments: Moments,
+) -> tuple[float, float, float, float, float, float]:
+    """Return :func:`sufficient_stats` of the min-max normalized dataset.
+
+    But:
+        Obtenir les sommes des données normalisées sans second parcours.
+    """
+
+    # Mêmes plages que la normalisation de la CLI : une plage nulle
+    # (valeurs toutes identiques) est remplacée par 1 pour éviter /0
+    km_range = moments.max_km - moments.min_km or 1.0  # pragma: no mutate
+    price_range = moments.max_price - moments.min_price or 1.0  # pragma: no mutate
+
+    # Moyennes dans l’espace normalisé : x' = (x - min) / plage
+    n = float(moments.n)
+    moyenne_km = (moments.mean_km - moments.min_km) / km_range
+    moyenne_prix = (moments.mean_price - moments.min_price) / price_range
+
+    # On recompose les sommes brutes à partir des moments centrés :
+    #   Σx'² = Σ(x' - x̄')² + n·x̄'²   et   Σx'y' = Σ(x' - x̄')(y' - ȳ') + n·x̄'·ȳ'
+    # → les termes centrés restent précis même pour de grands km
+    return (
+        n,
+        n * moyenne_km,
+        n * moyenne_prix,
+        moments.m2_km / km_range**2 + n * moyenne_km**2,
+        moments.c_km_price / (km_range * price_range) + n * moyenne_km * moyenne_prix,
+        moments.m2_price / price_range**2 + n * moyenne_prix**2,
+    )
+
+
 def save_theta(
     theta0: float,
     theta1: float,
@@ -174,9 +951,17 @@ def save_theta(
     max_km: float | None = None,
     min_price: float | None = None,
     max_price: float | None = None,
+    iterations: int | None = None,
+    cost: float | None = None,
+    state: Moments | None = None,
 ) -> None:
     """Write training results and data bounds as JSON to ``path``.
 
+    ``iterations`` (updates actually applied) and ``cost`` (final
+    ``J(θ)`` in price units) are recorded when given.  ``state`` stores the
+    mergeable :class:`Moments` of the training data under ``"state"`` so that
+    :func:`load_state` can resume training on new rows only.
+
     But:
         Sauvegarder les paramètres et bornes éventuelles dans un fichier JSON.
     """
@@ -187,7 +972,7 @@ def save_theta(
 
     # On stocke systématiquement les coefficients du modèle (theta0, theta1),
     # car ils sont indispensables pour toute prédiction future
-    data: dict[str, float] = {"theta0": float(theta0), "theta1": float(theta1)}
+    data: dict[str, Any] = {"theta0": float(theta0), "theta1": float(theta1)}
 
     # On prépare un conteneur séparé pour les bornes, afin de ne les inclure
     # que si elles existent → évite d’écrire des champs inutiles ou ambigus
@@ -211,10 +996,108 @@ def save_theta(
     # une seule source de vérité, simple à charger par predict/train
     data.update(bounds)
 
+    # On trace l’effort d’entraînement (utile pour régler les tolérances) ;
+    # predict ignore ces champs
+    if iterations is not None:
+        data["iterations"] = int(iterations)
+    if cost is not None:
+        data["cost"] = float(cost)
+
+    # État fusionnable (moments de Welford + bornes) pour l’entraînement
+    # incrémental ; predict l’ignore lui aussi
+    if state is not None:
+        data["state"] = state._asdict()
+
     # On écrit tout en JSON pour garantir portabilité et lisibilité :
     # ce format est standard, facile à parser et indépendant du langage
     theta_path.write_text(json.dumps(data))
 
 
+def _lire_theta(theta_path: Path) -> dict[str, Any]:
+    """Lit un fichier theta JSON ; erreurs utilisateur en ``ValueError``."""
+
+    try:
+        contenu = json.loads(theta_path.read_text())
+    except OSError as exc:
+        raise ValueError(f"theta file not found: {theta_path}") from exc
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"invalid theta file: {theta_path}") from exc
+    # Un JSON valide mais non objet (liste, nombre) n’est pas un fichier theta
+    if isinstance(contenu, dict):
+        return contenu
+    raise ValueError(f"invalid theta file: {theta_path}")
+
+
+def load_coefficients(path: str | Path) -> tuple[float, float]:
+    """Return the real-scale ``(theta0, theta1)`` stored in theta file ``path``.
+
+    But:
+        Repartir d’un modèle existant pour un démarrage à chaud.
+    """
+
+    theta_path = Path(path)
+    contenu = _lire_theta(theta_path)
+
+    # Les deux coefficients sont exigés : partir de 0 masquerait l’erreur
+    try:
+        theta0, theta1 = float(contenu["theta0"]), float(contenu["theta1"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"invalid coefficients in {theta_path}") from exc
+    if not (math.isfinite(theta0) and math.isfinite(theta1)):
+        raise ValueError(f"invalid coefficients in {theta_path}")
+    return theta0, theta1
+
+
+def load_state(path: str | Path) -> Moments:
+    """Return the training :class:`Moments` stored in theta file ``path``.
+
+    But:
+        Reprendre un entraînement sans relire l’historique des données.
+    """
+
+    theta_path = Path(path)
+    etat = _lire_theta(theta_path).get("state")
+    if etat is None:
+        raise ValueError(
+            f"no training state in {theta_path} (train with --save-state first)"
+        )
+
+    # Chaque champ doit être présent et fini ; n entier strictement positif
+    # tel quel (ni flottant tronqué ni booléen) : --update fusionne ce compte
+    try:
+        moments = Moments(etat["n"], *(float(etat[c]) for c in Moments._fields[1:]))
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"invalid training state in {theta_path}") from exc
+    if (
+        type(moments.n) is not int
+        or moments.n <= 0
+        or not all(math.isfinite(v) for v in moments[1:])
+    ):
+        raise ValueError(f"invalid training state in {theta_path}")
+    return moments
+
+
 # Spécifie les symboles exportés pour import *
-__all__ = ["read_data", "gradient_descent", "save_theta"]
+__all__ = [
+    "Dataset",
+    "DescentResult",
+    "InvalidRowError",
+    "Moments",
+    "accumulate_moments",
+    "fit_ols",
+    "gradient_descent",
+    "gradient_descent_minibatch",
+    "gradient_descent_report",
+    "gradient_descent_stats",
+    "gradient_descent_stats_report",
+    "gradient_descent_sweep",
+    "iter_data",
+    "load_coefficients",
+    "load_dataset",
+    "load_state",
+    "merge_moments",
+    "normalized_stats",
+    "read_data",
+    "save_theta",
+    "sufficient_stats",
+]
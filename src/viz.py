@@ -13,29 +13,94 @@ import argparse
 # Fournit sqrt et autres pour intervalles de confiance
 import math
 
+# Détecte l’absence d’affichage pour choisir un backend headless
+import os
+import sys
+
+# Tampons compacts pour les indices d’outliers
+from array import array
+
+# Sélection des indices marqués par un masque
+from itertools import compress
+
 # Gère les chemins fichier de manière portable
 from pathlib import Path
 
-# Donne loi normale et stats robustes (médiane, stdev)
-from statistics import NormalDist, median, stdev
-
-# Types utilitaires pour signatures et cast
-from typing import Any, Iterable, Sequence, cast
+# Échantillonnage reproductible des points affichés
+from random import Random
 
-# Backend plotting pour générer les figures
-import matplotlib.pyplot as plt
+# Donne loi normale et médiane robuste
+from statistics import NormalDist, median
 
-# Fonction de prédiction du modèle linéaire
-from linear_regression import estimate_price
+# Types utilitaires pour signatures et contexte d’analyse nommé
+from typing import Any, Iterable, NamedTuple, Sequence
 
-# Calcule RMSE et R² pour le titre/diagnostic
-from metrics import evaluate
+# Prédiction du modèle linéaire, vectorisée sur des colonnes entières
+from linear_regression import estimate_prices
 
 # Charge les paramètres du modèle depuis fichier
 from predict.predict import load_theta
 
-# Charge et valide le CSV des données
-from train.train import read_data
+# Conteneurs colonnaires : accès direct aux colonnes km/prix
+from train.dataset import ColumnarData, Dataset
+
+# Charge et valide le CSV des données dans un conteneur colonnaire
+# Moments de Welford : un seul passage pour toutes les statistiques du tracé
+from train.train import Moments, accumulate_moments, load_dataset
+
+
+def _sans_affichage() -> bool:
+    """Indique si aucun serveur d’affichage n’est joignable (Unix hors macOS)."""
+
+    # Windows et macOS ont toujours un backend natif disponible
+    if sys.platform in ("win32", "darwin"):
+        return False
+    return not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def _pyplot(headless: bool = False) -> Any:
+    """Import matplotlib.pyplot on first use, headless when there is no display.
+
+    ``headless=True`` forces Agg (rendering to files) even if a display or
+    ``MPLBACKEND`` is set.
+
+    But:
+        Ne payer l’import de matplotlib que pour dessiner ; les helpers
+        statistiques (split_outliers, _std_errors, _band_bounds) s’en passent.
+    """
+
+    # Déjà importé : on garde le backend choisi par l’appelant (sauf headless)
+    if "matplotlib.pyplot" not in sys.modules:
+        import matplotlib
+
+        # Sans affichage ni MPLBACKEND explicite, on force Agg
+        # → évite la sonde des backends interactifs (lente et vouée à l’échec)
+        if headless or (not os.environ.get("MPLBACKEND") and _sans_affichage()):
+            matplotlib.use("Agg")
+
+    import matplotlib.pyplot as plt
+
+    # pyplot déjà chargé sur un backend interactif : un rendu en fichiers
+    # doit tout de même passer sur Agg
+    if headless and plt.get_backend().lower() != "agg":
+        plt.switch_backend("Agg")
+    return plt
+
+
+# Au-delà de ce nombre d’inliers, le nuage affiché est un échantillon
+_MAX_POINTS_DEFAUT = 50_000
+
+
+def _max_points_type(valeur: str) -> int:
+    """Convertit --max-points en entier ≥ 0 (0 = pas de décimation)."""
+
+    try:
+        limite = int(valeur)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid int value: {valeur!r}") from exc
+    if limite < 0:
+        raise argparse.ArgumentTypeError("max points must be >= 0")
+    return limite
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -161,9 +226,150 @@ def _build_parser() -> argparse.ArgumentParser:
         # met en évidence les points qui dépassent k·σ
         help="highlight points where |residual| > k * sigma",
     )
+
+    # Borne le nombre de points dessinés pour les très gros datasets
+    parser.add_argument(
+        "--max-points",
+        type=_max_points_type,
+        default=_MAX_POINTS_DEFAUT,
+        help=(
+            "draw a reproducible random sample of at most N inliers "
+            "(outliers are always drawn; 0 draws every point)"
+        ),
+    )
+
+    # Rendu headless vers des fichiers plutôt qu’une fenêtre bloquante
+    # → utilisable en CI et dans les rapports nocturnes
+    sorties = parser.add_mutually_exclusive_group()
+    sorties.add_argument(
+        "--output",
+        metavar="PATH",
+        help="save the plot to PATH (.png, .svg, .pdf) instead of showing it",
+    )
+    sorties.add_argument(
+        "--output-dir",
+        metavar="DIR",
+        help="save one <data stem>.<format> plot per dataset into DIR",
+    )
+
+    # Plusieurs couples données/coefficients rendus dans le même processus
+    parser.add_argument(
+        "--pair",
+        nargs=2,
+        action="append",
+        metavar=("DATA", "THETA"),
+        help="dataset and theta to render with --output-dir (repeatable)",
+    )
+
+    # Format des fichiers écrits dans --output-dir
+    parser.add_argument(
+        "--format",
+        choices=["png", "svg", "pdf"],
+        default="png",
+        help="file format for --output-dir",
+    )
     return parser
 
 
+def _min_max(valeurs: Iterable[float]) -> tuple[float, float]:
+    """Retourne ``(min, max)`` d’un itérable en un seul parcours.
+
+    But:
+        Calculer les bornes en mémoire constante, y compris sur un flux.
+    """
+
+    # On part de bornes infinies pour que la première valeur les fixe
+    borne_min = math.inf
+    borne_max = -math.inf
+    for valeur in valeurs:
+        borne_min = min(borne_min, valeur)
+        borne_max = max(borne_max, valeur)
+
+    # Un itérable vide n’a pas de bornes : même contrat que min()/max()
+    if borne_min > borne_max:
+        raise ValueError("min/max of empty sequence")
+    return borne_min, borne_max
+
+
+def _colonnes(
+    donnees: Iterable[tuple[float, float]],
+) -> tuple[Sequence[float], Sequence[float]]:
+    """Retourne les colonnes ``(km, prix)`` de ``donnees``.
+
+    But:
+        Servir les calculs vectorisés sans recopier un conteneur colonnaire.
+    """
+
+    # Un conteneur colonnaire expose déjà ses tampons contigus
+    if isinstance(donnees, ColumnarData):
+        return donnees.km, donnees.price
+
+    # Sinon on répartit les paires en deux colonnes, en un seul parcours
+    colonnes = Dataset.from_rows(donnees)
+    return colonnes.km, colonnes.price
+
+
+class Analysis(NamedTuple):
+    """Statistics of one dataset/theta pair, shared by every plotting step.
+
+    But:
+        Calculer une fois ce que titre, outliers, bande et moyenne réutilisent.
+    """
+
+    # Moyennes, sommes des carrés centrés, co-moment et bornes de (km, prix)
+    moments: Moments
+    # Métriques du titre, mêmes conventions que metrics.fused_metrics
+    rmse: float
+    r2: float
+    # σ des résidus sur n - 1 (seuil des outliers) et sur n - 2 (bande)
+    residual_std: float
+    band_std: float
+
+
+def analyze(
+    donnees: Iterable[tuple[float, float]],
+    coefficient_intercept: float,
+    coefficient_pente: float,
+) -> Analysis:
+    """Return the :class:`Analysis` of ``donnees`` in a single pass.
+
+    Residual statistics are derived from the moments: with
+    ``r = y - θ0 - θ1·x``, ``Σ(r - r̄)² = Syy - 2·θ1·Sxy + θ1²·Sxx``.
+
+    But:
+        Remplacer les relectures du CSV et les recalculs de résidus de viz.
+    """
+
+    moments = accumulate_moments(donnees)
+    n = moments.n
+    intercept = float(coefficient_intercept)
+    pente = float(coefficient_pente)
+
+    # Résidu moyen et dispersion des résidus déduits des moments centrés ;
+    # l’arrondi peut rendre la somme très légèrement négative → bornée à 0
+    residu_moyen = moments.mean_price - intercept - pente * moments.mean_km
+    somme_carres_centres = max(
+        0.0,
+        moments.m2_price
+        - 2 * pente * moments.c_km_price
+        + pente * pente * moments.m2_km,
+    )
+    somme_carres_residus = somme_carres_centres + n * residu_moyen * residu_moyen
+
+    return Analysis(
+        moments,
+        math.sqrt(somme_carres_residus / n) if n else 0.0,
+        # Garde identique à metrics : prix constants → R² = 1
+        (
+            1.0
+            if moments.m2_price == 0.0
+            else 1 - somme_carres_residus / moments.m2_price
+        ),
+        math.sqrt(somme_carres_centres / (n - 1)) if n > 1 else 0.0,
+        math.sqrt(somme_carres_residus / (n - 2)) if n > 2 else 0.0,
+    )
+
+
 def _line_points(
     liste_kilometres: Iterable[float],
     coefficient_intercept: float,
@@ -175,13 +381,10 @@ def _line_points(
         Déterminer les extrémités de la droite ajustée (km, prix).
     """
 
-    # On prend le kilomètre minimum de l’échantillon
-    # → garantit que la droite démarre au tout début des observations
-    km_min = min(liste_kilometres)
-
-    # On prend le kilomètre maximum de l’échantillon
-    # → garantit que la droite s’étend jusqu’au dernier point observé
-    km_max = max(liste_kilometres)
+    # On prend le minimum et le maximum de l’échantillon en un seul parcours
+    # → la droite couvre tout le domaine observé, et un itérateur consommable
+    #   (lecture en flux) suffit sans matérialiser la liste des km
+    km_min, km_max = _min_max(liste_kilometres)
 
     # On forme la liste des deux extrêmes
     # → deux points suffisent pour représenter toute la droite
@@ -189,10 +392,9 @@ def _line_points(
 
     # On calcule les prix prédits pour ces deux kilomètres
     # → permet de tracer un segment qui résume l’ensemble de la régression
-    prix_extremes = [
-        estimate_price(km, coefficient_intercept, coefficient_pente)
-        for km in kilometres_extremes
-    ]
+    prix_extremes = estimate_prices(
+        kilometres_extremes, coefficient_intercept, coefficient_pente
+    ).tolist()
 
     # On retourne les deux listes synchronisées (km, prix)
     # → ces paires sont prêtes à être tracées dans la figure
@@ -261,19 +463,20 @@ def plot_residuals(
         Visualiser l'écart entre prix réel et prix prédit en fonction du kilométrage.
     """
 
-    # On parcourt chaque point observé pour comparer réalité et modèle
-    for kilometre, prix_reel in donnees_reelles:
-        # On calcule le prix estimé → permet de matérialiser l’écart au modèle
-        prix_prevu = estimate_price(kilometre, coefficient_intercept, coefficient_pente)
-
-        # On trace un segment vertical reliant le prix réel au prix prédit
-        # → rend visible la magnitude et la direction de l’erreur
-        # → plus le segment est long, plus l’erreur est importante
-        # → segments au-dessus et en dessous de la droite indiquent
-        #   respectivement une sous-estimation ou une surestimation
-        module_matplotlib.vlines(
-            kilometre, prix_reel, prix_prevu, colors="gray", linewidth=0.5
-        )
+    # On calcule d’un bloc les prix estimés → matérialise l’écart au modèle
+    liste_km, liste_prix = _colonnes(donnees_reelles)
+    if not len(liste_km):
+        return
+    prix_prevus = estimate_prices(liste_km, coefficient_intercept, coefficient_pente)
+
+    # Un seul appel pour tous les points : une seule LineCollection au lieu
+    # d’un artiste par ligne → construction et redessin quasi constants
+    # → chaque segment vertical relie le prix réel au prix prédit ;
+    #   sa longueur donne la magnitude de l’erreur, son côté de la droite
+    #   indique une sous-estimation ou une surestimation
+    module_matplotlib.vlines(
+        liste_km, liste_prix, prix_prevus, colors="gray", linewidth=0.5
+    )
 
 
 def _stats(valeurs: Sequence[float]) -> tuple[float, float]:
@@ -315,9 +518,12 @@ def _ecart_type_residus(
 
     # On calcule les résidus = différence entre prix réel (observé)
     # et prix estimé par le modèle → reflète l’erreur de prédiction
+    valeurs_entree, valeurs_observees = _colonnes(donnees)
     residus = [
-        valeur_observee - estimate_price(valeur_entree, intercept, pente)
-        for valeur_entree, valeur_observee in donnees
+        valeur_observee - prediction
+        for valeur_observee, prediction in zip(
+            valeurs_observees, estimate_prices(valeurs_entree, intercept, pente)
+        )
     ]
 
     # Formule de la variance des résidus :
@@ -340,13 +546,10 @@ def _band_grid(kilometres_observes: Sequence[float]) -> list[float]:
         Générer 101 points uniformes entre min et max des kilomètres.
     """
 
-    # On prend le minimum observé comme borne gauche
-    # → garantit que la grille couvre exactement le domaine d’observation
-    borne_min_km = min(kilometres_observes)
-
-    # On prend le maximum observé comme borne droite
-    # → garantit que la bande de confiance s’étend jusqu’au dernier point connu
-    borne_max_km = max(kilometres_observes)
+    # On prend le minimum et le maximum observés en un seul parcours
+    # → la grille couvre exactement le domaine d’observation, du premier
+    #   au dernier point connu
+    borne_min_km, borne_max_km = _min_max(kilometres_observes)
 
     # Formule d’interpolation linéaire :
     #   valeur = min + (max - min) × (indice / 100)
@@ -378,7 +581,27 @@ def _std_errors(
 
     # On mesure la taille de l’échantillon car plus il y a de points,
     # plus l’estimation est fiable → la variance diminue avec n
-    nombre_points_regression = len(liste_points_regression)
+    return _std_errors_count(
+        liste_points_cible,
+        len(liste_points_regression),
+        ecart_type_residus,
+        moyenne_points_regression,
+        somme_carre_centre,
+    )
+
+
+def _std_errors_count(
+    liste_points_cible: Sequence[float],
+    nombre_points_regression: int,
+    ecart_type_residus: float,
+    moyenne_points_regression: float,
+    somme_carre_centre: float,
+) -> list[float]:
+    """Variante de :func:`_std_errors` à partir du seul nombre de points.
+
+    But:
+        Calculer la bande depuis les moments, sans garder les abscisses.
+    """
 
     # Formule : erreur_standard(x) =
     #   σ_residus × √(1/n + (x - x̄)² / Σ(x - x̄)²)
@@ -441,25 +664,43 @@ def plot_confidence_band(
     coefficient_intercept: float,
     coefficient_pente: float,
     niveau_confiance: float,
+    *,
+    analyse: Analysis | None = None,
 ) -> None:
     """Trace la bande de confiance autour de la régression.
 
+    Avec ``analyse``, les statistiques déjà calculées sont réutilisées et les
+    données ne sont pas reparcourues.
+
     But:
         Visualiser l'incertitude prédictive (prix en fonction du kilométrage).
     """
 
-    # On convertit en liste pour permettre plusieurs parcours (stats, grille, tracé)
-    # sans réévaluer un itérable potentiellement consommable une seule fois
-    liste_kilometres = list(kilometres_iterable)
+    if analyse is not None:
+        # Tout vient des moments du contexte : aucun parcours des données
+        nombre_points = analyse.moments.n
+        moyenne_km = analyse.moments.mean_km
+        somme_carre_centre = analyse.moments.m2_km
+        # → les extrêmes suffisent pour la grille
+        kilometres_observes: Sequence[float] = (
+            analyse.moments.min_km,
+            analyse.moments.max_km,
+        )
+    else:
+        # On convertit en liste pour permettre plusieurs parcours (stats, grille)
+        # sans réévaluer un itérable potentiellement consommable une seule fois
+        kilometres_observes = list(kilometres_iterable)
+        nombre_points = len(kilometres_observes)
 
     # On exige au moins 3 points : en dessous, l’estimation de variance résiduelle
     # et des erreurs standard devient instable ou non définie
-    if len(liste_kilometres) <= 2:
+    if nombre_points <= 2:
         return
 
     # On calcule moyenne et somme des carrés centrés pour caractériser la dispersion
     # du kilométrage : ces grandeurs servent à normaliser l’incertitude le long de x
-    moyenne_km, somme_carre_centre = _stats(liste_kilometres)
+    if analyse is None:
+        moyenne_km, somme_carre_centre = _stats(kilometres_observes)
 
     # Si la dispersion des km est quasi nulle, la droite est indéterminée sur x :
     # inutile de tracer une bande de confiance (elle serait dégénérée)
@@ -468,22 +709,27 @@ def plot_confidence_band(
 
     # On estime l’écart-type des résidus pour quantifier le bruit inexpliqué
     # par le modèle : c’est la base de l’incertitude prédictive
-    ecart_type_residus = _ecart_type_residus(
-        donnees_reelles,
-        coefficient_intercept,
-        coefficient_pente,
-        len(liste_kilometres),
+    ecart_type_residus = (
+        analyse.band_std
+        if analyse is not None
+        else _ecart_type_residus(
+            donnees_reelles,
+            coefficient_intercept,
+            coefficient_pente,
+            nombre_points,
+        )
     )
 
     # On génère une grille régulière de x pour obtenir une bande lisse et lisible,
     # plutôt que d’onduler uniquement sur les points d’entraînement
-    grille_km = _band_grid(liste_kilometres)
+    # (seules les bornes comptent : min/max suffisent)
+    grille_km = _band_grid(kilometres_observes)
 
     # On calcule les prédictions du modèle sur cette grille pour servir
     # de centre à la bande de confiance
-    liste_prix_predits = [
-        estimate_price(km, coefficient_intercept, coefficient_pente) for km in grille_km
-    ]
+    liste_prix_predits = estimate_prices(
+        grille_km, coefficient_intercept, coefficient_pente
+    )
 
     # On prend le quantile normal correspondant au niveau de confiance demandé
     # (par ex. 1.96 pour 95 %) pour dimensionner la largeur de la bande
@@ -491,9 +737,9 @@ def plot_confidence_band(
 
     # On calcule l’erreur standard en chaque x : l’incertitude n’est pas uniforme,
     # elle augmente loin de la moyenne de x (effet levier)
-    liste_erreurs_standard = _std_errors(
+    liste_erreurs_standard = _std_errors_count(
         grille_km,
-        liste_kilometres,
+        nombre_points,
         ecart_type_residus,
         moyenne_km,
         somme_carre_centre,
@@ -520,6 +766,8 @@ def plot_central_tendency(
     module_matplotlib: Any,
     liste_prix: Sequence[float],
     afficher_mediane: bool,
+    *,
+    moyenne_prix: float | None = None,
 ) -> None:
     """Trace la moyenne et éventuellement la médiane des prix.
 
@@ -529,7 +777,9 @@ def plot_central_tendency(
 
     # On calcule la moyenne car c’est l’indicateur le plus courant
     # pour résumer un ensemble de valeurs → donne une vision globale
-    moyenne_prix = sum(liste_prix) / len(liste_prix)
+    # (sauf si le contexte d’analyse l’a déjà fournie)
+    if moyenne_prix is None:
+        moyenne_prix = sum(liste_prix) / len(liste_prix)
 
     # On trace une ligne horizontale pour rendre immédiatement visible
     # ce niveau moyen et permettre de comparer chaque point à cette référence
@@ -551,8 +801,91 @@ def plot_central_tendency(
         )
 
 
+def _masque_outliers(
+    liste_km: Sequence[float],
+    liste_prix: Sequence[float],
+    coefficient_intercept: float,
+    coefficient_pente: float,
+    seuil_ecart_type: float,
+    ecart_type_residus: float | None = None,
+) -> bytearray:
+    """Drapeaux d’outliers à partir des colonnes (km, prix) ; voir outlier_mask.
+
+    Un σ déjà connu (contexte d’analyse) évite le premier passage.
+    """
+
+    intercept = float(coefficient_intercept)
+    pente = float(coefficient_pente)
+
+    # 1er passage : moyenne et somme des carrés centrés des résidus (Welford)
+    # → σ sans matérialiser les résidus, numériquement stable
+    if ecart_type_residus is None:
+        nombre, moyenne, somme_carres = 0, 0.0, 0.0
+        for kilometre, prix_reel in zip(liste_km, liste_prix):
+            residu = prix_reel - (intercept + pente * kilometre)
+            nombre += 1
+            delta = residu - moyenne
+            moyenne += delta / nombre
+            somme_carres += delta * (residu - moyenne)
+
+        # Cas particulier : si moins de 2 points, σ n’est pas défini, on force à 0
+        ecart_type_residus = (
+            math.sqrt(somme_carres / (nombre - 1)) if nombre > 1 else 0.0
+        )
+    limite = seuil_ecart_type * ecart_type_residus
+
+    # 2e passage : on recalcule chaque résidu (moins cher que de le stocker)
+    # et on ne garde qu’un drapeau par ligne
+    return bytearray(
+        abs(prix_reel - (intercept + pente * kilometre)) > limite
+        for kilometre, prix_reel in zip(liste_km, liste_prix)
+    )
+
+
+def outlier_mask(
+    donnees_csv: Iterable[tuple[float, float]],
+    coefficient_intercept: float,
+    coefficient_pente: float,
+    seuil_ecart_type: float,
+) -> bytearray:
+    """Return one byte per row: 1 when ``|residual| > k·σ``, else 0.
+
+    σ is the sample standard deviation of the residuals, computed in a single
+    streaming pass; a second pass writes the mask.  No residual list is kept.
+
+    But:
+        Repérer les points atypiques d’un très gros dataset à 1 octet par ligne.
+    """
+
+    return _masque_outliers(
+        *_colonnes(donnees_csv),
+        coefficient_intercept,
+        coefficient_pente,
+        seuil_ecart_type,
+    )
+
+
+def outlier_indices(
+    donnees_csv: Iterable[tuple[float, float]],
+    coefficient_intercept: float,
+    coefficient_pente: float,
+    seuil_ecart_type: float,
+) -> array[int]:
+    """Return the row indices flagged by :func:`outlier_mask`, ascending.
+
+    But:
+        Lister les annonces atypiques sans copier les lignes elles-mêmes.
+    """
+
+    masque = outlier_mask(
+        donnees_csv, coefficient_intercept, coefficient_pente, seuil_ecart_type
+    )
+    # compress() ne garde que les indices dont le drapeau vaut 1
+    return array("q", compress(range(len(masque)), masque))
+
+
 def split_outliers(
-    donnees_csv: Sequence[tuple[float, float]],
+    donnees_csv: Iterable[tuple[float, float]],
     coefficient_intercept: float,
     coefficient_pente: float,
     seuil_ecart_type: float,
@@ -563,39 +896,100 @@ def split_outliers(
         Identifier les points atypiques selon |résidu| ≤/> k·σ.
     """
 
-    # On calcule les résidus (différence prix réel - prix prédit)
-    # pour mesurer directement l’écart entre modèle et observation
-    liste_residus = [
-        prix_reel - estimate_price(km, coefficient_intercept, coefficient_pente)
-        for km, prix_reel in donnees_csv
-    ]
-
-    # On estime l’écart-type des résidus pour disposer d’une mesure
-    # de la dispersion typique → sert de seuil pour définir “atypique”
-    # Cas particulier : si moins de 2 points, σ n’est pas défini, on force à 0
-    ecart_type_residus = stdev(liste_residus) if len(liste_residus) > 1 else 0.0
-
-    # On conserve les points dont l’écart est ≤ k·σ
-    # car ils représentent le comportement “normal” du modèle
-    liste_inliers = [
-        (km, prix_reel)
-        for (km, prix_reel), residu in zip(donnees_csv, liste_residus)
-        if abs(residu) <= seuil_ecart_type * ecart_type_residus
-    ]
-
-    # On isole les points dont l’écart est > k·σ
-    # car ils sont susceptibles d’être aberrants et d’influencer fortement la régression
-    liste_outliers = [
-        (km, prix_reel)
-        for (km, prix_reel), residu in zip(donnees_csv, liste_residus)
-        if abs(residu) > seuil_ecart_type * ecart_type_residus
-    ]
+    # On calcule d’abord un drapeau par ligne (σ en flux, sans liste de résidus)
+    # → le seul coût mémoire restant est celui des deux listes demandées
+    liste_km, liste_prix = _colonnes(donnees_csv)
+    masque = _masque_outliers(
+        liste_km,
+        liste_prix,
+        coefficient_intercept,
+        coefficient_pente,
+        seuil_ecart_type,
+    )
 
     # On retourne les deux groupes distincts pour permettre
     # un tracé différencié et une interprétation plus transparente
+    return _repartir(liste_km, liste_prix, masque)
+
+
+def _repartir(
+    liste_km: Sequence[float], liste_prix: Sequence[float], masque: bytearray
+) -> tuple[list[tuple[float, float]], list[tuple[float, float]]]:
+    """Répartit les points en (inliers, outliers) selon le masque, en un parcours."""
+
+    # Ceux dont l’écart est ≤ k·σ représentent le comportement “normal” du
+    # modèle, les autres sont susceptibles d’être aberrants et d’influencer
+    # fortement la régression
+    liste_inliers: list[tuple[float, float]] = []
+    liste_outliers: list[tuple[float, float]] = []
+    groupes = (liste_inliers, liste_outliers)
+    for point, drapeau in zip(zip(liste_km, liste_prix), masque):
+        groupes[drapeau].append(point)
     return liste_inliers, liste_outliers
 
 
+def decimate_points(
+    points: Sequence[tuple[float, float]],
+    limite: int,
+    graine: int = 0,
+) -> Sequence[tuple[float, float]]:
+    """Return at most ``limite`` points sampled uniformly, in input order.
+
+    ``limite == 0`` or a short enough input returns ``points`` unchanged.
+
+    But:
+        Borner le coût de rendu d’un nuage de points, quelle que soit sa taille.
+    """
+
+    # Rien à faire sous le seuil : on rend la séquence telle quelle
+    if limite == 0 or len(points) <= limite:
+        return points
+
+    # Tirage sans remise d’indices, à graine fixe pour des tracés reproductibles ;
+    # le tri garde l’ordre d’origine (utile pour comparer deux rendus)
+    indices = sorted(Random(graine).sample(range(len(points)), limite))
+    return [points[indice] for indice in indices]
+
+
+def _points_affiches(
+    liste_km: Sequence[float],
+    liste_prix: Sequence[float],
+    masque: bytearray,
+    limite: int,
+    graine: int = 0,
+) -> tuple[list[tuple[float, float]], list[tuple[float, float]], bool]:
+    """Sélectionne les points à tracer : inliers échantillonnés, tous les outliers.
+
+    Même tirage que :func:`decimate_points` appliqué aux inliers, mais fait
+    sur leurs rangs : seuls les points retenus deviennent des tuples.
+    Le booléen indique si des inliers ont été écartés.
+
+    But:
+        Garder une mémoire bornée par ``limite`` sur un très gros dataset.
+    """
+
+    # Rangs des inliers retenus (dans l’ordre) ; None = on les garde tous
+    nombre_inliers = masque.count(0)
+    rangs: list[int] | None = None
+    if limite and nombre_inliers > limite:
+        rangs = sorted(Random(graine).sample(range(nombre_inliers), limite))
+
+    # Un seul parcours du masque : rang = position parmi les inliers,
+    # suivant = indice du prochain rang tiré
+    inliers: list[tuple[float, float]] = []
+    outliers: list[tuple[float, float]] = []
+    rang = suivant = 0
+    for indice, drapeau in enumerate(masque):
+        if drapeau:
+            outliers.append((liste_km[indice], liste_prix[indice]))
+            continue
+        if rangs is None or (suivant < len(rangs) and rangs[suivant] == rang):
+            inliers.append((liste_km[indice], liste_prix[indice]))
+            suivant += 1
+        rang += 1
+    return inliers, outliers, rangs is not None
+
+
 def plot_points(
     module_matplotlib: Any,
     inliers_km_prix: Sequence[tuple[float, float]],
@@ -639,113 +1033,191 @@ def plot_points(
         )
 
 
-def main(arguments_ligne_commande: list[str] | None = None) -> None:
-    """Visualise le jeu de données (km, prix) et la droite θ0 + θ1·km.
+def render_plot(
+    module_matplotlib: Any,
+    chemin_donnees: str,
+    chemin_theta: str,
+    arguments: argparse.Namespace,
+) -> None:
+    """Draw one dataset and its regression line on the current figure.
 
     But:
-        Charger, évaluer et tracer les éléments avec Matplotlib.
+        Charger, évaluer et tracer ; l’appelant choisit fenêtre ou fichier.
     """
 
-    # On centralise la politique d’entrée pour garantir une CLI cohérente
-    # et éviter des usages ambigus ou des valeurs par défaut implicites
-    arguments = _build_parser().parse_args(arguments_ligne_commande)
-
     # On relit les données via la même filière de validation que l’entraînement
     # pour éviter tout écart de parsing entre train et viz
-    donnees_csv = read_data(Path(arguments.data))
-
-    # On récupère les coefficients appris afin d’afficher une droite
-    # qui reflète exactement le dernier état du modèle
-    coefficient_intercept, coefficient_pente, *_ = load_theta(arguments.theta)
-
-    # On calcule RMSE et R² pour donner un contexte quantitatif au graphe
-    # et permettre d’interpréter visuellement la qualité du modèle
-    racine_mse, coefficient_determination = evaluate(arguments.data, arguments.theta)
-
-    # On isole les km pour faciliter les appels aux fonctions de tracé
-    # et éviter de recalculer des compréhensions à chaque étape
-    liste_km = [km for km, _ in donnees_csv]
-
-    # On isole les prix pour pouvoir tracer tendances centrales
-    # et synthèses sans recouper la liste des tuples
-    liste_prix = [prix for _, prix in donnees_csv]
-
-    # On sépare inliers/outliers pour rendre lisible l’influence des points extrêmes
-    # et éviter qu’ils ne masquent la structure globale sur le scatter
-    inliers_km_prix, outliers_km_prix = split_outliers(
-        donnees_csv,
-        coefficient_intercept,
-        coefficient_pente,
-        arguments.sigma_k,
-    )
-
-    # On neutralise le typage de plt pour autoriser des appels dynamiques
-    # (certaines backends/versions diffèrent), sans se battre avec l’IDE
-    module_matplotlib = cast(Any, plt)
-
-    # On trace d’abord les points afin que la droite et les éléments dérivés
-    # se superposent sur un fond de données déjà visible
-    plot_points(module_matplotlib, inliers_km_prix, outliers_km_prix)
+    # → colonnes compactes array('d') : pas de liste de tuples à recopier
+    # → projection mmap d’un dataset binaire refermée une fois le tracé fini
+    with load_dataset(Path(chemin_donnees)) as donnees_csv:
+        # On récupère les coefficients appris afin d’afficher une droite
+        # qui reflète exactement le dernier état du modèle
+        coefficient_intercept, coefficient_pente, *_ = load_theta(chemin_theta)
+
+        # Contexte d’analyse : un seul parcours des colonnes déjà en mémoire
+        # fournit RMSE/R² (titre), σ des résidus (outliers, bande), moyennes et
+        # bornes → plus de relecture du CSV ni de recalcul par étape
+        analyse = analyze(donnees_csv, coefficient_intercept, coefficient_pente)
+
+        # On réutilise directement la colonne des km pour les fonctions de tracé
+        # → aucune compréhension ni copie à chaque étape
+        liste_km = donnees_csv.km
+
+        # Idem pour les prix : tendances centrales et synthèses
+        # lisent la colonne contiguë sans recouper des tuples
+        liste_prix = donnees_csv.price
+
+        # On sépare inliers/outliers pour rendre lisible l’influence des points
+        # extrêmes et éviter qu’ils ne masquent la structure globale du scatter
+        # → σ repris du contexte : un seul passage pour le masque (un octet/point)
+        masque = _masque_outliers(
+            liste_km,
+            liste_prix,
+            coefficient_intercept,
+            coefficient_pente,
+            arguments.sigma_k,
+            analyse.residual_std,
+        )
 
-    # On récupère les axes actifs pour s’assurer que les éléments suivants
-    # (droite, légende) s’appliquent au même contexte graphique
-    axes_courants = module_matplotlib.gca()
+        # Sur un gros dataset, on n’affiche qu’un échantillon des inliers ;
+        # les outliers restent tous visibles car ce sont eux qu’on veut repérer
+        # → tirage sur les rangs : seuls les points affichés deviennent des tuples
+        inliers_affiches, outliers_km_prix, decime = _points_affiches(
+            liste_km, liste_prix, masque, arguments.max_points
+        )
 
-    # On affiche les résidus à la demande pour expliciter l’erreur point par point
-    # sans surcharger le graphe si l’utilisateur ne le souhaite pas
-    if arguments.show_residuals:
-        plot_residuals(
-            module_matplotlib,
-            donnees_csv,
+        # On trace d’abord les points afin que la droite et les éléments dérivés
+        # se superposent sur un fond de données déjà visible
+        plot_points(module_matplotlib, inliers_affiches, outliers_km_prix)
+
+        # On récupère les axes actifs pour s’assurer que les éléments suivants
+        # (droite, légende) s’appliquent au même contexte graphique
+        axes_courants = module_matplotlib.gca()
+
+        # On affiche les résidus à la demande pour expliciter l’erreur point par
+        # point sans surcharger le graphe si l’utilisateur ne le souhaite pas
+        # → après décimation, seuls les points affichés reçoivent leur segment
+        if arguments.show_residuals:
+            plot_residuals(
+                module_matplotlib,
+                ([*inliers_affiches, *outliers_km_prix] if decime else donnees_csv),
+                coefficient_intercept,
+                coefficient_pente,
+            )
+
+        # On trace la bande de confiance seulement si un niveau est spécifié
+        # afin de matérialiser l’incertitude sans imposer d’hypothèse par défaut
+        if arguments.confidence is not None:
+            plot_confidence_band(
+                module_matplotlib,
+                liste_km,
+                donnees_csv,
+                coefficient_intercept,
+                coefficient_pente,
+                arguments.confidence,
+                analyse=analyse,
+            )
+
+        # On dessine la droite de régression pour montrer la relation apprise
+        # et, à la demande, son équation pour la transparence du modèle
+        # → les bornes du contexte suffisent : une droite = deux points
+        plot_regression_line(
+            axes_courants,
+            (analyse.moments.min_km, analyse.moments.max_km),
             coefficient_intercept,
             coefficient_pente,
+            arguments.show_eq,
         )
 
-    # On trace la bande de confiance seulement si un niveau est spécifié
-    # afin de matérialiser l’incertitude sans imposer d’hypothèse par défaut
-    if arguments.confidence is not None:
-        plot_confidence_band(
+        # On ajoute des indicateurs de tendance (moyenne, optionnellement médiane)
+        # pour aider à juger visuellement les biais et la dispersion
+        plot_central_tendency(
             module_matplotlib,
-            liste_km,
-            donnees_csv,
-            coefficient_intercept,
-            coefficient_pente,
-            arguments.confidence,
+            liste_prix,
+            arguments.show_median,
+            moyenne_prix=analyse.moments.mean_price,
         )
 
-    # On dessine la droite de régression pour montrer la relation apprise
-    # et, à la demande, son équation pour la transparence du modèle
-    plot_regression_line(
-        axes_courants,
-        liste_km,
-        coefficient_intercept,
-        coefficient_pente,
-        arguments.show_eq,
-    )
+        # On titre le graphique avec RMSE et R² pour relier visuel et métriques
+        # et éviter de devoir consulter la console pour les chiffres clés
+        module_matplotlib.suptitle(f"RMSE: {analyse.rmse:.2f}, R2: {analyse.r2:.2f}")
+
+        # On étiquette les axes pour lever toute ambiguïté d’unité/interprétation
+        module_matplotlib.xlabel("km")
+        module_matplotlib.ylabel("price")
+
+        # On n’affiche une légende que s’il y a des éléments nommés,
+        # pour éviter un cadre vide inutile et garder le graphe épuré
+        _, liste_labels = axes_courants.get_legend_handles_labels()
+        if any(liste_labels):
+            module_matplotlib.legend()
+
+
+def _cibles(
+    parser: argparse.ArgumentParser, arguments: argparse.Namespace
+) -> list[tuple[str, str, Path]]:
+    """Associe chaque couple (données, theta) à son fichier de sortie."""
+
+    couples = [tuple(c) for c in arguments.pair or [(arguments.data, arguments.theta)]]
+    if arguments.output is not None:
+        # --output désigne un seul fichier : un seul tracé possible
+        if len(couples) > 1:
+            parser.error("--output renders one plot; use --output-dir with --pair")
+        return [(couples[0][0], couples[0][1], Path(arguments.output))]
+
+    dossier = Path(arguments.output_dir)
+    cibles = [
+        (donnees, theta, dossier / f"{Path(donnees).stem}.{arguments.format}")
+        for donnees, theta in couples
+    ]
+    # Deux datasets de même nom s’écraseraient silencieusement
+    noms = [cible.name for *_, cible in cibles]
+    doublons = sorted({nom for nom in noms if noms.count(nom) > 1})
+    if doublons:
+        parser.error(f"duplicate output names in --output-dir: {', '.join(doublons)}")
+    return cibles
 
-    # On ajoute des indicateurs de tendance (moyenne, optionnellement médiane)
-    # pour aider à juger visuellement les biais et la dispersion
-    plot_central_tendency(module_matplotlib, liste_prix, arguments.show_median)
 
-    # On titre le graphique avec RMSE et R² pour relier visuel et métriques
-    # et éviter de devoir consulter la console pour les chiffres clés
-    module_matplotlib.suptitle(
-        f"RMSE: {racine_mse:.2f}, R2: {coefficient_determination:.2f}"
-    )
+def main(arguments_ligne_commande: list[str] | None = None) -> None:
+    """Visualise le jeu de données (km, prix) et la droite θ0 + θ1·km.
 
-    # On étiquette les axes pour lever toute ambiguïté d’unité/interprétation
-    module_matplotlib.xlabel("km")
-    module_matplotlib.ylabel("price")
+    But:
+        Afficher le tracé, ou le rendre en fichiers sans affichage.
+    """
 
-    # On n’affiche une légende que s’il y a des éléments nommés,
-    # pour éviter un cadre vide inutile et garder le graphe épuré
-    _, liste_labels = axes_courants.get_legend_handles_labels()
-    if any(liste_labels):
-        module_matplotlib.legend()
+    # On centralise la politique d’entrée pour garantir une CLI cohérente
+    # et éviter des usages ambigus ou des valeurs par défaut implicites
+    parser = _build_parser()
+    arguments = parser.parse_args(arguments_ligne_commande)
+
+    # --pair n’a de sens que pour un rendu en lot vers un dossier
+    if arguments.pair and arguments.output_dir is None:
+        parser.error("--pair requires --output-dir")
+
+    # Mode interactif : un tracé puis la fenêtre de rendu, pour un feedback
+    # visuel immédiat (choix privilégié pour l’exploration)
+    if arguments.output is None and arguments.output_dir is None:
+        # Import paresseux : matplotlib n’est chargé qu’ici, au moment de
+        # tracer ; typage neutralisé pour autoriser des appels dynamiques
+        # (certaines backends/versions diffèrent), sans se battre avec l’IDE
+        module_matplotlib = _pyplot()
+        render_plot(module_matplotlib, arguments.data, arguments.theta, arguments)
+        module_matplotlib.show()
+        return
 
-    # On ouvre la fenêtre de rendu pour fournir un feedback visuel immédiat
-    # (choix privilégié pour l’exploration interactive)
-    module_matplotlib.show()
+    # Mode fichier : Agg, un seul import de matplotlib pour tous les tracés
+    cibles = _cibles(parser, arguments)
+    module_matplotlib = _pyplot(headless=True)
+    for chemin_donnees, chemin_theta, cible in cibles:
+        cible.parent.mkdir(parents=True, exist_ok=True)
+        # Une figure neuve par tracé, fermée aussitôt écrite
+        # → la mémoire reste bornée quel que soit le nombre de datasets
+        figure = module_matplotlib.figure()
+        try:
+            render_plot(module_matplotlib, chemin_donnees, chemin_theta, arguments)
+            figure.savefig(cible)
+        finally:
+            module_matplotlib.close(figure)
 
 
 # Autorise l’exécution comme script utilitaire
@@ -25,3 +25,5 @@ def test_accuracy_main_outputs(
     out = capsys.readouterr().out
     assert "RMSE: 0.0" in out
     assert "R2: 1.0" in out
+    assert "MAE: 0.0" in out
+    assert "Max error: 0.0" in out
@@ -0,0 +1,72 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import benchmarks
+
+
+def _datasets(tmp_path: Path) -> Path:
+    data_dir = tmp_path / "bench"
+    data_dir.mkdir()
+    (data_dir / "line.csv").write_text("km,price\n0,10\n10,8\n20,6\n")
+    (data_dir / "flat.csv").write_text("km,price\n0,5\n10,5\n")
+    (data_dir / "broken.csv").write_text("km,price\n1,-2\n")
+    return data_dir
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_benchmarks_in_order(tmp_path: Path, workers: int) -> None:
+    data_dir = _datasets(tmp_path)
+    paths = sorted(str(p) for p in data_dir.glob("*.csv"))
+    results = benchmarks.run_benchmarks(
+        paths, str(tmp_path), ("--solver", "ols"), workers
+    )
+    assert [r.name for r in results] == ["broken", "flat", "line"]
+    broken, flat, line = results
+    assert broken.error == "invalid row 2: negative price"
+    assert (flat.rows, flat.rmse, flat.error) == (2, 0.0, None)
+    assert line.rmse == pytest.approx(0.0, abs=1e-9)
+    assert line.iterations is None
+    assert (tmp_path / "theta_line.json").exists()
+
+
+def test_benchmarks_main_writes_json_and_table(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    data_dir = _datasets(tmp_path)
+    (data_dir / "broken.csv").unlink()
+    out = tmp_path / "results.json"
+    args = ["--data-dir", str(data_dir), "--theta-dir", str(tmp_path)]
+    args += ["--json", str(out), "--workers", "1", "--iters", "50"]
+    assert benchmarks.main(args) == 0
+
+    table = json.loads(out.read_text())
+    assert [row["name"] for row in table] == ["flat", "line"]
+    assert table[1]["iterations"] == 50
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split() == [
+        "dataset",
+        "rows",
+        "iters",
+        "RMSE",
+        "R2",
+        "time_s",
+        "rows/s",
+    ]
+    assert lines[2].startswith("line")
+
+    assert benchmarks.main(["--data-dir", str(tmp_path / "none")]) == 2
+
+
+@pytest.mark.parametrize(
+    "options", [["--alpha", "abc"], ["--alpha", "2"], ["--iters", "0"]]
+)
+def test_benchmarks_main_validates_train_options(
+    tmp_path: Path, options: list[str]
+) -> None:
+    # Erreur d’usage dans le parent, avant tout démarrage du pool
+    args = ["--data-dir", str(_datasets(tmp_path)), "--workers", "2", *options]
+    with pytest.raises(SystemExit) as exc:
+        benchmarks.main(args)
+    assert exc.value.code == 2
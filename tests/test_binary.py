@@ -0,0 +1,142 @@
+import json
+import struct
+from pathlib import Path
+
+import pytest
+
+from train.__main__ import main as train_main
+from train.binary import (
+    MAGIC,
+    TAILLE_ENTETE,
+    MappedDataset,
+    is_binary_dataset,
+    write_binary_dataset,
+)
+from train.convert import main as convert_main
+from train.dataset import Dataset
+from train.train import iter_data, load_dataset, read_data
+
+
+def _csv(tmp_path: Path) -> Path:
+    path = tmp_path / "data.csv"
+    path.write_text("km,price\n10,100\n30,80\n20,90\n")
+    return path
+
+
+def test_binary_round_trip(tmp_path: Path) -> None:
+    data = Dataset([10.0, 30.0, 20.0], [100.0, 80.0, 90.0])
+    path = tmp_path / "data.bin"
+    write_binary_dataset(data, path)
+
+    assert is_binary_dataset(path)
+    assert path.stat().st_size == TAILLE_ENTETE + 2 * 3 * 8
+    mapped = MappedDataset(path)
+    assert mapped == data
+    assert mapped.bounds() == (10.0, 30.0, 80.0, 100.0)
+    assert mapped.km.format == "d" and mapped.km.readonly
+    assert list(mapped.price) == [100.0, 80.0, 90.0]
+
+
+def test_mapped_dataset_closes(tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    write_binary_dataset(Dataset([1.0, 2.0], [3.0, 4.0]), path)
+
+    with MappedDataset(path) as mapped:
+        assert list(mapped) == [(1.0, 3.0), (2.0, 4.0)]
+    assert mapped._carte.closed
+    with pytest.raises(ValueError):
+        mapped.km[0]
+    mapped.close()  # idempotent
+
+    # Les conteneurs en mémoire acceptent le même usage
+    with load_dataset(_csv(tmp_path)) as donnees:
+        assert len(donnees) == 3
+
+
+def test_loaders_open_binary_files(tmp_path: Path) -> None:
+    csv_path = _csv(tmp_path)
+    bin_path = tmp_path / "data.bin"
+    write_binary_dataset(load_dataset(csv_path), bin_path)
+
+    assert not is_binary_dataset(csv_path)
+    assert read_data(bin_path) == read_data(csv_path)
+    assert list(iter_data(bin_path)) == read_data(csv_path)
+    assert isinstance(load_dataset(bin_path), MappedDataset)
+
+
+def test_binary_errors(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="no data rows found"):
+        write_binary_dataset(Dataset(), tmp_path / "empty.bin")
+
+    path = tmp_path / "data.bin"
+    write_binary_dataset(Dataset([1.0], [2.0]), path)
+    brut = path.read_bytes()
+
+    path.write_bytes(brut[:-1])
+    with pytest.raises(ValueError, match="truncated binary dataset"):
+        MappedDataset(path)
+
+    path.write_bytes(brut[: len(MAGIC)])
+    with pytest.raises(ValueError, match="invalid binary dataset"):
+        MappedDataset(path)
+
+    path.write_bytes(brut[: len(MAGIC)] + struct.pack("<I", 99) + brut[12:])
+    with pytest.raises(ValueError, match="unsupported binary dataset version: 99"):
+        load_dataset(path)
+
+
+def test_convert_cli(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    csv_path = _csv(tmp_path)
+    bin_path = tmp_path / "data.bin"
+    assert convert_main([str(csv_path), str(bin_path)]) == 0
+    assert MappedDataset(bin_path) == read_data(csv_path)
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text("km,price\n-1,100\n")
+    assert convert_main([str(bad), str(tmp_path / "bad.bin")]) == 2
+    assert "ERROR:" in capsys.readouterr().out
+
+    assert convert_main([str(csv_path), str(tmp_path / "missing" / "out.bin")]) == 2
+    assert "ERROR: cannot write binary dataset" in capsys.readouterr().out
+
+
+def _projections(monkeypatch: pytest.MonkeyPatch) -> list[MappedDataset]:
+    ouvertes: list[MappedDataset] = []
+    init = MappedDataset.__init__
+
+    def espion(self: MappedDataset, path: str | Path) -> None:
+        init(self, path)
+        ouvertes.append(self)
+
+    monkeypatch.setattr(MappedDataset, "__init__", espion)
+    return ouvertes
+
+
+def test_cli_close_mapped_datasets(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    bin_path = tmp_path / "data.bin"
+    assert convert_main([str(_csv(tmp_path)), str(bin_path)]) == 0
+    ouvertes = _projections(monkeypatch)
+
+    theta = tmp_path / "theta.json"
+    assert train_main(["--data", str(bin_path), "--theta", str(theta)]) == 0
+    assert convert_main([str(bin_path), str(tmp_path / "copy.bin")]) == 0
+
+    assert len(ouvertes) == 2
+    assert all(mapped._carte.closed for mapped in ouvertes)
+
+
+def test_train_from_binary_matches_csv(tmp_path: Path) -> None:
+    csv_path = _csv(tmp_path)
+    bin_path = tmp_path / "data.bin"
+    assert convert_main([str(csv_path), str(bin_path)]) == 0
+
+    for extra in ([], ["--solver", "ols"]):
+        thetas = []
+        for data in (csv_path, bin_path):
+            theta = tmp_path / f"theta_{data.suffix[1:]}.json"
+            args = ["--data", str(data), "--iters", "50", "--theta", str(theta)]
+            assert train_main(args + extra) == 0
+            thetas.append(json.loads(theta.read_text()))
+        assert thetas[0] == thetas[1]
@@ -101,7 +101,13 @@ def test_train_parser_definition() -> None:
     actions = {a.dest: a for a in parser._actions}
     assert actions["data"].option_strings == ["--data"]
     assert actions["data"].help == "path to training data CSV"
-    assert actions["data"].required is True
+    # --data ou --update (nouvelles lignes seulement) : exactement un des deux
+    assert actions["data"].required is False
+    assert actions["update"].option_strings == ["--update"]
+    with pytest.raises(SystemExit):
+        parser.parse_args([])
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--data", "d", "--update", "n"])
     # Doit au minimum exposer --alpha, tolère des alias additionnels
     assert "--alpha" in actions["alpha"].option_strings
     help_text = actions["alpha"].help or ""
@@ -122,6 +128,7 @@ def test_train_parser_definition() -> None:
     assert args.alpha == pytest.approx(0.1)
     assert args.iters == 1000
     assert args.theta == "theta.json"
+    assert args.engine == "loop"
 
     args2 = parser.parse_args(
         ["--data", "d", "--alpha", "0.5", "--iters", "10", "--theta", "t.json"]
@@ -148,6 +155,9 @@ def test_train_parser_definition() -> None:
         parser.parse_args(["--data", "d", "--iters", "-1"])
     with pytest.raises(SystemExit):
         parser.parse_args(["--alpha", "0.1", "--iters", "10"])
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--data", "d", "--engine", "bogus"])
+    assert parser.parse_args(["--data", "d", "--engine", "stats"]).engine == "stats"
 
 
 def test_train_parser_aliases() -> None:
@@ -0,0 +1,57 @@
+from array import array
+from pathlib import Path
+
+import pytest
+
+from train.dataset import Dataset
+from train.train import gradient_descent, load_dataset, read_data
+
+
+def test_dataset_behaves_like_list_of_pairs() -> None:
+    rows = [(1.0, 10.0), (2.0, 20.0), (3.0, 30.0)]
+    data = Dataset.from_rows(rows)
+    assert len(data) == 3
+    assert list(data) == rows
+    assert data == rows
+    assert data[1] == (2.0, 20.0)
+    assert data[-1] == (3.0, 30.0)
+    assert data[1:] == rows[1:]
+    assert isinstance(data[1:], Dataset)
+    assert (2.0, 20.0) in data
+    assert data != 3
+    assert repr(data) == "Dataset(<3 rows>)"
+
+
+def test_dataset_columns_and_views() -> None:
+    data = Dataset([1.0, 2.0], [3.0, 4.0])
+    assert isinstance(data.km, array) and data.km.typecode == "d"
+    km_view, price_view = data.columns()
+    assert km_view.format == "d" and km_view.nbytes == 16
+    assert price_view.tolist() == [3.0, 4.0]
+    km_view.release()
+    price_view.release()
+    data.append(5.0, 6.0)
+    assert data.km.tolist() == [1.0, 2.0, 5.0]
+    with pytest.raises(TypeError):
+        hash(data)
+
+
+def test_dataset_rejects_mismatched_columns() -> None:
+    with pytest.raises(ValueError, match="same length"):
+        Dataset([1.0], [])
+
+
+def test_dataset_is_a_context_manager() -> None:
+    donnees = Dataset([1.0], [2.0])
+    with donnees as ouvert:
+        assert ouvert is donnees
+    # close() ne libère rien en mémoire : les colonnes restent lisibles
+    assert list(donnees) == [(1.0, 2.0)]
+
+
+def test_load_dataset_and_gradient_descent(tmp_path: Path) -> None:
+    path = tmp_path / "data.csv"
+    path.write_text("km,price\n0,0\n1,1\n")
+    data = load_dataset(path)
+    assert data == read_data(path)
+    assert gradient_descent(data, 0.1, 2) == gradient_descent(read_data(path), 0.1, 2)
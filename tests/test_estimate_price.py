@@ -1,5 +1,6 @@
 import sys
 from pathlib import Path
+from typing import Any
 
 import pytest
 
@@ -14,3 +15,91 @@ def test_estimate_price_returns_linear_combination() -> None:
     theta0, theta1, x = 1.5, 2.0, 3.0
     expected = theta0 + theta1 * x
     assert estimate_price(x, theta0, theta1) == pytest.approx(expected)
+
+
+def test_estimate_prices_matches_scalar_on_every_input_type() -> None:
+    from array import array
+
+    from linear_regression import estimate_prices
+
+    xs = [0.0, 1.5, 1e6, 3]
+    expected = [estimate_price(x, 2.0, -0.5) for x in xs]
+    colonne = array("d", xs)
+    for source in (xs, colonne, memoryview(colonne), iter(xs)):
+        resultat = estimate_prices(source, 2.0, -0.5)
+        assert isinstance(resultat, array) and resultat.tolist() == expected
+
+
+def test_estimate_prices_fills_preallocated_buffers() -> None:
+    from array import array
+
+    from linear_regression import estimate_prices
+
+    tampon = array("d", bytes(16))
+    vue = memoryview(tampon)
+    assert estimate_prices([1.0, 2.0], 1.0, 2.0, out=vue) is vue
+    assert tampon.tolist() == [3.0, 5.0]
+    del vue
+
+    liste = [0.0, 0.0]
+    assert estimate_prices([1.0, 2.0], 1.0, 2.0, out=liste) is liste
+    assert liste == [3.0, 5.0]
+
+    with pytest.raises(ValueError, match="same length"):
+        estimate_prices([1.0], 1.0, 2.0, out=tampon)
+
+
+def test_estimate_prices_numpy() -> None:
+    from linear_regression import estimate_prices
+
+    np = pytest.importorskip("numpy")
+    xs = np.array([1.0, 2.0, 3.0])
+    out = np.empty(3)
+    assert estimate_prices(xs, 1.0, 2.0, out=out) is out
+    assert out.tolist() == [3.0, 5.0, 7.0]
+    assert estimate_prices(xs, 1.0, 2.0).tolist() == [3.0, 5.0, 7.0]
+
+
+@pytest.mark.parametrize("numpy_xs", [False, True])
+@pytest.mark.parametrize("kind", ["array", "memoryview", "list", "ndarray"])
+def test_estimate_prices_fills_every_documented_out_type(
+    kind: str, numpy_xs: bool
+) -> None:
+    from array import array
+
+    from linear_regression import estimate_prices
+
+    np = pytest.importorskip("numpy")
+    xs = np.array([1.0, 2.0, 3.0]) if numpy_xs else [1.0, 2.0, 3.0]
+    tampon = array("d", bytes(24))
+    out: Any = {
+        "array": tampon,
+        "memoryview": memoryview(tampon),
+        "list": [0.0, 0.0, 0.0],
+        "ndarray": np.zeros(3),
+    }[kind]
+
+    # Rempli sur place et renvoyé tel quel, quel que soit le chemin
+    assert estimate_prices(xs, 1.0, 2.0, out=out) is out
+    assert list(out) == [3.0, 5.0, 7.0]
+    if kind in ("array", "memoryview"):
+        assert tampon.tolist() == [3.0, 5.0, 7.0]
+
+    with pytest.raises(ValueError, match="same length"):
+        estimate_prices(xs[:2], 1.0, 2.0, out=out)
+
+
+def test_estimate_prices_rejects_bad_buffers() -> None:
+    from array import array
+
+    from linear_regression import estimate_prices
+
+    np = pytest.importorskip("numpy")
+    with pytest.raises(TypeError, match="buffer of doubles"):
+        estimate_prices(np.array([1.0]), 1.0, 2.0, out=array("i", [0]))
+
+    # Un itérateur trop long ou trop court est refusé sans débordement
+    with pytest.raises(ValueError, match="same length"):
+        estimate_prices(iter([1.0, 2.0, 3.0]), 1.0, 2.0, out=[0.0, 0.0])
+    with pytest.raises(ValueError, match="same length"):
+        estimate_prices(iter([1.0]), 1.0, 2.0, out=[0.0, 0.0])
@@ -1,9 +1,21 @@
 import json
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
 
-from train.train import gradient_descent, save_theta
+from train.train import (
+    accumulate_moments,
+    fit_ols,
+    gradient_descent,
+    gradient_descent_minibatch,
+    gradient_descent_report,
+    gradient_descent_stats,
+    gradient_descent_stats_report,
+    gradient_descent_sweep,
+    save_theta,
+    sufficient_stats,
+)
 
 
 def test_gradient_descent_and_save(tmp_path: Path) -> None:
@@ -49,3 +61,156 @@ def test_save_theta_omits_none_bounds(tmp_path: Path) -> None:
         "theta1": pytest.approx(2.0),
         "min_km": pytest.approx(0.0),
     }
+
+
+def test_sufficient_stats() -> None:
+    data = [(1.0, 2.0), (3.0, 5.0)]
+    assert sufficient_stats(data) == (2.0, 4.0, 7.0, 10.0, 17.0, 29.0)
+    assert sufficient_stats(iter(data)) == sufficient_stats(data)
+
+
+def test_gradient_descent_stats_matches_loop() -> None:
+    data = [(0.0, 1.0), (0.25, 0.8), (0.5, 0.55), (1.0, 0.0)]
+    expected = gradient_descent(data, taux_apprentissage=0.3, nb_iterations=500)
+    theta0, theta1 = gradient_descent_stats(
+        sufficient_stats(data), taux_apprentissage=0.3, nb_iterations=500
+    )
+    assert theta0 == pytest.approx(expected[0], rel=1e-9)
+    assert theta1 == pytest.approx(expected[1], rel=1e-9)
+
+
+def test_accumulate_moments_and_fit_ols() -> None:
+    data = [(1.0, 3.0), (2.0, 5.0), (4.0, 9.0)]
+    moments = accumulate_moments(iter(data))
+    assert moments.n == 3
+    assert moments.mean_km == pytest.approx(7.0 / 3.0)
+    assert moments.mean_price == pytest.approx(17.0 / 3.0)
+    assert moments.m2_km == pytest.approx(14.0 / 3.0)
+    assert moments.c_km_price == pytest.approx(28.0 / 3.0)
+    assert (moments.min_km, moments.max_km) == (1.0, 4.0)
+    assert (moments.min_price, moments.max_price) == (3.0, 9.0)
+    theta0, theta1 = fit_ols(moments)
+    assert theta0 == pytest.approx(1.0)
+    assert theta1 == pytest.approx(2.0)
+
+
+def test_fit_ols_is_stable_for_large_offsets() -> None:
+    data = [(1e9 + x, 1e9 + 3.0 * x) for x in (0.0, 1.0, 2.0, 3.0)]
+    theta0, theta1 = fit_ols(accumulate_moments(data))
+    assert theta1 == pytest.approx(3.0, rel=1e-9)
+    assert theta0 == pytest.approx(-2e9, rel=1e-9)
+
+
+def test_fit_ols_constant_km() -> None:
+    theta0, theta1 = fit_ols(accumulate_moments([(5.0, 1.0), (5.0, 3.0)]))
+    assert theta0 == pytest.approx(2.0)
+    assert theta1 == 0.0
+
+
+def test_gradient_descent_report_without_tolerance_runs_all_iterations() -> None:
+    data = [(0.0, 0.0), (1.0, 1.0)]
+    result = gradient_descent_report(data, 0.1, 2)
+    assert result.iterations == 2
+    assert (result.theta0, result.theta1) == gradient_descent(data, 0.1, 2)
+    # J = (1/2m)·Σ(θ0 + θ1·x - y)² at the returned coefficients
+    expected = ((0.0925) ** 2 + (0.0925 + 0.095 - 1.0) ** 2) / 4
+    assert result.cost == pytest.approx(expected)
+
+
+def test_gradient_descent_reports_stop_early_and_agree() -> None:
+    data = [(0.0, 1.0), (0.5, 0.4), (1.0, 0.0)]
+    stats = sufficient_stats(data)
+    for grad, cost, step in ((1e-8, 0.0, 0.0), (0.0, 1e-12, 0.0), (0.0, 0.0, 1e-9)):
+        loop = gradient_descent_report(
+            data, 0.5, 100_000, tol_grad=grad, tol_cost=cost, tol_step=step
+        )
+        fast = gradient_descent_stats_report(
+            stats, 0.5, 100_000, tol_grad=grad, tol_cost=cost, tol_step=step
+        )
+        assert 0 < loop.iterations < 100_000
+        assert fast.iterations == pytest.approx(loop.iterations, abs=1)
+        assert fast.theta1 == pytest.approx(loop.theta1, rel=1e-6)
+        assert fast.cost == pytest.approx(loop.cost, rel=1e-6)
+
+
+def test_save_theta_records_iterations_and_cost(tmp_path: Path) -> None:
+    path = tmp_path / "theta.json"
+    save_theta(1.0, 2.0, path, iterations=42, cost=0.5)
+    assert json.loads(path.read_text()) == {
+        "theta0": 1.0,
+        "theta1": 2.0,
+        "iterations": 42,
+        "cost": 0.5,
+    }
+
+
+def test_gradient_descent_minibatch_full_batch_matches_loop() -> None:
+    data = [(i / 9, (9 - i) / 9) for i in range(10)]
+    attendu = gradient_descent_report(data, 0.5, 40)
+    # Un lot = tout le dataset : 40 époques = 40 itérations de la descente complète
+    resultat = gradient_descent_minibatch(lambda: iter(data), 0.5, 10, 40)
+    assert resultat.iterations == 40
+    assert resultat.theta0 == pytest.approx(attendu.theta0, rel=1e-12)
+    assert resultat.theta1 == pytest.approx(attendu.theta1, rel=1e-12)
+    assert resultat.cost == pytest.approx(attendu.cost, rel=1e-12)
+
+
+def test_gradient_descent_minibatch_converges_with_shuffle() -> None:
+    data = [(i / 999, 0.2 + 0.5 * i / 999) for i in range(1000)]
+    lectures: list[int] = []
+
+    def source() -> list[tuple[float, float]]:
+        lectures.append(1)
+        return data
+
+    resultat = gradient_descent_minibatch(
+        source, 0.5, 32, 30, shuffle_buffer=100, seed=3
+    )
+    # 32 lots par époque (le dernier incomplet), une lecture par époque + coût
+    assert resultat.iterations == 30 * 32
+    assert len(lectures) == 31
+    assert resultat.theta0 == pytest.approx(0.2, abs=1e-3)
+    assert resultat.theta1 == pytest.approx(0.5, abs=1e-3)
+    assert resultat.cost < 1e-6
+    with pytest.raises(ValueError, match="no data rows found"):
+        gradient_descent_minibatch(list, 0.5, 32, 1)
+
+
+def test_gradient_descent_sweep_matches_individual_runs() -> None:
+    data = [(0.0, 1.0), (0.25, 0.8), (0.5, 0.55), (1.0, 0.0)]
+    stats = sufficient_stats(data)
+    alphas, iters = [0.05, 0.5, 1.0], [1000, 3, 50]
+    resultats = gradient_descent_sweep(stats, alphas, iters)
+    assert len(resultats) == 9
+    for indice, resultat in enumerate(resultats):
+        alpha, nb = alphas[indice // 3], iters[indice % 3]
+        assert resultat == gradient_descent_stats_report(stats, alpha, nb)
+
+
+class _Comptee(list[tuple[float, float]]):
+    """Liste qui compte ses parcours complets."""
+
+    parcours = 0
+
+    def __iter__(self) -> Iterator[tuple[float, float]]:
+        self.parcours += 1
+        return super().__iter__()
+
+
+def test_descent_skips_final_cost_pass_when_unused() -> None:
+    # Chaque évaluation des sommes parcourt la liste deux fois
+    data = _Comptee([(0.0, 1.0), (0.5, 0.4), (1.0, 0.0)])
+    gradient_descent(data, 0.5, 3)
+    assert data.parcours == 2 * 3
+
+    # Le rapport a besoin du coût : un seul parcours de plus
+    data.parcours = 0
+    resultat = gradient_descent_report(data, 0.5, 3)
+    assert data.parcours == 2 * 4
+
+    # Arrêt sur le coût : le coût du dernier tour est réutilisé
+    data.parcours = 0
+    resultat = gradient_descent_report(data, 0.5, 100_000, tol_cost=1e-12)
+    assert data.parcours == 2 * (resultat.iterations + 1)
+    attendu = sum((resultat.theta0 + resultat.theta1 * x - y) ** 2 for x, y in data)
+    assert resultat.cost == pytest.approx(attendu / 6)
@@ -103,3 +103,375 @@ def test_train_main_learns_line(tmp_path: Path) -> None:
     result = json.loads(theta.read_text())
     assert result["theta0"] == pytest.approx(0.0, abs=1e-2)
     assert result["theta1"] == pytest.approx(1.0, abs=1e-2)
+
+
+def test_train_main_stats_engine_matches_loop(tmp_path: Path) -> None:
+    data = tmp_path / "data.csv"
+    data.write_text("km,price\n10,90\n20,70\n40,45\n80,5\n")
+    results = []
+    for engine in ("loop", "stats"):
+        theta = tmp_path / f"theta_{engine}.json"
+        args = ["--data", str(data), "--iters", "200", "--theta", str(theta)]
+        assert train_main([*args, "--engine", engine]) == 0
+        results.append(json.loads(theta.read_text()))
+    loop, stats = results
+    assert stats.keys() == loop.keys()
+    for key, value in loop.items():
+        assert stats[key] == pytest.approx(value, rel=1e-9)
+
+
+def test_train_main_ols_solver(tmp_path: Path) -> None:
+    data = tmp_path / "data.csv"
+    data.write_text("km,price\n0,10\n10,8\n20,6\n")
+    theta = tmp_path / "theta.json"
+    args = ["--data", str(data), "--theta", str(theta), "--solver", "ols"]
+    assert train_main(args) == 0
+    assert json.loads(theta.read_text()) == {
+        "theta0": pytest.approx(10.0),
+        "theta1": pytest.approx(-0.2),
+        "min_km": pytest.approx(0.0),
+        "max_km": pytest.approx(20.0),
+        "min_price": pytest.approx(6.0),
+        "max_price": pytest.approx(10.0),
+        "cost": pytest.approx(0.0, abs=1e-12),
+    }
+
+
+def test_train_main_streaming_modes_report_errors(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    data = tmp_path / "data.csv"
+    data.write_text("km,price\n1,2\n2,abc\n")
+    for extra in (["--solver", "ols"], ["--engine", "stats"]):
+        assert train_main(["--data", str(data), *extra]) == 2
+        assert "ERROR: invalid row 3: non-numeric value" in capsys.readouterr().out
+
+
+def test_predict_main_batch(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    import io
+
+    theta = tmp_path / "theta.json"
+    theta.write_text(json.dumps({"theta0": 1.0, "theta1": 2.0}))
+    source = tmp_path / "in.csv"
+    source.write_text("km\n1\n2\n")
+    output = tmp_path / "out.csv"
+    args = ["--batch", str(source), "--output", str(output), "--theta", str(theta)]
+    assert predict_main(args) == 0
+    assert output.read_text() == "km,price\n1,3.00\n2,5.00\n"
+
+    monkeypatch.setattr("sys.stdin", io.StringIO("3\n"))
+    assert predict_main(["--batch", "-", "--theta", str(theta)]) == 0
+    assert capsys.readouterr().out == "km,price\n3,7.00\n"
+
+    assert predict_main(["--batch", str(tmp_path / "nope.csv")]) == 2
+    assert predict_main(["--batch", str(source), "12"]) == 2
+    # Une ligne invalide après plusieurs paquets déjà écrits ne touche
+    # pas la sortie existante et ne laisse aucun fichier temporaire
+    source.write_text("km\n" + "1\n" * 20000 + "-5\n")
+    assert predict_main(args) == 2
+    assert "negative km" in capsys.readouterr().err
+    assert output.read_text() == "km,price\n1,3.00\n2,5.00\n"
+    nouvelle = tmp_path / "new.csv"
+    assert predict_main([*args[:2], "--output", str(nouvelle), *args[4:]]) == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "in.csv",
+        "out.csv",
+        "theta.json",
+    ]
+
+
+def test_predict_main_returns_usage_exit_codes(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    # Usage argparse et --help : code renvoyé, jamais de SystemExit
+    assert predict_main(["abc"]) == 2
+    assert predict_main(["--help"]) == 0
+    capsys.readouterr()
+
+    source = tmp_path / "in.csv"
+    source.write_text("km\n1\n")
+    assert predict_main(["--batch", str(source), "--bogus"]) == 2
+    erreurs = capsys.readouterr().err
+    assert "unrecognized arguments: --bogus" in erreurs
+    assert "mileage" not in erreurs
+    assert predict_main(["--batch", str(source), "12"]) == 2
+    assert "does not take a mileage argument" in capsys.readouterr().err
+
+
+def test_train_main_early_stopping_records_iterations(tmp_path: Path) -> None:
+    data = tmp_path / "data.csv"
+    data.write_text("km,price\n10,90\n20,70\n40,45\n80,5\n")
+    full = tmp_path / "full.json"
+    base = ["--data", str(data), "--alpha", "0.5", "--iters", "5000"]
+    assert train_main([*base, "--theta", str(full)]) == 0
+    reference = json.loads(full.read_text())
+    assert reference["iterations"] == 5000
+
+    for engine in ("loop", "stats"):
+        for flag in ("--tol-grad", "--tol-cost", "--tol-step"):
+            theta = tmp_path / f"{engine}{flag}.json"
+            args = [*base, "--engine", engine, "--theta", str(theta), flag, "1e-9"]
+            assert train_main(args) == 0
+            result = json.loads(theta.read_text())
+            assert 0 < result["iterations"] < 5000
+            assert result["theta1"] == pytest.approx(reference["theta1"], rel=1e-4)
+            assert result["cost"] == pytest.approx(reference["cost"], rel=1e-4)
+
+
+def test_train_main_rejects_negative_tolerance() -> None:
+    with pytest.raises(SystemExit):
+        train_main(["--data", "x.csv", "--tol-grad", "-1"])
+
+
+def test_train_main_minibatch_mode(tmp_path: Path) -> None:
+    from train.binary import write_binary_dataset
+    from train.train import load_dataset
+
+    data = tmp_path / "data.csv"
+    data.write_text(
+        "km,price\n" + "".join(f"{1000 * i},{9000 - 20 * i}\n" for i in range(300))
+    )
+    binaire = tmp_path / "data.bin"
+    write_binary_dataset(load_dataset(data), binaire)
+
+    resultats = []
+    for source in (data, binaire):
+        theta = tmp_path / f"theta_{source.suffix[1:]}.json"
+        args = ["--data", str(source), "--theta", str(theta), "--batch-size", "16"]
+        args += ["--epochs", "40", "--shuffle-buffer", "64", "--alpha", "0.5"]
+        assert train_main(args) == 0
+        resultats.append(json.loads(theta.read_text()))
+
+    csv_theta, bin_theta = resultats
+    assert csv_theta == pytest.approx(bin_theta)
+    assert csv_theta["iterations"] == 40 * 19
+    assert csv_theta["max_km"] == 299000 and csv_theta["min_price"] == 3020
+    assert csv_theta["theta0"] == pytest.approx(9000, rel=1e-3)
+    assert csv_theta["theta1"] == pytest.approx(-0.02, rel=1e-2)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        ["--epochs", "3"],
+        ["--shuffle-buffer", "10"],
+        ["--batch-size", "8", "--solver", "ols"],
+        ["--batch-size", "8", "--engine", "stats"],
+        ["--batch-size", "8", "--tol-grad", "0.1"],
+        ["--batch-size", "8", "--tol-cost", "0.1"],
+        ["--batch-size", "8", "--tol-step", "0.1"],
+        ["--batch-size", "0"],
+    ],
+)
+def test_train_main_minibatch_usage_errors(options: list[str]) -> None:
+    with pytest.raises(SystemExit) as exc:
+        train_main(["--data", "data.csv", *options])
+    assert exc.value.code == 2
+
+
+def test_train_main_minibatch_reports_data_errors(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    data = tmp_path / "data.csv"
+    data.write_text("km,price\n1,2\nx,3\n")
+    assert train_main(["--data", str(data), "--batch-size", "4"]) == 2
+    assert capsys.readouterr().out == "ERROR: invalid row 3: non-numeric value\n"
+
+
+def _csv(path: Path, lignes: list[tuple[int, int]]) -> Path:
+    path.write_text("km,price\n" + "".join(f"{km},{p}\n" for km, p in lignes))
+    return path
+
+
+@pytest.mark.parametrize("solver", ["ols", "gd"])
+def test_train_main_update_matches_full_retrain(tmp_path: Path, solver: str) -> None:
+    historique = [(1000 * i, 9000 - 17 * i + (i * 7) % 13) for i in range(200)]
+    nouvelles = [(150000 + 900 * i, 4000 + (i * 5) % 11) for i in range(30)]
+    ancien = _csv(tmp_path / "old.csv", historique)
+    delta = _csv(tmp_path / "new.csv", nouvelles)
+    complet = _csv(tmp_path / "all.csv", historique + nouvelles)
+    options = ["--solver", solver, "--engine", "stats", "--iters", "2000"]
+
+    incremental = tmp_path / "theta.json"
+    assert (
+        train_main(
+            [
+                "--data",
+                str(ancien),
+                "--theta",
+                str(incremental),
+                *options,
+                "--save-state",
+            ]
+        )
+        == 0
+    )
+    assert json.loads(incremental.read_text())["state"]["n"] == 200
+    assert (
+        train_main(["--update", str(delta), "--theta", str(incremental), *options]) == 0
+    )
+
+    reference = tmp_path / "reference.json"
+    assert (
+        train_main(
+            [
+                "--data",
+                str(complet),
+                "--theta",
+                str(reference),
+                *options,
+                "--save-state",
+            ]
+        )
+        == 0
+    )
+
+    obtenu = json.loads(incremental.read_text())
+    attendu = json.loads(reference.read_text())
+    assert obtenu["state"]["n"] == 230
+    for cle in ("theta0", "theta1", "min_km", "max_km", "min_price", "max_price"):
+        assert obtenu[cle] == pytest.approx(attendu[cle], rel=1e-9)
+    for cle, valeur in attendu["state"].items():
+        assert obtenu["state"][cle] == pytest.approx(valeur, rel=1e-9)
+
+
+@pytest.mark.parametrize("extra", [[], ["--batch-size", "8"]])
+def test_train_main_save_state_in_every_mode(tmp_path: Path, extra: list[str]) -> None:
+    data = _csv(tmp_path / "data.csv", [(10 * i, 100 - i) for i in range(20)])
+    theta = tmp_path / "theta.json"
+    assert (
+        train_main(["--data", str(data), "--theta", str(theta), "--save-state", *extra])
+        == 0
+    )
+    etat = json.loads(theta.read_text())["state"]
+    assert etat["n"] == 20 and etat["max_km"] == 190 and etat["mean_km"] == 95
+
+
+def test_train_main_update_requires_state(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    data = _csv(tmp_path / "data.csv", [(1, 2), (3, 4)])
+    theta = tmp_path / "theta.json"
+    assert train_main(["--update", str(data), "--theta", str(theta)]) == 2
+    assert capsys.readouterr().out.startswith("ERROR: theta file not found")
+
+    assert train_main(["--data", str(data), "--theta", str(theta)]) == 0
+    assert train_main(["--update", str(data), "--theta", str(theta)]) == 2
+    assert "no training state" in capsys.readouterr().out
+
+    theta.write_text(json.dumps({"theta0": 0, "theta1": 0, "state": {"n": 1}}))
+    assert train_main(["--update", str(data), "--theta", str(theta)]) == 2
+    assert "invalid training state" in capsys.readouterr().out
+
+    # Compte non entier, booléen ou nul : jamais tronqué ni converti
+    assert train_main(["--data", str(data), "--theta", str(theta), "--save-state"]) == 0
+    complet = json.loads(theta.read_text())
+    for n in (2.5, True, 0, -2, "2"):
+        theta.write_text(json.dumps({**complet, "state": {**complet["state"], "n": n}}))
+        assert train_main(["--update", str(data), "--theta", str(theta)]) == 2
+        assert "invalid training state" in capsys.readouterr().out
+    theta.write_text(json.dumps(complet))
+    assert train_main(["--update", str(data), "--theta", str(theta)]) == 0
+
+
+def test_normalize_theta_inverts_denormalize() -> None:
+    from train.__main__ import _denormalize, _normalize_theta
+
+    for bornes in ((10.0, 250.0, 900.0, 8000.0), (5.0, 5.0, 3.0, 3.0)):
+        theta0, theta1 = _denormalize(0.3, -0.7, bornes)
+        assert _normalize_theta(theta0, theta1, bornes) == pytest.approx((0.3, -0.7))
+
+
+@pytest.mark.parametrize("engine", ["loop", "stats"])
+def test_train_main_init_from_warm_starts(tmp_path: Path, engine: str) -> None:
+    lignes = [(1000 * i, 9000 - 25 * i + (i % 7) * 40) for i in range(200)]
+    ancien = _csv(tmp_path / "old.csv", lignes)
+    nouveau = _csv(tmp_path / "new.csv", [*lignes, (100500, 6600)])
+    modele = tmp_path / "model.json"
+    assert (
+        train_main(["--data", str(ancien), "--theta", str(modele), "--solver", "ols"])
+        == 0
+    )
+
+    resultats = {}
+    for nom, extra in (
+        ("cold", ["--tol-grad", "1e-6"]),
+        ("warm", ["--init-from", str(modele)]),
+    ):
+        theta = tmp_path / f"{nom}.json"
+        args = ["--data", str(nouveau), "--theta", str(theta), "--engine", engine]
+        assert train_main([*args, "--alpha", "1", "--iters", "100000", *extra]) == 0
+        resultats[nom] = json.loads(theta.read_text())
+
+    # Même optimum, atteint en une poignée d’itérations depuis l’ancien modèle
+    assert resultats["warm"]["iterations"] < 10 < resultats["cold"]["iterations"]
+    for cle in ("theta0", "theta1", "cost"):
+        assert resultats["warm"][cle] == pytest.approx(resultats["cold"][cle], rel=1e-4)
+
+
+def test_train_main_init_from_minibatch_runs_every_epoch(tmp_path: Path) -> None:
+    data = _csv(tmp_path / "data.csv", [(1000 * i, 9000 - 25 * i) for i in range(40)])
+    modele = tmp_path / "model.json"
+    assert (
+        train_main(["--data", str(data), "--theta", str(modele), "--solver", "ols"])
+        == 0
+    )
+
+    theta = tmp_path / "theta.json"
+    args = ["--data", str(data), "--theta", str(theta), "--init-from", str(modele)]
+    assert train_main([*args, "--batch-size", "8", "--epochs", "3"]) == 0
+    resultat = json.loads(theta.read_text())
+    depart = json.loads(modele.read_text())
+
+    # Pas de --tol-grad implicite : 3 époques de 5 lots, départ déjà optimal
+    assert resultat["iterations"] == 3 * 5
+    assert resultat["theta1"] == pytest.approx(depart["theta1"], rel=1e-6)
+
+
+def test_train_main_init_from_errors(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    data = _csv(tmp_path / "data.csv", [(1, 2), (3, 4)])
+    theta = tmp_path / "theta.json"
+    base = ["--data", str(data), "--theta", str(theta), "--init-from", str(theta)]
+    with pytest.raises(SystemExit):
+        train_main([*base, "--solver", "ols"])
+
+    for extra in ([], ["--engine", "stats"], ["--batch-size", "1"]):
+        assert train_main([*base, *extra]) == 2
+        assert capsys.readouterr().out.startswith("ERROR: theta file not found")
+
+    theta.write_text(json.dumps({"theta0": "x", "theta1": 0}))
+    assert train_main(base) == 2
+    assert "invalid coefficients" in capsys.readouterr().out
+
+
+def test_train_sweep_saves_best_configuration(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    data = _csv(tmp_path / "data.csv", [(1000 * i, 9000 - 25 * i) for i in range(50)])
+    best = tmp_path / "best.json"
+    args = ["--data", str(data), "--theta", str(best)]
+    assert train_main(["sweep", *args, "--alpha", "0.01,0.5", "--iters", "10,500"]) == 0
+    sortie = capsys.readouterr().out.splitlines()
+    assert len(sortie) == 6 and sortie[-1].startswith("best: alpha=0.5 iters=500")
+    assert sortie[4].endswith(" *")
+
+    # Le meilleur modèle est exactement celui d’un entraînement simple
+    single = tmp_path / "single.json"
+    base = ["--data", str(data), "--theta", str(single), "--engine", "stats"]
+    assert train_main([*base, "--alpha", "0.5", "--iters", "500"]) == 0
+    assert json.loads(best.read_text()) == json.loads(single.read_text())
+
+
+def test_train_sweep_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit):
+        train_main(["sweep", "--data", "x.csv", "--alpha", "0.1,2"])
+    with pytest.raises(SystemExit):
+        train_main(["sweep", "--data", "x.csv", "--iters", "10,0"])
+    assert train_main(["sweep", "--data", str(tmp_path / "missing.csv")]) == 2
+    assert capsys.readouterr().out.startswith("ERROR: data file not found")
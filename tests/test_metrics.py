@@ -6,7 +6,14 @@ import pytest
 
 sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
 
-from metrics import evaluate, read_theta  # noqa: E402
+from metrics import (  # noqa: E402
+    evaluate,
+    evaluate_metrics,
+    fused_metrics,
+    moment_metrics,
+    read_theta,
+)
+from train.train import accumulate_moments  # noqa: E402
 
 
 def test_evaluate_perfect_fit(tmp_path: Path) -> None:
@@ -50,3 +57,59 @@ def test_read_theta_invalid_values(tmp_path: Path) -> None:
     theta.write_text("{}")
     with pytest.raises(ValueError, match=f"invalid theta values in {theta}"):
         read_theta(theta)
+
+
+def test_fused_metrics_matches_multi_pass_reference() -> None:
+    import random
+    import statistics
+
+    rng = random.Random(0)
+    y_true = [1e6 + rng.gauss(0, 5) for _ in range(1000)]
+    y_pred = [y + rng.gauss(0, 2) for y in y_true]
+    metrics = fused_metrics(zip(y_true, y_pred))
+
+    residus = [y - p for y, p in zip(y_true, y_pred)]
+    ss_res = sum(r * r for r in residus)
+    ss_tot = statistics.pvariance(y_true) * len(y_true)
+    assert metrics.n == 1000
+    assert metrics.rmse == pytest.approx((ss_res / 1000) ** 0.5)
+    assert metrics.r2 == pytest.approx(1 - ss_res / ss_tot)
+    assert metrics.mae == pytest.approx(sum(map(abs, residus)) / 1000)
+    assert metrics.max_error == max(map(abs, residus))
+
+
+def test_fused_metrics_streams_and_rejects_empty() -> None:
+    metrics = fused_metrics((float(i), 0.0) for i in range(3))
+    assert (metrics.mae, metrics.max_error) == (1.0, 2.0)
+    with pytest.raises(ValueError, match="no data rows found"):
+        fused_metrics(iter([]))
+
+
+def test_evaluate_metrics_reports_all(tmp_path: Path) -> None:
+    data = tmp_path / "data.csv"
+    data.write_text("km,price\n0,0\n1,3\n")
+    theta = tmp_path / "theta.json"
+    theta.write_text(json.dumps({"theta0": 0.0, "theta1": 2.0}))
+    metrics = evaluate_metrics(data, theta)
+    assert metrics.n == 2
+    assert metrics.rmse == pytest.approx(0.5**0.5)
+    assert metrics.r2 == pytest.approx(1 - 1 / 4.5)
+    assert (metrics.mae, metrics.max_error) == (0.5, 1.0)
+    assert evaluate(data, theta) == (metrics.rmse, metrics.r2)
+
+
+@pytest.mark.parametrize("theta", [(0.0, 0.0), (8000.0, -0.02), (1.5, 3.0)])
+def test_moment_metrics_match_fused_metrics(theta: tuple[float, float]) -> None:
+    rows = [(1000.0 * i, 9000.0 - 21.0 * i + (i % 5) * 70) for i in range(100)]
+    attendu = fused_metrics((prix, theta[0] + theta[1] * km) for km, prix in rows)
+    rmse, r2 = moment_metrics(accumulate_moments(rows), *theta)
+    assert rmse == pytest.approx(attendu.rmse, rel=1e-9)
+    assert r2 == pytest.approx(attendu.r2, rel=1e-9)
+
+    # Prix constants : même garde R² = 1 ; sans ligne, même erreur
+    assert moment_metrics(accumulate_moments([(0.0, 1.0), (1.0, 1.0)]), 1, 0) == (
+        0.0,
+        1.0,
+    )
+    with pytest.raises(ValueError, match="no data rows found"):
+        moment_metrics(accumulate_moments([]), 0.0, 0.0)
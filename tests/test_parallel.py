@@ -0,0 +1,89 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from train.__main__ import main as train_main
+from train.parallel import accumulate_moments_parallel
+from train.train import (
+    InvalidRowError,
+    accumulate_moments,
+    iter_data,
+    merge_moments,
+    read_data,
+)
+
+
+def _ecrire(tmp_path: Path, lignes: list[str], fin: str = "\n") -> Path:
+    path = tmp_path / "data.csv"
+    path.write_bytes(("km,price" + fin + fin.join(lignes) + fin).encode())
+    return path
+
+
+def test_merge_moments_matches_single_pass() -> None:
+    rng = random.Random(1)
+    rows = [(rng.uniform(0, 3e5), rng.uniform(0, 1e4)) for _ in range(500)]
+    attendu = accumulate_moments(rows)
+    for coupure in (0, 1, 250, 499, 500):
+        fusion = merge_moments(
+            accumulate_moments(rows[:coupure]), accumulate_moments(rows[coupure:])
+        )
+        assert fusion.n == attendu.n
+        for champ, valeur in zip(fusion, attendu):
+            assert champ == pytest.approx(valeur, rel=1e-9)
+
+
+@pytest.mark.parametrize("fin", ["\n", "\r\n"])
+def test_parallel_moments_match_serial(tmp_path: Path, fin: str) -> None:
+    rng = random.Random(2)
+    lignes = [f"{rng.randint(0, 300000)},{rng.randint(0, 9000)}" for _ in range(300)]
+    lignes[10:10] = ["", ""]
+    path = _ecrire(tmp_path, lignes, fin)
+    attendu = accumulate_moments(iter_data(path))
+    for workers in (1, 2, 3, 7):
+        resultat = accumulate_moments_parallel(path, workers)
+        assert resultat.n == attendu.n
+        for champ, valeur in zip(resultat, attendu):
+            assert champ == pytest.approx(valeur, rel=1e-9)
+
+
+def test_parallel_errors_keep_global_line_numbers(tmp_path: Path) -> None:
+    lignes = [f"{i},{i}" for i in range(200)]
+    lignes[150] = "oops,1"
+    lignes[20:20] = [""]
+    path = _ecrire(tmp_path, lignes)
+    with pytest.raises(InvalidRowError) as attendu:
+        read_data(path)
+    with pytest.raises(InvalidRowError) as obtenu:
+        accumulate_moments_parallel(path, 4)
+    assert (
+        str(obtenu.value) == str(attendu.value) == "invalid row 152: non-numeric value"
+    )
+
+
+def test_parallel_edge_cases(tmp_path: Path) -> None:
+    path = tmp_path / "empty.csv"
+    path.write_text("km,price\n")
+    with pytest.raises(ValueError, match="no data rows found"):
+        accumulate_moments_parallel(path, 4)
+
+    with pytest.raises(ValueError, match="data file not found"):
+        accumulate_moments_parallel(tmp_path / "missing.csv", 4)
+
+    # Header that needs DictReader: read serially with identical results
+    path = tmp_path / "quoted.csv"
+    path.write_text('"km","price"\n1,2\n3,4\n')
+    assert accumulate_moments_parallel(path, 4) == accumulate_moments(iter_data(path))
+
+
+def test_train_main_workers_matches_stats_engine(tmp_path: Path) -> None:
+    path = _ecrire(tmp_path, [f"{10 * i},{1000 - 3 * i}" for i in range(100)])
+    resultats = []
+    for extra in (["--engine", "stats"], ["--workers", "3"]):
+        theta = tmp_path / "theta.json"
+        args = ["--data", str(path), "--iters", "300", "--theta", str(theta)]
+        assert train_main(args + extra) == 0
+        resultats.append(json.loads(theta.read_text()))
+    for cle, valeur in resultats[0].items():
+        assert resultats[1][cle] == pytest.approx(valeur, rel=1e-9)
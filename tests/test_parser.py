@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from train.train import read_data
+from train.train import iter_data, read_data
 
 
 def test_read_data_valid(tmp_path: Path) -> None:
@@ -82,3 +82,66 @@ def test_read_data_missing_file(tmp_path: Path) -> None:
     missing = tmp_path / "missing.csv"
     with pytest.raises(ValueError, match=f"^data file not found: {missing}$"):
         read_data(str(missing))
+
+
+def test_iter_data_streams_rows(tmp_path: Path) -> None:
+    good = tmp_path / "good.csv"
+    good.write_text("km,price\n1,2\n3,4\n")
+    rows = iter_data(good)
+    assert not isinstance(rows, list)
+    assert next(rows) == (1.0, 2.0)
+    assert list(rows) == [(3.0, 4.0)]
+
+
+@pytest.mark.parametrize(
+    "content,message",
+    [
+        ("a,b\n1,2\n", r"^invalid CSV format \(expected columns: km,price\)$"),
+        ("km,price\n", r"^no data rows found$"),
+        ("km,price\n1,2\n1,nan\n", r"^invalid row 3: NaN value$"),
+        ("km,price\n1,2\n-1,2\n", r"^invalid row 3: negative km$"),
+        ("km,price\n1\n", r"^invalid row 2: missing value$"),
+    ],
+)
+def test_iter_data_matches_read_data_errors(
+    tmp_path: Path, content: str, message: str
+) -> None:
+    bad = tmp_path / "bad.csv"
+    bad.write_text(content)
+    with pytest.raises(ValueError, match=message):
+        list(iter_data(bad))
+    with pytest.raises(ValueError, match=message):
+        read_data(bad)
+
+
+@pytest.mark.parametrize("chunk", [1, 5, 1 << 20])
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        ("km,price\n1,2\n\n3,4", [(1.0, 2.0), (3.0, 4.0)]),
+        ("km,price\r\n1,2\r\n3,4\r\n", [(1.0, 2.0), (3.0, 4.0)]),
+        ('km,price\n1,2\n"3","4"\n5,6\n', [(1.0, 2.0), (3.0, 4.0), (5.0, 6.0)]),
+        ('"km","price"\n1,2\n', [(1.0, 2.0)]),
+        ("km,price\n1,2,extra\n", [(1.0, 2.0)]),
+        ("km,price\n1,2\n\n\n3,x\n", "invalid row 3: non-numeric value"),
+        ('km,price\n1,2\n"3",\n', "invalid row 3: non-numeric value"),
+        ("km,price\n1,2\r\n-3,nan\r\n", "invalid row 3: NaN value"),
+        ("km,price\n1", "invalid row 2: missing value"),
+        ("km,price\n\n\n", "no data rows found"),
+    ],
+)
+def test_fast_parser_matches_dictreader(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    chunk: int,
+    content: str,
+    expected: list[tuple[float, float]] | str,
+) -> None:
+    monkeypatch.setattr("train.train._TAILLE_BLOC", chunk)
+    path = tmp_path / "data.csv"
+    path.write_bytes(content.encode())
+    if isinstance(expected, str):
+        with pytest.raises(ValueError, match=f"^{expected}$"):
+            read_data(path)
+    else:
+        assert read_data(path) == expected
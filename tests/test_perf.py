@@ -0,0 +1,69 @@
+import json
+from importlib.util import find_spec
+from pathlib import Path
+
+import pytest
+
+import perf
+from train.train import read_data
+
+
+def test_generate_dataset_is_reproducible(tmp_path: Path) -> None:
+    perf.generate_dataset(tmp_path / "a.csv", 250)
+    perf.generate_dataset(tmp_path / "b.csv", 250)
+    assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+    assert len(read_data(tmp_path / "a.csv")) == 250
+
+
+def test_run_suite_in_process_covers_every_case(tmp_path: Path) -> None:
+    results = perf.run_suite([200], list(perf.CASES), tmp_path, iters=2, isolate=False)
+    assert [r["case"] for r in results] == list(perf.CASES)
+    for record in results:
+        # Le cas de rendu dépend du groupe optionnel viz (matplotlib)
+        if record["case"] == "viz_residuals" and find_spec("matplotlib") is None:
+            continue
+        assert "error" not in record, record
+        assert record["rows"] == 200 and record["throughput"] > 0
+        assert record["peak_rss_bytes"] > 0
+    descent = next(r for r in results if r["case"] == "gradient_descent")
+    assert descent["units"] == 400
+    assert "gradient_descent" in perf.format_results(results)
+
+
+def test_run_suite_isolated_process(tmp_path: Path) -> None:
+    (record,) = perf.run_suite([100], ["read_data"], tmp_path)
+    assert record["case"] == "read_data" and record["seconds"] > 0
+
+
+def test_compare_flags_throughput_regressions() -> None:
+    baseline = [{"case": "read_data", "rows": 10, "throughput": 100.0}]
+    assert (
+        perf.compare(
+            [{"case": "read_data", "rows": 10, "throughput": 90.0}], baseline, 0.2
+        )
+        == []
+    )
+    (message,) = perf.compare(
+        [{"case": "read_data", "rows": 10, "throughput": 50.0}], baseline, 0.2
+    )
+    assert message.startswith("read_data @ 10 rows") and "-50%" in message
+
+
+def test_bench_main_writes_report_and_compares(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    report = tmp_path / "report.json"
+    args = ["--sizes", "1e2", "--cases", "read_data,evaluate", "--no-isolate"]
+    args += ["--work-dir", str(tmp_path), "--output", str(report)]
+    assert perf.main(args) == 0
+    data = json.loads(report.read_text())
+    assert [r["case"] for r in data["results"]] == ["read_data", "evaluate"]
+
+    for record in data["results"]:
+        record["throughput"] *= 1e9
+    report.write_text(json.dumps(data))
+    baseline = ["--baseline", str(report), "--output", str(tmp_path / "new.json")]
+    assert perf.main(args[:-2] + baseline) == 1
+    assert "REGRESSION: read_data @ 100 rows" in capsys.readouterr().out
+
+    assert perf.main(["--cases", "nope"]) == 2
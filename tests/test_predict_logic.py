@@ -148,3 +148,97 @@ def test_predict_price_partial_bounds(
     theta_path.write_text(json.dumps({"theta0": 0.0, "theta1": 1.0, "min_price": 0.0}))
     predict_price(20.0, str(theta_path))
     assert capsys.readouterr().out == ""
+
+
+def test_predict_batch_streams_and_aggregates_warnings(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    import io
+
+    from predict.predict import predict_batch
+
+    theta_path = tmp_path / "theta.json"
+    theta_path.write_text(
+        json.dumps(
+            {
+                "theta0": 100.0,
+                "theta1": -1.0,
+                "min_km": 0.0,
+                "max_km": 50.0,
+                "min_price": 50.0,
+                "max_price": 100.0,
+            }
+        )
+    )
+    source = io.StringIO("km,price\n10,0\n\n60,0\n70,0\n")
+    sink = io.StringIO()
+    summary = predict_batch(source, sink, str(theta_path))
+    assert summary == (3, 2, 2)
+    assert sink.getvalue() == "km,price\n10,90.00\n60,40.00\n70,30.00\n"
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err.splitlines() == [
+        "WARNING: 2/3 mileage values outside data range [0.0, 50.0]",
+        "WARNING: 2/3 price values outside data range [50.0, 100.0]",
+    ]
+
+
+def test_predict_batch_headerless_and_errors(tmp_path: Path) -> None:
+    import io
+
+    from predict.predict import predict_batch
+
+    missing = str(tmp_path / "missing.json")
+    sink = io.StringIO()
+    assert predict_batch(io.StringIO("5\n7\n"), sink, missing).rows == 2
+    assert sink.getvalue() == "km,price\n5,0.00\n7,0.00\n"
+
+    for text, message in [
+        ("km\n-1\n", "invalid row 2: negative km"),
+        ("km\nabc\n", "invalid row 2: non-numeric value"),
+        ("km\nnan\n", "invalid row 2: NaN value"),
+        ("price\n1\n", "expected a km column"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            predict_batch(io.StringIO(text), io.StringIO(), missing)
+
+
+def test_load_theta_cached_revalidates_and_invalidates(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import os
+
+    import predict.predict as module
+
+    theta_path = tmp_path / "theta.json"
+    theta_path.write_text(json.dumps({"theta0": 1.0, "theta1": 2.0}))
+    lectures: list[str] = []
+    original = module.load_theta
+
+    def compter(path: str) -> tuple[float | None, ...]:
+        lectures.append(path)
+        return original(path)
+
+    monkeypatch.setattr(module, "load_theta", compter)
+    module.invalidate_theta_cache()
+
+    assert module.predict_price(1.0, str(theta_path)) == pytest.approx(3.0)
+    assert module.predict_price(2.0, str(tmp_path / "." / "theta.json")) == 5.0
+    assert len(lectures) == 1
+
+    # Same size, new mtime: the stat() check triggers a reload
+    theta_path.write_text(json.dumps({"theta0": 3.0, "theta1": 2.0}))
+    os.utime(theta_path, ns=(0, 1))
+    assert module.predict_price(1.0, str(theta_path)) == pytest.approx(5.0)
+    assert len(lectures) == 2
+
+    # With a TTL the entry is trusted without stat(), until invalidated
+    theta_path.write_text(json.dumps({"theta0": 9.0, "theta1": 2.0}))
+    os.utime(theta_path, ns=(0, 1))
+    assert module.load_theta_cached(str(theta_path), ttl=60)[0] == 3.0
+    module.invalidate_theta_cache(str(theta_path))
+    assert module.load_theta_cached(str(theta_path), ttl=60)[0] == 9.0
+
+    theta_path.unlink()
+    assert module.load_theta_cached(str(theta_path))[:2] == (0.0, 0.0)
+    assert module._THETA_CACHE == {}
@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from train.__main__ import main as train_main
+from train.profiling import Profiler
+
+
+def test_profiler_records_phases_and_rates() -> None:
+    profil = Profiler()
+    with profil.phase("parse") as phase:
+        phase.rows = 1000
+    with pytest.raises(RuntimeError), profil.phase("descent"):
+        raise RuntimeError("boom")
+
+    rapport = profil.report()
+    assert [p["phase"] for p in rapport["phases"]] == ["parse", "descent"]
+    parse = rapport["phases"][0]
+    assert parse["wall_s"] >= 0 and parse["cpu_s"] >= 0
+    assert parse["rows"] == 1000 and parse["iterations"] is None
+    assert parse["iterations_per_s"] is None
+    if parse["wall_s"] > 0:
+        assert parse["rows_per_s"] == pytest.approx(1000 / parse["wall_s"])
+    assert rapport["peak_memory_bytes"] > 0
+    # Pic du processus rapporté une seule fois, pas par phase
+    assert all("peak_memory_bytes" not in p for p in rapport["phases"])
+    assert rapport["total_wall_s"] == pytest.approx(
+        sum(p["wall_s"] for p in rapport["phases"])
+    )
+
+
+@pytest.mark.parametrize(
+    "extra, phases",
+    [
+        ([], ["parse", "normalize", "descent", "save"]),
+        (["--engine", "stats"], ["parse", "normalize", "descent", "save"]),
+        (["--solver", "ols"], ["parse", "solve", "save"]),
+    ],
+)
+def test_train_main_profile_json(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    extra: list[str],
+    phases: list[str],
+) -> None:
+    data = tmp_path / "data.csv"
+    data.write_text("km,price\n" + "".join(f"{i},{100 - i}\n" for i in range(50)))
+    sortie = tmp_path / "profile.json"
+    args = ["--data", str(data), "--iters", "20", "--theta", str(tmp_path / "t.json")]
+    assert train_main(args + ["--profile-json", str(sortie), *extra]) == 0
+
+    rapport = json.loads(sortie.read_text())
+    assert [p["phase"] for p in rapport["phases"]] == phases
+    assert rapport["phases"][0]["rows"] == 50
+    if "descent" in phases:
+        assert rapport["phases"][phases.index("descent")]["iterations"] == 20
+    texte = capsys.readouterr().out
+    assert texte.startswith("phase") and "total" in texte
+    assert texte.splitlines()[-1].startswith("peak memory: ")
+
+
+def test_train_main_without_profile_prints_nothing(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    data = tmp_path / "data.csv"
+    data.write_text("km,price\n1,2\n3,4\n")
+    args = ["--data", str(data), "--theta", str(tmp_path / "t.json"), "--profile"]
+    assert train_main(args[:-1]) == 0
+    assert capsys.readouterr().out == ""
+    # Un échec n’affiche que l’erreur, jamais un rapport partiel
+    assert train_main(["--data", str(tmp_path / "missing.csv"), "--profile"]) == 2
+    assert capsys.readouterr().out.startswith("ERROR:")
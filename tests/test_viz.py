@@ -1,4 +1,6 @@
 import json
+import os
+import subprocess
 import sys
 from pathlib import Path
 from typing import Any, Iterable
@@ -14,6 +16,7 @@ sys.path.append(str(ROOT / "src"))
 
 import viz  # noqa: E402
 from linear_regression import estimate_price  # noqa: E402
+from train.train import load_dataset  # noqa: E402
 
 
 def test_line_points() -> None:
@@ -33,7 +36,7 @@ def test_main_plots(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
         "scatter": False,
         "plot_rl": None,
         "show": False,
-        "eval": None,
+        "loads": 0,
         "suptitle": None,
         "vlines": 0,
         "axhlines": [],
@@ -55,9 +58,9 @@ def test_main_plots(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     ) -> None:
         calls["plot_rl"] = show_eq
 
-    def fake_eval(data_path: str, theta_path: str) -> tuple[float, float]:
-        calls["eval"] = (data_path, theta_path)
-        return 0.0, 1.0
+    def counting_load(path: Path) -> Any:
+        calls["loads"] += 1
+        return load_dataset(path)
 
     def fake_suptitle(text: str) -> None:
         calls["suptitle"] = text
@@ -85,7 +88,7 @@ def test_main_plots(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     monkeypatch.setattr(plt, "axhline", fake_axhline)
     monkeypatch.setattr(plt, "fill_between", fake_fill_between)
     monkeypatch.setattr(viz, "plot_regression_line", fake_plot_reg_line)
-    monkeypatch.setattr(viz, "evaluate", fake_eval)
+    monkeypatch.setattr(viz, "load_dataset", counting_load)
 
     data = tmp_path / "data.csv"
     data.write_text("km,price\n0,1\n1,1\n2,1\n")
@@ -97,7 +100,7 @@ def test_main_plots(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
         "scatter": True,
         "plot_rl": True,
         "show": True,
-        "eval": (str(data), str(theta)),
+        "loads": 1,
         "suptitle": "RMSE: 0.00, R2: 1.00",
         "vlines": 0,
         "axhlines": [(1.0, "moyenne(prix)")],
@@ -109,7 +112,7 @@ def test_main_plots(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
             "scatter": False,
             "plot_rl": None,
             "show": False,
-            "eval": None,
+            "loads": 0,
             "suptitle": None,
             "vlines": 0,
             "axhlines": [],
@@ -123,7 +126,7 @@ def test_main_plots(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
         "scatter": True,
         "plot_rl": False,
         "show": True,
-        "eval": (str(data), str(theta)),
+        "loads": 1,
         "suptitle": "RMSE: 0.00, R2: 1.00",
         "vlines": 0,
         "axhlines": [(1.0, "moyenne(prix)")],
@@ -135,7 +138,7 @@ def test_main_plots(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
             "scatter": False,
             "plot_rl": None,
             "show": False,
-            "eval": None,
+            "loads": 0,
             "suptitle": None,
             "vlines": 0,
             "axhlines": [],
@@ -155,9 +158,9 @@ def test_main_plots(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
         "scatter": True,
         "plot_rl": True,
         "show": True,
-        "eval": (str(data), str(theta)),
+        "loads": 1,
         "suptitle": "RMSE: 0.00, R2: 1.00",
-        "vlines": 3,
+        "vlines": 1,
         "axhlines": [(1.0, "moyenne(prix)")],
         "fill_between": 0,
     }
@@ -167,7 +170,7 @@ def test_main_plots(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
             "scatter": False,
             "plot_rl": None,
             "show": False,
-            "eval": None,
+            "loads": 0,
             "suptitle": None,
             "vlines": 0,
             "axhlines": [],
@@ -187,7 +190,7 @@ def test_main_plots(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
         "scatter": True,
         "plot_rl": True,
         "show": True,
-        "eval": (str(data), str(theta)),
+        "loads": 1,
         "suptitle": "RMSE: 0.00, R2: 1.00",
         "vlines": 0,
         "axhlines": [(1.0, "moyenne(prix)"), (1.0, "mediane(prix)")],
@@ -199,7 +202,7 @@ def test_main_plots(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
             "scatter": False,
             "plot_rl": None,
             "show": False,
-            "eval": None,
+            "loads": 0,
             "suptitle": None,
             "vlines": 0,
             "axhlines": [],
@@ -219,7 +222,7 @@ def test_main_plots(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
         "scatter": True,
         "plot_rl": True,
         "show": True,
-        "eval": (str(data), str(theta)),
+        "loads": 1,
         "suptitle": "RMSE: 0.00, R2: 1.00",
         "vlines": 0,
         "axhlines": [(1.0, "moyenne(prix)")],
@@ -272,7 +275,6 @@ def test_highlight_outliers(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) ->
     monkeypatch.setattr(plt, "suptitle", lambda *a, **k: None)
     monkeypatch.setattr(plt, "axhline", lambda *a, **k: None)
     monkeypatch.setattr(viz, "plot_regression_line", lambda *a, **k: None)
-    monkeypatch.setattr(viz, "evaluate", lambda *a, **k: (0.0, 0.0))
 
     data = tmp_path / "data.csv"
     data.write_text("km,price\n0,0\n1,1\n2,2\n3,3\n4,4\n5,20\n")
@@ -301,3 +303,283 @@ def test_plot_confidence_band_identical_points(
     data = [(50000.0, 10000.0)] * 5
     viz.plot_confidence_band(plt, xs, data, 0.0, 0.0, 0.95)
     assert not called["fill_between"]
+
+
+def test_line_points_accepts_streams() -> None:
+    line_x, _ = viz._line_points(iter([2.0, 5.0, 1.0]), 0.0, 1.0)
+    assert line_x == [1.0, 5.0]
+    with pytest.raises(ValueError):
+        viz._min_max(iter([]))
+
+
+def _sonde(code: str, **env: str) -> list[str]:
+    environ = {
+        k: v for k, v in os.environ.items() if k not in ("DISPLAY", "MPLBACKEND")
+    }
+    environ.update(env, PYTHONPATH=str(ROOT / "src"))
+    resultat = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=environ,
+        check=False,
+    )
+    assert resultat.returncode == 0, resultat.stderr
+    return resultat.stdout.split()
+
+
+def test_import_viz_is_lazy() -> None:
+    # Le critère est structurel (pas de chronométrage, instable en CI) :
+    # importer viz ne doit pas charger matplotlib
+    assert _sonde("import sys, viz; print('matplotlib' in sys.modules)") == ["False"]
+
+
+def test_pyplot_defaults_to_headless_backend() -> None:
+    code = "import viz; print(viz._pyplot().get_backend().lower())"
+    if sys.platform not in ("win32", "darwin"):
+        assert _sonde(code) == ["agg"]
+    # Un MPLBACKEND explicite reste prioritaire
+    assert _sonde(code, MPLBACKEND="svg") == ["svg"]
+
+
+def test_pyplot_headless_switches_already_imported_pyplot() -> None:
+    pytest.importorskip("matplotlib")
+    code = (
+        "import matplotlib.pyplot as plt, viz; "
+        "print(plt.get_backend().lower(), "
+        "viz._pyplot(headless=True).get_backend().lower())"
+    )
+    assert _sonde(code, MPLBACKEND="svg") == ["svg", "agg"]
+
+
+def _dataset(dossier: Path, nom: str) -> tuple[str, str]:
+    dossier.mkdir(parents=True, exist_ok=True)
+    data = dossier / f"{nom}.csv"
+    data.write_text("km,price\n0,10\n1,9\n2,8.5\n3,7\n4,6.2\n")
+    theta = dossier / f"theta_{nom}.json"
+    theta.write_text(json.dumps({"theta0": 10.0, "theta1": -1.0}))
+    return str(data), str(theta)
+
+
+def test_main_renders_pairs_to_output_dir(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    plt = pytest.importorskip("matplotlib.pyplot")
+    monkeypatch.setattr(plt, "show", lambda: pytest.fail("show() must not be called"))
+    premier = _dataset(tmp_path, "a")
+    second = _dataset(tmp_path, "b")
+    sortie = tmp_path / "plots"
+    options = ["--show-residuals", "--confidence", "--format", "svg"]
+
+    viz.main(
+        ["--output-dir", str(sortie), "--pair", *premier, "--pair", *second, *options]
+    )
+
+    assert sorted(p.name for p in sortie.iterdir()) == ["a.svg", "b.svg"]
+    assert "<svg" in (sortie / "a.svg").read_text()
+    assert plt.get_fignums() == []
+
+
+def test_render_closes_mapped_datasets(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    pytest.importorskip("matplotlib.pyplot")
+    from train.binary import MappedDataset, write_binary_dataset
+
+    premier, theta = _dataset(tmp_path, "a")
+    binaire = tmp_path / "a.bin"
+    with load_dataset(premier) as donnees:
+        write_binary_dataset(donnees, binaire)
+    ouvertes: list[MappedDataset] = []
+    init = MappedDataset.__init__
+
+    def espion(self: MappedDataset, path: str | Path) -> None:
+        init(self, path)
+        ouvertes.append(self)
+
+    monkeypatch.setattr(MappedDataset, "__init__", espion)
+    couple = [str(binaire), theta]
+    options = ["--show-residuals", "--confidence", "--output-dir", str(tmp_path)]
+    viz.main([*options, "--pair", *couple, "--max-points", "2"])
+
+    assert len(ouvertes) == 1 and ouvertes[0]._carte.closed
+
+
+def test_main_renders_single_output_file(tmp_path: Path) -> None:
+    plt = pytest.importorskip("matplotlib.pyplot")
+    data, theta = _dataset(tmp_path, "data")
+    cible = tmp_path / "out" / "plot.png"
+
+    viz.main(["--data", data, "--theta", theta, "--output", str(cible)])
+
+    assert cible.read_bytes().startswith(b"\x89PNG")
+    assert plt.get_fignums() == []
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        ["--output", "x.png", "--pair", "a", "b"],
+        ["--pair", "a", "b"],
+        ["--output-dir", "d", "--pair", "x/a.csv", "t", "--pair", "y/a.csv", "t"],
+        ["--output", "x.png", "--output-dir", "d"],
+    ],
+)
+def test_main_output_usage_errors(options: list[str]) -> None:
+    with pytest.raises(SystemExit) as exc:
+        viz.main(options)
+    assert exc.value.code == 2
+
+
+def test_decimate_points_is_bounded_and_reproducible() -> None:
+    points = [(float(i), float(-i)) for i in range(1000)]
+    assert viz.decimate_points(points, 0) is points
+    assert viz.decimate_points(points, 1000) is points
+
+    echantillon = viz.decimate_points(points, 100)
+    assert len(echantillon) == 100
+    assert echantillon == sorted(echantillon)
+    assert set(echantillon) <= set(points)
+    assert viz.decimate_points(points, 100) == echantillon
+    assert viz.decimate_points(points, 100, graine=1) != echantillon
+
+
+def test_points_affiches_matches_split_then_decimate() -> None:
+    km = [float(i) for i in range(500)]
+    prix = [float(i % 17) for i in range(500)]
+    masque = bytearray(1 if i % 9 == 0 else 0 for i in range(500))
+    inliers, outliers = viz._repartir(km, prix, masque)
+    for limite in (0, 30, len(inliers), 1000):
+        affiches, tous_outliers, decime = viz._points_affiches(km, prix, masque, limite)
+        assert affiches == list(viz.decimate_points(inliers, limite))
+        assert tous_outliers == outliers
+        assert decime == (0 < limite < len(inliers))
+
+
+def test_main_decimation_keeps_every_outlier(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    plt = pytest.importorskip("matplotlib.pyplot")
+    scatters: list[int] = []
+    segments: list[int] = []
+
+    def fake_scatter(x: Iterable[float], y: Iterable[float], **_: Any) -> None:
+        scatters.append(len(list(x)))
+
+    def fake_vlines(x: Iterable[float], *_: object, **__: object) -> None:
+        segments.append(len(list(x)))
+
+    class FakeAx:
+        def get_legend_handles_labels(self) -> tuple[list[object], list[str]]:
+            return ([], [])
+
+    monkeypatch.setattr(plt, "scatter", fake_scatter)
+    monkeypatch.setattr(plt, "vlines", fake_vlines)
+    for nom in ("show", "legend", "xlabel", "ylabel", "suptitle", "axhline"):
+        monkeypatch.setattr(plt, nom, lambda *a, **k: None)
+    monkeypatch.setattr(plt, "gca", lambda: FakeAx())
+    monkeypatch.setattr(viz, "plot_regression_line", lambda *a, **k: None)
+
+    data = tmp_path / "data.csv"
+    lignes = [f"{i},{i + 1000}" for i in range(200)] + ["50,3000", "60,10"]
+    data.write_text("km,price\n" + "\n".join(lignes) + "\n")
+    theta = tmp_path / "theta.json"
+    theta.write_text(json.dumps({"theta0": 1000.0, "theta1": 1.0}))
+    args = ["--data", str(data), "--theta", str(theta), "--show-residuals"]
+
+    viz.main(args + ["--max-points", "20"])
+    assert scatters == [20, 2]
+    assert segments == [22]
+
+    scatters.clear()
+    viz.main(args + ["--max-points", "0"])
+    assert scatters == [200, 2]
+
+    with pytest.raises(SystemExit):
+        viz.main(args + ["--max-points", "-1"])
+
+
+def test_outlier_mask_matches_reference_split() -> None:
+    import random
+    from statistics import stdev
+
+    rng = random.Random(3)
+    rows = [(rng.uniform(0, 3e5), rng.gauss(8000, 900)) for _ in range(2000)]
+    theta0, theta1, k = 8000.0, -0.001, 2.0
+    residus = [p - (theta0 + theta1 * km) for km, p in rows]
+    seuil = k * stdev(residus)
+    attendu = [i for i, r in enumerate(residus) if abs(r) > seuil]
+
+    masque = viz.outlier_mask(rows, theta0, theta1, k)
+    assert isinstance(masque, bytearray) and len(masque) == len(rows)
+    assert [i for i, drapeau in enumerate(masque) if drapeau] == attendu
+    assert viz.outlier_indices(rows, theta0, theta1, k).tolist() == attendu
+
+    inliers, outliers = viz.split_outliers(rows, theta0, theta1, k)
+    assert outliers == [rows[i] for i in attendu]
+    assert len(inliers) + len(outliers) == len(rows)
+    assert viz.outlier_mask([(1.0, 2.0)], 0.0, 0.0, 2.0) == bytearray(b"\x01")
+    assert viz.outlier_mask([], 0.0, 0.0, 2.0) == bytearray()
+
+
+def test_analyze_matches_metrics_and_band_helpers() -> None:
+    import random
+    from statistics import stdev
+
+    from metrics import fused_metrics
+
+    rng = random.Random(5)
+    rows = [(rng.uniform(0, 3e5), rng.gauss(8000, 900)) for _ in range(500)]
+    theta0, theta1 = 8500.0, -0.003
+    analyse = viz.analyze(rows, theta0, theta1)
+
+    metriques = fused_metrics((p, theta0 + theta1 * km) for km, p in rows)
+    assert analyse.rmse == pytest.approx(metriques.rmse, rel=1e-9)
+    assert analyse.r2 == pytest.approx(metriques.r2, rel=1e-9)
+    residus = [p - (theta0 + theta1 * km) for km, p in rows]
+    assert analyse.residual_std == pytest.approx(stdev(residus), rel=1e-9)
+    assert analyse.band_std == pytest.approx(
+        viz._ecart_type_residus(rows, theta0, theta1, len(rows)), rel=1e-9
+    )
+    assert analyse.moments.n == 500
+
+
+def test_plot_confidence_band_reuses_analysis(monkeypatch: pytest.MonkeyPatch) -> None:
+    rows = [(float(i), 3.0 * i + (i % 3)) for i in range(20)]
+    bandes: list[tuple[list[float], list[float]]] = []
+
+    class FakePlt:
+        def fill_between(self, _: object, bas: Any, haut: Any, **__: object) -> None:
+            bandes.append((list(bas), list(haut)))
+
+    viz.plot_confidence_band(FakePlt(), [km for km, _ in rows], rows, 1.0, 3.0, 0.9)
+    analyse = viz.analyze(rows, 1.0, 3.0)
+    monkeypatch.setattr(viz, "_stats", lambda *_: pytest.fail("data re-scanned"))
+    viz.plot_confidence_band(FakePlt(), [], [], 1.0, 3.0, 0.9, analyse=analyse)
+
+    attendu, obtenu = bandes
+    for a, b in zip(attendu, obtenu):
+        assert b == pytest.approx(a, rel=1e-9)
+
+
+def test_plot_residuals_single_collection() -> None:
+    plt = pytest.importorskip("matplotlib.pyplot")
+    rows = [(float(i), 2.0 * i + (-1) ** i) for i in range(1000)]
+    figure = plt.figure()
+    try:
+        viz.plot_residuals(plt, rows, 0.0, 2.0)
+        (collection,) = figure.gca().collections
+        segments = collection.get_segments()
+        assert len(segments) == 1000
+        assert segments[3].tolist() == [[3.0, 5.0], [3.0, 6.0]]
+        viz.plot_residuals(plt, [], 0.0, 2.0)
+        assert len(figure.gca().collections) == 1
+    finally:
+        plt.close(figure)
+
+
+def test_std_errors_keeps_sequence_signature() -> None:
+    points = [1.0, 2.0, 3.0, 4.0]
+    attendu = viz._std_errors_count([0.0, 2.5], 4, 2.0, 2.5, 5.0)
+    assert viz._std_errors([0.0, 2.5], points, 2.0, 2.5, 5.0) == attendu
+    assert attendu[1] == pytest.approx(2.0 * (1 / 4) ** 0.5)